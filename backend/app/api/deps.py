@@ -0,0 +1,67 @@
+"""Request dependencies: a database session per request.
+
+With sharding the session is routed on the request's project id
+(``app.core.sharding``).
+"""
+from fastapi import HTTPException, Request
+
+from ..core.config import settings
+from ..core.database import open_session
+
+
+def request_project_id(request: Request) -> int | None:
+    """Project id from the path, the query string or the ``X-Project-Id`` header."""
+    for source in (
+        request.path_params.get("project_id"),
+        request.query_params.get("project_id"),
+        request.headers.get("x-project-id"),
+    ):
+        if source not in (None, ""):
+            try:
+                return int(source)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def _request_session(request: Request, project_required: bool):
+    project_id = None
+    if settings.SHARDING_ENABLED:
+        project_id = request_project_id(request)
+        if project_id is None and project_required:
+            raise HTTPException(
+                status_code=400,
+                detail="Sharding is enabled: pass the project id in the path, "
+                "the project_id query parameter or the X-Project-Id header",
+            )
+    return open_session(project_id)
+
+
+def get_db(request: Request):
+    """Session for the request; with sharding, routed on its project id (400 without one)."""
+    db = _request_session(request, project_required=True)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_main_db(request: Request):
+    """Like :func:`get_db`, but without a project id the main database is used.
+
+    For routes that fan out over the shards themselves.
+    """
+    db = _request_session(request, project_required=False)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_project_db(item_id: int):
+    """Session for routes addressing a project as ``/projects/{item_id}``."""
+    db = open_session(item_id)
+    try:
+        yield db
+    finally:
+        db.close()
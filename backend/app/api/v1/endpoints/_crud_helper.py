@@ -1,25 +1,82 @@
 """Generic CRUD helper to reduce boilerplate across endpoints."""
-from datetime import datetime
 from typing import Any, Type
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session, configure_mappers
 
+from ....core.config import settings
 from ....core.database import Base
+from ....core.timestamps import date_window, utcnow
+from ....services import change_log
 
 
 def list_items(
     db: Session,
     model: Type[Base],
     filters: dict[str, Any] | None = None,
+    conditions: list | None = None,
 ) -> list:
-    q = db.query(model)
-    if filters:
-        for key, val in filters.items():
-            if val is not None and hasattr(model, key):
-                q = q.filter(getattr(model, key) == val)
-    return q.all()
+    return db.query(model).filter(*filter_conditions(model, filters, conditions)).all()
+
+
+def list_page(
+    db: Session,
+    model: Type[Base],
+    response: Response,
+    filters: dict[str, Any] | None = None,
+    conditions: list | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    order_by: tuple = (),
+) -> list:
+    """One page of :func:`list_items` (by ``order_by``, then id); the total in ``X-Total-Count``."""
+    clauses = filter_conditions(model, filters, conditions)
+    total = db.scalar(select(func.count()).select_from(model).where(*clauses))
+    response.headers["X-Total-Count"] = str(total)
+    return (
+        db.query(model).filter(*clauses)
+        .order_by(*order_by, model.id)
+        .offset(offset).limit(limit)
+        .all()
+    )
+
+
+def filter_conditions(
+    model: Type[Base],
+    filters: dict[str, Any] | None = None,
+    conditions: list | None = None,
+) -> list:
+    """Equality filters (``None`` values skipped) plus extra ``conditions``."""
+    clauses = [
+        getattr(model, key) == val
+        for key, val in (filters or {}).items()
+        if val is not None and hasattr(model, key)
+    ]
+    return clauses + list(conditions or [])
+
+
+def range_conditions(column, low=None, high=None) -> list:
+    """Inclusive ``low <= column <= high`` bounds; ``None`` leaves a side open."""
+    conditions = []
+    if low is not None:
+        conditions.append(column >= low)
+    if high is not None:
+        conditions.append(column <= high)
+    return conditions
+
+
+def window_conditions(column, window: str | None = None, low=None, high=None) -> list:
+    """Range bounds from a named window (``this_week``, ``overdue``...) and/or explicit ones."""
+    conditions = range_conditions(column, low, high)
+    if window:
+        try:
+            first, last = date_window(window)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        conditions += range_conditions(column, first, last)
+    return conditions
 
 
 def get_item(db: Session, model: Type[Base], item_id: int):
@@ -29,6 +86,75 @@ def get_item(db: Session, model: Type[Base], item_id: int):
     return item
 
 
+def _returning_path(db: Session, model: Type[Base], event_name: str) -> bool:
+    """Whether a write can be one ``... RETURNING`` statement.
+
+    Models with mapper-level ``before_*`` or ``after_*`` write listeners keep
+    the unit-of-work path, because ORM-enabled statements bypass them. That
+    covers risk scoring, the fit/gap cube, classifier counts and the duplicate
+    index (requirements), effort roll-ups (WRICEF items), the test execution
+    log and the minutes cache (session and its child entities). The trade-off
+    is deliberate: those writes cost a load plus an UPDATE instead of one
+    statement, and in exchange the derived state stays in step. Both paths
+    skip the write when nothing differs.
+    """
+    configure_mappers()  # registers the services' listeners (see app.models)
+    dispatch = model.__mapper__.dispatch
+    listeners = getattr(dispatch, event_name) or getattr(
+        dispatch, event_name.replace("before_", "after_")
+    )
+    if not settings.RETURNING_WRITES or listeners:
+        return False
+    dialect = db.get_bind().dialect
+    return dialect.insert_returning if event_name == "before_insert" else dialect.update_returning
+
+
+def _commit_loaded(db: Session) -> None:
+    # The RETURNING row is the committed state; expiring it would cost a
+    # SELECT on the next attribute access.
+    expire = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire
+
+
+# Stays below SQLite's bound-parameter limit (999 on older builds).
+IN_CHUNK = 500
+
+
+def parse_ids(raw: str) -> list[int]:
+    try:
+        return [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"ids must be comma separated integers: {raw!r}")
+
+
+def get_many(db: Session, model: Type[Base], ids: list[int]) -> tuple[list, list[int]]:
+    """Load ``ids`` with chunked ``IN`` queries; returns (items in request order, missing ids)."""
+    wanted = list(dict.fromkeys(ids))
+    found = {}
+    for start in range(0, len(wanted), IN_CHUNK):
+        chunk = wanted[start:start + IN_CHUNK]
+        found.update((obj.id, obj) for obj in db.query(model).filter(model.id.in_(chunk)))
+    return [found[i] for i in wanted if i in found], [i for i in wanted if i not in found]
+
+
+def list_by_ids(db: Session, model: Type[Base], raw_ids: str, response: Response,
+                loader=get_many) -> list:
+    """``GET /{resource}?ids=``: items in request order; missing ids in ``X-Missing-Ids``."""
+    items, missing = loader(db, model, parse_ids(raw_ids))
+    if missing:
+        response.headers["X-Missing-Ids"] = ",".join(map(str, missing))
+    return items
+
+
+def batch_get(db: Session, model: Type[Base], ids: list[int], loader=get_many) -> dict:
+    items, missing = loader(db, model, ids)
+    return {"items": items, "missing": missing}
+
+
 def create_item(
     db: Session,
     model: Type[Base],
@@ -39,11 +165,17 @@ def create_item(
     if extra:
         values.update(extra)
     if hasattr(model, "created_at") and "created_at" not in values:
-        values["created_at"] = datetime.now().isoformat()
-    obj = model(**values)
-    db.add(obj)
-    db.commit()
-    db.refresh(obj)
+        values["created_at"] = utcnow()
+    if _returning_path(db, model, "before_insert"):
+        obj = db.scalars(insert(model).returning(model), [values]).one()
+        _commit_loaded(db)
+    else:
+        obj = model(**values)
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+    created = change_log.diff({}, change_log.column_values(obj))
+    change_log.record(db, model, obj.id, "create", created)
     return obj
 
 
@@ -53,20 +185,65 @@ def update_item(
     item_id: int,
     data: BaseModel,
 ):
+    values = {
+        key: val for key, val in data.model_dump(exclude_unset=True).items()
+        if hasattr(model, key)
+    }
+    if _returning_path(db, model, "before_update"):
+        if not values:
+            db.commit()  # keeps whatever the caller left pending
+            return get_item(db, model, item_id)
+        if db.dirty or db.new or db.deleted:
+            db.flush()
+        # Only rows that actually differ are updated (and get a new updated_at).
+        changed = or_(*[getattr(model, key).is_distinct_from(val) for key, val in values.items()])
+        before = None
+        if settings.CHANGE_LOG_ENABLED:
+            # RETURNING only yields the new row; the old values are one PK lookup
+            row = db.execute(
+                select(*[getattr(model, key) for key in values]).where(model.id == item_id)
+            ).first()
+            before = dict(zip(values, row)) if row else None
+        if hasattr(model, "updated_at"):
+            values["updated_at"] = utcnow()
+        stmt = (
+            update(model)
+            .where(model.id == item_id, changed)
+            .values(values)
+            .returning(model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        obj = db.scalars(stmt).one_or_none()
+        if obj is None:
+            db.commit()  # keeps anything flushed above
+            return get_item(db, model, item_id)  # unchanged, or 404
+        _commit_loaded(db)
+        if before is not None:
+            after = {key: getattr(obj, key) for key in before}
+            change_log.record(db, model, item_id, "update", change_log.diff(before, after))
+        return obj
     obj = get_item(db, model, item_id)
-    values = data.model_dump(exclude_unset=True)
+    before = {key: getattr(obj, key) for key in values}
+    if before == values:
+        # nothing differs: no UPDATE and no new updated_at, but the caller's
+        # pending work is still committed
+        _commit_loaded(db)
+        return obj
     if hasattr(model, "updated_at"):
-        values["updated_at"] = datetime.now().isoformat()
+        values["updated_at"] = utcnow()
     for key, val in values.items():
-        if hasattr(obj, key):
-            setattr(obj, key, val)
+        setattr(obj, key, val)
     db.commit()
     db.refresh(obj)
+    after = {key: getattr(obj, key) for key in before}
+    change_log.record(db, model, item_id, "update", change_log.diff(before, after))
     return obj
 
 
 def delete_item(db: Session, model: Type[Base], item_id: int):
     obj = get_item(db, model, item_id)
+    before = change_log.column_values(obj)
     db.delete(obj)
     db.commit()
+    change_log.record(db, model, item_id, "delete", change_log.diff(before, {}))
     return {"message": f"{model.__name__} {item_id} deleted"}
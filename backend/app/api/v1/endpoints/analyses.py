@@ -1,18 +1,40 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
 from ....models.analysis import Analysis
 from ....schemas.analysis import AnalysisCreate, AnalysisUpdate, AnalysisResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....services.cascade import cascade_delete
+from ....services import minutes
+from ....services.rollups import analyses_with_counts
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, list_by_ids, batch_get,
+    filter_conditions,
+)
 
 router = APIRouter(prefix="/analyses", tags=["Analyses"])
 
 
 @router.get("", response_model=list[AnalysisResponse])
-def get_analyses(scenario_id: int | None = None, db: Session = Depends(get_db)):
+def get_analyses(
+    response: Response,
+    ids: str | None = None,
+    scenario_id: int | None = None,
+    with_counts: bool = False,
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        return list_by_ids(db, Analysis, ids, response)
+    if with_counts:
+        return analyses_with_counts(db, filter_conditions(Analysis, {"scenario_id": scenario_id}))
     return list_items(db, Analysis, {"scenario_id": scenario_id})
 
 
+@router.post("/batch-get", response_model=BatchGetResponse[AnalysisResponse])
+def batch_get_analyses(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Analysis, data.ids)
+
+
 @router.post("", response_model=AnalysisResponse, status_code=201)
 def create_analysis(data: AnalysisCreate, db: Session = Depends(get_db)):
     return create_item(db, Analysis, data)
@@ -23,6 +45,17 @@ def get_analysis(item_id: int, db: Session = Depends(get_db)):
     return get_item(db, Analysis, item_id)
 
 
+@router.get("/{item_id}/minutes")
+def get_analysis_minutes(item_id: int, format: str = "md", db: Session = Depends(get_db)):
+    """Minutes of all sessions of the analysis, rendered in parallel."""
+    analysis = get_item(db, Analysis, item_id)
+    try:
+        content = minutes.analysis_minutes(db, analysis, format)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return Response(content, media_type=minutes.TEMPLATES[format].media_type)
+
+
 @router.put("/{item_id}", response_model=AnalysisResponse)
 def update_analysis(item_id: int, data: AnalysisUpdate, db: Session = Depends(get_db)):
     return update_item(db, Analysis, item_id, data)
@@ -31,3 +64,10 @@ def update_analysis(item_id: int, data: AnalysisUpdate, db: Session = Depends(ge
 @router.delete("/{item_id}")
 def delete_analysis(item_id: int, db: Session = Depends(get_db)):
     return delete_item(db, Analysis, item_id)
+
+
+@router.delete("/{item_id}/cascade")
+def cascade_delete_analysis(item_id: int, dry_run: bool = False, db: Session = Depends(get_db)):
+    get_item(db, Analysis, item_id)
+    counts = cascade_delete(db, Analysis, item_id, dry_run=dry_run)
+    return {"dry_run": dry_run, "deleted": counts}
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from ....models import (
+    Action, Analysis, ConfigItem, Decision, FitGap, Project, Question, Requirement, Risk,
+    Scenario, Session as SessionModel, TestCycle, TestExecution, TestManagement, WricefItem,
+)
+from ....schemas import (
+    ActionResponse, AnalysisResponse, ConfigItemResponse, DecisionResponse, FitGapResponse,
+    ProjectResponse, QuestionResponse, RequirementResponse, RiskResponse, ScenarioResponse,
+    SessionResponse, TestCycleResponse, TestExecutionResponse, TestManagementResponse,
+    WricefItemResponse,
+)
+from ....services.archive import get_archive_db
+from ._crud_helper import list_items, get_item
+
+router = APIRouter(prefix="/archive", tags=["Archive"])
+
+# path -> (model, response schema); read-only views of the archive database
+RESOURCES = {
+    "scenarios": (Scenario, ScenarioResponse),
+    "analyses": (Analysis, AnalysisResponse),
+    "sessions": (SessionModel, SessionResponse),
+    "requirements": (Requirement, RequirementResponse),
+    "wricef-items": (WricefItem, WricefItemResponse),
+    "config-items": (ConfigItem, ConfigItemResponse),
+    "tests": (TestManagement, TestManagementResponse),
+    "test-cycles": (TestCycle, TestCycleResponse),
+    "test-executions": (TestExecution, TestExecutionResponse),
+    "questions": (Question, QuestionResponse),
+    "fitgap": (FitGap, FitGapResponse),
+    "decisions": (Decision, DecisionResponse),
+    "risks": (Risk, RiskResponse),
+    "actions": (Action, ActionResponse),
+}
+
+
+def _archived(project: Project) -> ProjectResponse:
+    return ProjectResponse.model_validate(project).model_copy(update={"archived": True})
+
+
+@router.get("/projects", response_model=list[ProjectResponse])
+def get_archived_projects(db: Session = Depends(get_archive_db)):
+    return [_archived(p) for p in list_items(db, Project)]
+
+
+@router.get("/projects/{item_id}", response_model=ProjectResponse)
+def get_archived_project(item_id: int, db: Session = Depends(get_archive_db)):
+    return _archived(get_item(db, Project, item_id))
+
+
+def _add_resource(path: str, model, response) -> None:
+    def list_archived(
+        project_id: int | None = None,
+        session_id: int | None = None,
+        test_cycle_id: int | None = None,
+        db: Session = Depends(get_archive_db),
+    ):
+        return list_items(db, model, {
+            "project_id": project_id,
+            "session_id": session_id,
+            "test_cycle_id": test_cycle_id,
+        })
+
+    def get_archived(item_id: int, db: Session = Depends(get_archive_db)):
+        return get_item(db, model, item_id)
+
+    router.add_api_route(f"/{path}", list_archived, methods=["GET"],
+                         response_model=list[response], name=f"list_archived_{path}")
+    router.add_api_route(f"/{path}/{{item_id}}", get_archived, methods=["GET"],
+                         response_model=response, name=f"get_archived_{path}")
+
+
+for _path, (_model, _response) in RESOURCES.items():
+    _add_resource(_path, _model, _response)
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from ...deps import get_db
+from ....models import (
+    Action, Agenda, Analysis, Attendee, ChangeLog, ConfigItem, Decision, FitGap, Project,
+    Question, Requirement, Risk, Scenario, Session as SessionModel, TestCycle, TestExecution,
+    TestManagement, WricefItem,
+)
+from ....schemas.change_log import ChangeLogEntryResponse, ChangeLogStatsResponse
+from ....services.change_log import history_rows, writer
+from ._crud_helper import list_page
+
+router = APIRouter(prefix="/change-log", tags=["Change Log"])
+
+# path -> model whose writes are recorded; the paths match the resources' own routes
+ENTITIES = {
+    "projects": Project,
+    "scenarios": Scenario,
+    "analyses": Analysis,
+    "sessions": SessionModel,
+    "requirements": Requirement,
+    "wricef-items": WricefItem,
+    "config-items": ConfigItem,
+    "tests": TestManagement,
+    "test-cycles": TestCycle,
+    "test-executions": TestExecution,
+    "questions": Question,
+    "fitgap": FitGap,
+    "decisions": Decision,
+    "risks": Risk,
+    "actions": Action,
+    "attendees": Attendee,
+    "agenda": Agenda,
+}
+
+
+@router.get("/stats", response_model=ChangeLogStatsResponse)
+def get_change_log_stats():
+    return writer.stats()
+
+
+@router.get("/{entity}/{entity_id}", response_model=list[ChangeLogEntryResponse])
+def get_change_history(
+    entity: str,
+    entity_id: int,
+    response: Response,
+    field: str | None = None,
+    project_id: int | None = None,  # routes to the project's shard when sharding
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Newest first."""
+    model = ENTITIES.get(entity)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Unknown entity {entity!r}")
+    conditions = []
+    if field is not None:
+        if field not in model.__table__.c:
+            raise HTTPException(status_code=400, detail=f"{entity} has no field {field!r}")
+        key = field.replace("_", "\\_")
+        conditions.append(ChangeLog.changes.like(f'%"{key}": [%', escape="\\"))
+    entries = list_page(
+        db, ChangeLog, response, {"entity": model.__tablename__, "entity_id": entity_id},
+        conditions,
+        limit, offset, (ChangeLog.changed_at.desc(), ChangeLog.id.desc()),
+    )
+    return history_rows(entries, field, entity)
@@ -1,20 +1,36 @@
-from datetime import datetime
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
+from ....core.timestamps import utcnow
 from ....models.config_item import ConfigItem
 from ....models.test_management import TestManagement
 from ....schemas.config_item import ConfigItemCreate, ConfigItemUpdate, ConfigItemResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ....services import change_log
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, list_by_ids, batch_get,
+)
 
 router = APIRouter(prefix="/config-items", tags=["Config Items"])
 
 
 @router.get("", response_model=list[ConfigItemResponse])
-def get_config_items(project_id: int | None = None, db: Session = Depends(get_db)):
+def get_config_items(
+    response: Response,
+    ids: str | None = None,
+    project_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        return list_by_ids(db, ConfigItem, ids, response)
     return list_items(db, ConfigItem, {"project_id": project_id})
 
 
+@router.post("/batch-get", response_model=BatchGetResponse[ConfigItemResponse])
+def batch_get_config_items(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, ConfigItem, data.ids)
+
+
 @router.post("", response_model=ConfigItemResponse, status_code=201)
 def create_config_item(data: ConfigItemCreate, db: Session = Depends(get_db)):
     return create_item(db, ConfigItem, data)
@@ -38,7 +54,7 @@ def delete_config_item(item_id: int, db: Session = Depends(get_db)):
 @router.post("/{item_id}/convert-to-test")
 def convert_config_to_test(item_id: int, db: Session = Depends(get_db)):
     item = get_item(db, ConfigItem, item_id)
-    now = datetime.now().isoformat()
+    now = utcnow()
     test = TestManagement(
         title=f"Unit Test: {item.title}",
         test_type="unit",
@@ -52,4 +68,7 @@ def convert_config_to_test(item_id: int, db: Session = Depends(get_db)):
     db.add(test)
     db.commit()
     db.refresh(test)
+    change_log.record(db, TestManagement, test.id, "create",
+                      change_log.diff({}, change_log.column_values(test)))
+    change_log.record(db, ConfigItem, item.id, "convert", {"test_id": [None, test.id]})
     return {"message": "Test case created", "test_id": test.id}
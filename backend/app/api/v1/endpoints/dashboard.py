@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ....core.config import settings
+from ...deps import get_main_db
+from ....core.sharding import shard_router
 from ....models.project import Project
 from ....models.scenario import Scenario
 from ....models.requirement import Requirement
@@ -12,7 +14,17 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
 @router.get("/stats")
-def get_dashboard_stats(project_id: int | None = None, db: Session = Depends(get_db)):
+def get_dashboard_stats(project_id: int | None = None, db: Session = Depends(get_main_db)):
+    if settings.SHARDING_ENABLED and not project_id:
+        totals: dict[str, int] = {}
+        for part in shard_router().fan_out(lambda shard: _stats(shard, None)):
+            for key, value in part.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+    return _stats(db, project_id)
+
+
+def _stats(db: Session, project_id: int | None) -> dict[str, int]:
     def count(model, extra_filter=None):
         q = db.query(model)
         if project_id and hasattr(model, "project_id"):
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+from ....models.job import Job
+from ....schemas.job import JobCreate, JobResponse, JobTypeResponse
+from ....services.jobs import (
+    JOB_TYPES, cancel_job, concurrency, enqueue_job, get_jobs_db, job_row,
+)
+from ._crud_helper import get_item, list_page
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("", response_model=list[JobResponse])
+def get_jobs(
+    response: Response,
+    status: str | None = None,
+    job_type: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_jobs_db),
+):
+    jobs = list_page(
+        db, Job, response, {"status": status, "job_type": job_type}, None,
+        limit, offset, (Job.id.desc(),),
+    )
+    return [job_row(job) for job in jobs]
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+def create_job(data: JobCreate, db: Session = Depends(get_jobs_db)):
+    try:
+        return job_row(enqueue_job(db, data.job_type, data.params))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/types", response_model=list[JobTypeResponse])
+def get_job_types():
+    return [
+        {"name": name, "description": spec.description, "concurrency": concurrency(name)}
+        for name, spec in sorted(JOB_TYPES.items())
+    ]
+
+
+@router.get("/{item_id}", response_model=JobResponse)
+def get_job(item_id: int, db: Session = Depends(get_jobs_db)):
+    return job_row(get_item(db, Job, item_id))
+
+
+@router.post("/{item_id}/cancel", response_model=JobResponse)
+def cancel(item_id: int, db: Session = Depends(get_jobs_db)):
+    job = get_item(db, Job, item_id)
+    try:
+        return job_row(cancel_job(db, job))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -1,33 +1,287 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ....core.config import settings
+from ...deps import get_main_db, get_project_db
+from ....core.sharding import shard_router
+from ....core.timestamps import DateValue
+from ....models.action import Action
+from ....models.decision import Decision
 from ....models.project import Project
-from ....schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....models.question import Question
+from ....models.risk import Risk
+from ....models.session import Session as SessionModel
+from ....schemas.project import (
+    ProjectCreate, ProjectUpdate, ProjectResponse, ProjectEffortResponse,
+)
+from ....schemas.action import ActionResponse
+from ....schemas.decision import DecisionResponse
+from ....schemas.fitgap import FitGapCubeResponse
+from ....schemas.question import QuestionResponse
+from ....schemas.requirement import DuplicateClustersResponse
+from ....schemas.risk import RiskMatrixResponse, RiskResponse
+from ....services.duplicates import duplicate_clusters
+from ....services.effort import project_effort
+from ....services.fitgap_cube import fitgap_cube
+from ....services.risk_scoring import risk_matrix
+from ....services.rollups import is_open
+from ....services.archive import archive_sessions
+from ....services.cascade import cascade_delete
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, list_by_ids, batch_get,
+    get_many, list_page, window_conditions,
+)
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
 
+def _get_many_projects(db: Session, model, ids: list[int]):
+    if not settings.SHARDING_ENABLED:
+        return get_many(db, model, ids)
+    found = {
+        p.id: p
+        for part in shard_router().fan_out(lambda shard: get_many(shard, model, ids)[0])
+        for p in part
+    }
+    wanted = list(dict.fromkeys(ids))
+    return [found[i] for i in wanted if i in found], [i for i in wanted if i not in found]
+
+
 @router.get("", response_model=list[ProjectResponse])
-def get_projects(project_id: int | None = None, db: Session = Depends(get_db)):
-    return list_items(db, Project, {"id": project_id} if project_id else None)
+def get_projects(
+    response: Response,
+    ids: str | None = None,
+    project_id: int | None = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_main_db),
+):
+    if ids is not None:
+        return list_by_ids(db, Project, ids, response, loader=_get_many_projects)
+    if settings.SHARDING_ENABLED and not project_id:
+        parts = shard_router().fan_out(lambda shard: list_items(shard, Project))
+        projects = sorted((p for part in parts for p in part), key=lambda p: p.id)
+    else:
+        projects = list_items(db, Project, {"id": project_id} if project_id else None)
+    if include_archived:
+        archive = archive_sessions()()
+        try:
+            archived = list_items(archive, Project, {"id": project_id} if project_id else None)
+            projects += [
+                ProjectResponse.model_validate(p).model_copy(update={"archived": True})
+                for p in archived
+            ]
+        finally:
+            archive.close()
+    return projects
+
+
+@router.post("/batch-get", response_model=BatchGetResponse[ProjectResponse])
+def batch_get_projects(data: BatchGetRequest, db: Session = Depends(get_main_db)):
+    return batch_get(db, Project, data.ids, loader=_get_many_projects)
 
 
 @router.post("", response_model=ProjectResponse, status_code=201)
-def create_project(data: ProjectCreate, db: Session = Depends(get_db)):
+def create_project(data: ProjectCreate, db: Session = Depends(get_main_db)):
+    if settings.SHARDING_ENABLED:
+        shards = shard_router()
+        project_id = shards.allocate()
+        shard = shards.session(project_id)
+        try:
+            return create_item(shard, Project, data, extra={"id": project_id})
+        except Exception:
+            shards.release(project_id)
+            raise
+        finally:
+            shard.close()
     return create_item(db, Project, data)
 
 
 @router.get("/{item_id}", response_model=ProjectResponse)
-def get_project(item_id: int, db: Session = Depends(get_db)):
+def get_project(item_id: int, db: Session = Depends(get_project_db)):
     return get_item(db, Project, item_id)
 
 
 @router.put("/{item_id}", response_model=ProjectResponse)
-def update_project(item_id: int, data: ProjectUpdate, db: Session = Depends(get_db)):
+def update_project(item_id: int, data: ProjectUpdate, db: Session = Depends(get_project_db)):
     return update_item(db, Project, item_id, data)
 
 
 @router.delete("/{item_id}")
-def delete_project(item_id: int, db: Session = Depends(get_db)):
-    return delete_item(db, Project, item_id)
+def delete_project(item_id: int, db: Session = Depends(get_project_db)):
+    result = delete_item(db, Project, item_id)
+    if settings.SHARDING_ENABLED:
+        shard_router().release(item_id)
+    return result
+
+
+@router.get("/{item_id}/risk-matrix", response_model=RiskMatrixResponse)
+def get_project_risk_matrix(
+    item_id: int,
+    top_n: int = Query(10, ge=0, le=100),
+    status: str | None = None,
+    db: Session = Depends(get_project_db),
+):
+    get_item(db, Project, item_id)
+    return risk_matrix(db, item_id, top_n=top_n, status=status)
+
+
+@router.get("/{item_id}/fitgap-cube", response_model=FitGapCubeResponse)
+def get_project_fitgap_cube(
+    item_id: int,
+    scenario_id: int | None = None,
+    fitgap_dims: str | None = None,
+    requirement_dims: str | None = None,
+    process_area: list[str] | None = Query(None),
+    fit_gap_status: list[str] | None = Query(None),
+    solution_type: list[str] | None = Query(None),
+    priority: list[str] | None = Query(None),
+    module: list[str] | None = Query(None),
+    classification: list[str] | None = Query(None),
+    db: Session = Depends(get_project_db),
+):
+    get_item(db, Project, item_id)
+    filters = {
+        "process_area": process_area,
+        "fit_gap_status": fit_gap_status,
+        "solution_type": solution_type,
+        "priority": priority,
+        "module": module,
+        "classification": classification,
+    }
+    try:
+        return fitgap_cube(db, item_id, scenario_id, fitgap_dims, requirement_dims, filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/{item_id}/effort", response_model=ProjectEffortResponse)
+def get_project_effort(
+    item_id: int,
+    source: str | None = None,
+    db: Session = Depends(get_project_db),
+):
+    get_item(db, Project, item_id)
+    try:
+        return project_effort(db, item_id, source)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/{item_id}/requirements/duplicates", response_model=DuplicateClustersResponse)
+def get_project_duplicate_requirements(
+    item_id: int,
+    threshold: float | None = Query(None, ge=0, le=1),
+    db: Session = Depends(get_project_db),
+):
+    get_item(db, Project, item_id)
+    return duplicate_clusters(db, item_id, threshold)
+
+
+def _project_page(
+    db: Session, model, project_id: int, response: Response, filters: dict,
+    conditions: list, open_only: bool, limit: int, offset: int, order_by: tuple = (),
+) -> list:
+    """A page of a session child across all sessions of the project."""
+    get_item(db, Project, project_id)
+    sessions = select(SessionModel.id).where(SessionModel.project_id == project_id)
+    conditions = [model.session_id.in_(sessions), *conditions]
+    if open_only:
+        conditions.append(is_open(model))
+    return list_page(db, model, response, filters, conditions, limit, offset, order_by)
+
+
+@router.get("/{item_id}/actions", response_model=list[ActionResponse])
+def get_project_actions(
+    item_id: int,
+    response: Response,
+    status: str | None = None,
+    assigned_to: str | None = None,
+    priority: str | None = None,
+    open_only: bool = False,
+    due: str | None = None,
+    due_after: DateValue = None,
+    due_before: DateValue = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_project_db),
+):
+    return _project_page(
+        db, Action, item_id, response,
+        {"status": status, "assigned_to": assigned_to, "priority": priority},
+        window_conditions(Action.due_date, due, due_after, due_before),
+        open_only, limit, offset, (Action.due_date.is_(None), Action.due_date),
+    )
+
+
+@router.get("/{item_id}/questions", response_model=list[QuestionResponse])
+def get_project_questions(
+    item_id: int,
+    response: Response,
+    status: str | None = None,
+    assigned_to: str | None = None,
+    priority: str | None = None,
+    category: str | None = None,
+    open_only: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_project_db),
+):
+    return _project_page(
+        db, Question, item_id, response,
+        {"status": status, "assigned_to": assigned_to, "priority": priority, "category": category},
+        [], open_only, limit, offset,
+    )
+
+
+@router.get("/{item_id}/risks", response_model=list[RiskResponse])
+def get_project_risks(
+    item_id: int,
+    response: Response,
+    status: str | None = None,
+    owner: str | None = None,
+    type: str | None = None,
+    open_only: bool = False,
+    due: str | None = None,
+    due_after: DateValue = None,
+    due_before: DateValue = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_project_db),
+):
+    return _project_page(
+        db, Risk, item_id, response,
+        {"status": status, "owner": owner, "type": type},
+        window_conditions(Risk.due_date, due, due_after, due_before),
+        open_only, limit, offset, (Risk.risk_score.desc().nulls_last(),),
+    )
+
+
+@router.get("/{item_id}/decisions", response_model=list[DecisionResponse])
+def get_project_decisions(
+    item_id: int,
+    response: Response,
+    status: str | None = None,
+    decided_by: str | None = None,
+    impact: str | None = None,
+    date_from: DateValue = None,
+    date_to: DateValue = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_project_db),
+):
+    return _project_page(
+        db, Decision, item_id, response,
+        {"status": status, "decided_by": decided_by, "impact": impact},
+        window_conditions(Decision.decision_date, None, date_from, date_to),
+        False, limit, offset,
+    )
+
+
+@router.delete("/{item_id}/cascade")
+def cascade_delete_project(item_id: int, dry_run: bool = False, db: Session = Depends(get_project_db)):
+    get_item(db, Project, item_id)
+    counts = cascade_delete(db, Project, item_id, dry_run=dry_run)
+    if settings.SHARDING_ENABLED and not dry_run:
+        shard_router().release(item_id)
+    return {"dry_run": dry_run, "deleted": counts}
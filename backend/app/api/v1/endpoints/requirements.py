@@ -1,33 +1,95 @@
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
+from ....core.timestamps import Timestamp
 from ....models.requirement import Requirement
-from ....models.wricef_item import WricefItem
-from ....models.config_item import ConfigItem
-from ....schemas.requirement import RequirementCreate, RequirementUpdate, RequirementResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....models.classifier import RequirementSuggestion
+from ....schemas.requirement import (
+    RequirementCreate, RequirementUpdate, RequirementResponse, RequirementCreateResponse,
+    SimilarRequirementsResponse, ClassificationSuggestRequest, ClassificationSuggestion,
+    ClassificationSuggestResponse,
+)
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ....services import conversion
+from ....services.classifier import suggest_classifications
+from ....services.duplicates import find_duplicates
+from ....services.similarity import similar_requirements
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, list_by_ids, batch_get,
+)
 
 router = APIRouter(prefix="/requirements", tags=["Requirements"])
 
 
 @router.get("", response_model=list[RequirementResponse])
 def get_requirements(
+    response: Response,
+    ids: str | None = None,
     project_id: int | None = None,
     session_id: int | None = None,
     classification: str | None = None,
+    changed_since: Timestamp = None,
     db: Session = Depends(get_db),
 ):
+    if ids is not None:
+        return list_by_ids(db, Requirement, ids, response)
+    conditions = []
+    if changed_since is not None:
+        # never-updated rows only carry created_at; both columns are indexed
+        conditions.append(or_(
+            Requirement.updated_at >= changed_since,
+            Requirement.created_at >= changed_since,
+        ))
     return list_items(db, Requirement, {
         "project_id": project_id,
         "session_id": session_id,
         "classification": classification,
-    })
+    }, conditions)
 
 
-@router.post("", response_model=RequirementResponse, status_code=201)
-def create_requirement(data: RequirementCreate, db: Session = Depends(get_db)):
-    return create_item(db, Requirement, data)
+@router.post("/batch-get", response_model=BatchGetResponse[RequirementResponse])
+def batch_get_requirements(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Requirement, data.ids)
+
+
+@router.post("", response_model=RequirementCreateResponse, status_code=201)
+def create_requirement(
+    data: RequirementCreate,
+    return_duplicates: bool = False,
+    duplicate_threshold: float | None = Query(None, ge=0, le=1),
+    db: Session = Depends(get_db),
+):
+    req = create_item(db, Requirement, data)
+    if return_duplicates:
+        req.duplicates = find_duplicates(
+            db, req.title, req.description, req.project_id,
+            exclude_id=req.id, threshold=duplicate_threshold,
+        )
+    return req
+
+
+@router.post("/classification-suggestions", response_model=ClassificationSuggestResponse)
+def create_classification_suggestions(
+    data: ClassificationSuggestRequest, db: Session = Depends(get_db)
+):
+    return suggest_classifications(
+        db, data.project_id, data.requirement_ids, data.include_classified,
+        data.min_confidence, data.store,
+    )
+
+
+@router.get("/classification-suggestions", response_model=list[ClassificationSuggestion])
+def get_classification_suggestions(
+    project_id: int | None = None,
+    classification: str | None = None,
+    min_confidence: float = Query(0.0, ge=0, le=1),
+    db: Session = Depends(get_db),
+):
+    return list_items(db, RequirementSuggestion, {
+        "project_id": project_id,
+        "classification": classification,
+    }, [RequirementSuggestion.confidence >= min_confidence])
 
 
 @router.get("/{item_id}", response_model=RequirementResponse)
@@ -35,6 +97,18 @@ def get_requirement(item_id: int, db: Session = Depends(get_db)):
     return get_item(db, Requirement, item_id)
 
 
+@router.get("/{item_id}/similar", response_model=SimilarRequirementsResponse)
+def get_similar_requirements(
+    item_id: int,
+    k: int = Query(10, ge=1, le=100),
+    min_score: float = Query(0.0, ge=0, le=1),
+    other_projects: bool = False,
+    db: Session = Depends(get_db),
+):
+    req = get_item(db, Requirement, item_id)
+    return similar_requirements(db, req, k, min_score, other_projects)
+
+
 @router.put("/{item_id}", response_model=RequirementResponse)
 def update_requirement(item_id: int, data: RequirementUpdate, db: Session = Depends(get_db)):
     return update_item(db, Requirement, item_id, data)
@@ -48,55 +122,7 @@ def delete_requirement(item_id: int, db: Session = Depends(get_db)):
 @router.post("/{item_id}/convert")
 def convert_requirement(item_id: int, db: Session = Depends(get_db)):
     req = get_item(db, Requirement, item_id)
-
-    if req.conversion_status == "converted":
-        raise HTTPException(status_code=400, detail="Already converted")
-
-    classification = (req.classification or "").strip()
-    now = datetime.now().isoformat()
-
-    if classification == "Fit":
-        item = ConfigItem(
-            title=req.title,
-            config_type=req.module or "standard",
-            description=req.description,
-            status="planned",
-            project_id=req.project_id,
-            requirement_id=req.id,
-            created_at=now,
-        )
-        db.add(item)
-        db.commit()
-        db.refresh(item)
-        conversion_type = "config"
-        created_id = item.id
-    elif classification in ("Gap", "Partial Fit"):
-        item = WricefItem(
-            title=req.title,
-            wricef_type="E",
-            description=req.description,
-            status="identified",
-            priority=req.priority,
-            project_id=req.project_id,
-            requirement_id=req.id,
-            created_at=now,
-        )
-        db.add(item)
-        db.commit()
-        db.refresh(item)
-        conversion_type = "wricef"
-        created_id = item.id
-    else:
-        raise HTTPException(status_code=400, detail=f"Invalid classification: {classification}")
-
-    req.conversion_status = "converted"
-    req.conversion_type = conversion_type
-    req.conversion_id = created_id
-    req.converted_at = now
-    db.commit()
-
-    return {
-        "message": "Converted successfully",
-        "conversion_type": conversion_type,
-        "created_item_id": created_id,
-    }
+    try:
+        return conversion.convert_requirement(db, req)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -1,21 +1,68 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
 from ....models.scenario import Scenario
-from ....schemas.scenario import ScenarioCreate, ScenarioUpdate, ScenarioResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....schemas.scenario import (
+    ScenarioCreate,
+    ScenarioUpdate,
+    ScenarioResponse,
+    ScenarioMembersUpdate,
+    ScenarioTreeNode,
+)
+from ....services.scenario_membership import (
+    resolve_members,
+    set_members,
+    remove_scenario,
+    expand,
+    included_in,
+)
+from ....services.cascade import cascade_delete
+from ....services.rollups import scenarios_with_counts
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, list_by_ids, batch_get,
+    filter_conditions,
+)
 
 router = APIRouter(prefix="/scenarios", tags=["Scenarios"])
 
 
+def _tree(rows) -> list[ScenarioTreeNode]:
+    return [
+        ScenarioTreeNode(**ScenarioResponse.model_validate(s).model_dump(), depth=depth)
+        for s, depth in rows
+    ]
+
+
 @router.get("", response_model=list[ScenarioResponse])
-def get_scenarios(project_id: int | None = None, db: Session = Depends(get_db)):
+def get_scenarios(
+    response: Response,
+    ids: str | None = None,
+    project_id: int | None = None,
+    with_counts: bool = False,
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        return list_by_ids(db, Scenario, ids, response)
+    if with_counts:
+        return scenarios_with_counts(db, filter_conditions(Scenario, {"project_id": project_id}))
     return list_items(db, Scenario, {"project_id": project_id})
 
 
+@router.post("/batch-get", response_model=BatchGetResponse[ScenarioResponse])
+def batch_get_scenarios(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Scenario, data.ids)
+
+
 @router.post("", response_model=ScenarioResponse, status_code=201)
 def create_scenario(data: ScenarioCreate, db: Session = Depends(get_db)):
-    return create_item(db, Scenario, data)
+    members = resolve_members(db, data.included_scenario_ids, data.project_id)
+    scenario = create_item(db, Scenario, data)
+    if members:
+        set_members(db, scenario, members)
+        db.commit()
+        db.refresh(scenario)
+    return scenario
 
 
 @router.get("/{item_id}", response_model=ScenarioResponse)
@@ -25,9 +72,50 @@ def get_scenario(item_id: int, db: Session = Depends(get_db)):
 
 @router.put("/{item_id}", response_model=ScenarioResponse)
 def update_scenario(item_id: int, data: ScenarioUpdate, db: Session = Depends(get_db)):
+    if "included_scenario_ids" in data.model_fields_set:
+        scenario = get_item(db, Scenario, item_id)
+        project_id = data.project_id if data.project_id is not None else scenario.project_id
+        members = resolve_members(db, data.included_scenario_ids, project_id)
+        set_members(db, scenario, members, project_id)
+        data = ScenarioUpdate(
+            **data.model_dump(exclude_unset=True, exclude={"included_scenario_ids"})
+        )
     return update_item(db, Scenario, item_id, data)
 
 
 @router.delete("/{item_id}")
 def delete_scenario(item_id: int, db: Session = Depends(get_db)):
+    get_item(db, Scenario, item_id)
+    remove_scenario(db, item_id)
     return delete_item(db, Scenario, item_id)
+
+
+@router.put("/{item_id}/members", response_model=ScenarioResponse)
+def replace_scenario_members(
+    item_id: int, data: ScenarioMembersUpdate, db: Session = Depends(get_db)
+):
+    scenario = get_item(db, Scenario, item_id)
+    members = resolve_members(db, ",".join(str(m) for m in data.member_ids), scenario.project_id)
+    set_members(db, scenario, members)
+    db.commit()
+    db.refresh(scenario)
+    return scenario
+
+
+@router.get("/{item_id}/expand", response_model=list[ScenarioTreeNode])
+def expand_scenario(item_id: int, db: Session = Depends(get_db)):
+    get_item(db, Scenario, item_id)
+    return _tree(expand(db, item_id))
+
+
+@router.get("/{item_id}/included-in", response_model=list[ScenarioTreeNode])
+def get_including_composites(item_id: int, db: Session = Depends(get_db)):
+    get_item(db, Scenario, item_id)
+    return _tree(included_in(db, item_id))
+
+
+@router.delete("/{item_id}/cascade")
+def cascade_delete_scenario(item_id: int, dry_run: bool = False, db: Session = Depends(get_db)):
+    get_item(db, Scenario, item_id)
+    counts = cascade_delete(db, Scenario, item_id, dry_run=dry_run)
+    return {"dry_run": dry_run, "deleted": counts}
@@ -1,7 +1,7 @@
-from datetime import datetime
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
+from ....core.timestamps import DateValue
 from ....models.question import Question
 from ....models.fitgap import FitGap
 from ....models.decision import Decision
@@ -16,7 +16,10 @@ from ....schemas.risk import RiskCreate, RiskUpdate, RiskResponse
 from ....schemas.action import ActionCreate, ActionUpdate, ActionResponse
 from ....schemas.attendee import AttendeeCreate, AttendeeUpdate, AttendeeResponse
 from ....schemas.agenda import AgendaCreate, AgendaUpdate, AgendaResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, window_conditions, batch_get,
+)
 
 router = APIRouter(tags=["Session Entities"])
 
@@ -32,6 +35,11 @@ def create_question(session_id: int, data: QuestionCreate, db: Session = Depends
     return create_item(db, Question, data, extra={"session_id": session_id})
 
 
+@router.post("/questions/batch-get", response_model=BatchGetResponse[QuestionResponse])
+def batch_get_questions(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Question, data.ids)
+
+
 @router.put("/questions/{item_id}", response_model=QuestionResponse)
 def update_question(item_id: int, data: QuestionUpdate, db: Session = Depends(get_db)):
     return update_item(db, Question, item_id, data)
@@ -53,6 +61,11 @@ def create_fitgap(session_id: int, data: FitGapCreate, db: Session = Depends(get
     return create_item(db, FitGap, data, extra={"session_id": session_id})
 
 
+@router.post("/fitgap/batch-get", response_model=BatchGetResponse[FitGapResponse])
+def batch_get_fitgaps(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, FitGap, data.ids)
+
+
 @router.put("/fitgap/{item_id}", response_model=FitGapResponse)
 def update_fitgap(item_id: int, data: FitGapUpdate, db: Session = Depends(get_db)):
     return update_item(db, FitGap, item_id, data)
@@ -74,6 +87,11 @@ def create_decision(session_id: int, data: DecisionCreate, db: Session = Depends
     return create_item(db, Decision, data, extra={"session_id": session_id})
 
 
+@router.post("/decisions/batch-get", response_model=BatchGetResponse[DecisionResponse])
+def batch_get_decisions(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Decision, data.ids)
+
+
 @router.put("/decisions/{item_id}", response_model=DecisionResponse)
 def update_decision(item_id: int, data: DecisionUpdate, db: Session = Depends(get_db)):
     return update_item(db, Decision, item_id, data)
@@ -86,8 +104,17 @@ def delete_decision(item_id: int, db: Session = Depends(get_db)):
 
 # ─── Risks ───
 @router.get("/sessions/{session_id}/risks", response_model=list[RiskResponse])
-def get_risks(session_id: int, db: Session = Depends(get_db)):
-    return list_items(db, Risk, {"session_id": session_id})
+def get_risks(
+    session_id: int,
+    due: str | None = None,
+    due_after: DateValue = None,
+    due_before: DateValue = None,
+    db: Session = Depends(get_db),
+):
+    return list_items(
+        db, Risk, {"session_id": session_id},
+        window_conditions(Risk.due_date, due, due_after, due_before),
+    )
 
 
 @router.post("/sessions/{session_id}/risks", response_model=RiskResponse, status_code=201)
@@ -95,6 +122,11 @@ def create_risk(session_id: int, data: RiskCreate, db: Session = Depends(get_db)
     return create_item(db, Risk, data, extra={"session_id": session_id})
 
 
+@router.post("/risks/batch-get", response_model=BatchGetResponse[RiskResponse])
+def batch_get_risks(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Risk, data.ids)
+
+
 @router.put("/risks/{item_id}", response_model=RiskResponse)
 def update_risk(item_id: int, data: RiskUpdate, db: Session = Depends(get_db)):
     return update_item(db, Risk, item_id, data)
@@ -107,8 +139,17 @@ def delete_risk(item_id: int, db: Session = Depends(get_db)):
 
 # ─── Actions ───
 @router.get("/sessions/{session_id}/actions", response_model=list[ActionResponse])
-def get_actions(session_id: int, db: Session = Depends(get_db)):
-    return list_items(db, Action, {"session_id": session_id})
+def get_actions(
+    session_id: int,
+    due: str | None = None,
+    due_after: DateValue = None,
+    due_before: DateValue = None,
+    db: Session = Depends(get_db),
+):
+    return list_items(
+        db, Action, {"session_id": session_id},
+        window_conditions(Action.due_date, due, due_after, due_before),
+    )
 
 
 @router.post("/sessions/{session_id}/actions", response_model=ActionResponse, status_code=201)
@@ -116,6 +157,11 @@ def create_action(session_id: int, data: ActionCreate, db: Session = Depends(get
     return create_item(db, Action, data, extra={"session_id": session_id})
 
 
+@router.post("/actions/batch-get", response_model=BatchGetResponse[ActionResponse])
+def batch_get_actions(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Action, data.ids)
+
+
 @router.put("/actions/{item_id}", response_model=ActionResponse)
 def update_action(item_id: int, data: ActionUpdate, db: Session = Depends(get_db)):
     return update_item(db, Action, item_id, data)
@@ -137,6 +183,11 @@ def create_attendee(session_id: int, data: AttendeeCreate, db: Session = Depends
     return create_item(db, Attendee, data, extra={"session_id": session_id})
 
 
+@router.post("/attendees/batch-get", response_model=BatchGetResponse[AttendeeResponse])
+def batch_get_attendees(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Attendee, data.ids)
+
+
 @router.put("/attendees/{item_id}", response_model=AttendeeResponse)
 def update_attendee(item_id: int, data: AttendeeUpdate, db: Session = Depends(get_db)):
     return update_item(db, Attendee, item_id, data)
@@ -158,6 +209,11 @@ def create_agenda(session_id: int, data: AgendaCreate, db: Session = Depends(get
     return create_item(db, Agenda, data, extra={"session_id": session_id})
 
 
+@router.post("/agenda/batch-get", response_model=BatchGetResponse[AgendaResponse])
+def batch_get_agenda(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, Agenda, data.ids)
+
+
 @router.put("/agenda/{item_id}", response_model=AgendaResponse)
 def update_agenda(item_id: int, data: AgendaUpdate, db: Session = Depends(get_db)):
     return update_item(db, Agenda, item_id, data)
@@ -1,20 +1,45 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session as DBSession
-from ....core.database import get_db
+from ...deps import get_db
+from ....core.timestamps import DateValue
 from ....models.session import Session as SessionModel
 from ....schemas.session import SessionCreate, SessionUpdate, SessionResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....services.cascade import cascade_delete
+from ....services import minutes
+from ....services.rollups import sessions_with_counts
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, window_conditions, list_by_ids,
+    batch_get, filter_conditions,
+)
 
 router = APIRouter(prefix="/sessions", tags=["Sessions"])
 
 
 @router.get("", response_model=list[SessionResponse])
 def get_sessions(
+    response: Response,
+    ids: str | None = None,
     project_id: int | None = None,
     analysis_id: int | None = None,
+    window: str | None = None,
+    date_from: DateValue = None,
+    date_to: DateValue = None,
+    with_counts: bool = False,
     db: DBSession = Depends(get_db),
 ):
-    return list_items(db, SessionModel, {"project_id": project_id, "analysis_id": analysis_id})
+    if ids is not None:
+        return list_by_ids(db, SessionModel, ids, response)
+    filters = {"project_id": project_id, "analysis_id": analysis_id}
+    conditions = window_conditions(SessionModel.session_date, window, date_from, date_to)
+    if with_counts:
+        return sessions_with_counts(db, filter_conditions(SessionModel, filters, conditions))
+    return list_items(db, SessionModel, filters, conditions)
+
+
+@router.post("/batch-get", response_model=BatchGetResponse[SessionResponse])
+def batch_get_sessions(data: BatchGetRequest, db: DBSession = Depends(get_db)):
+    return batch_get(db, SessionModel, data.ids)
 
 
 @router.post("", response_model=SessionResponse, status_code=201)
@@ -27,6 +52,17 @@ def get_session(item_id: int, db: DBSession = Depends(get_db)):
     return get_item(db, SessionModel, item_id)
 
 
+@router.get("/{item_id}/minutes")
+def get_session_minutes(item_id: int, format: str = "md", db: DBSession = Depends(get_db)):
+    try:
+        content = minutes.session_minutes(db, item_id, format)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if content is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return Response(content, media_type=minutes.TEMPLATES[format].media_type)
+
+
 @router.put("/{item_id}", response_model=SessionResponse)
 def update_session(item_id: int, data: SessionUpdate, db: DBSession = Depends(get_db)):
     return update_item(db, SessionModel, item_id, data)
@@ -35,3 +71,10 @@ def update_session(item_id: int, data: SessionUpdate, db: DBSession = Depends(ge
 @router.delete("/{item_id}")
 def delete_session(item_id: int, db: DBSession = Depends(get_db)):
     return delete_item(db, SessionModel, item_id)
+
+
+@router.delete("/{item_id}/cascade")
+def cascade_delete_session(item_id: int, dry_run: bool = False, db: DBSession = Depends(get_db)):
+    get_item(db, SessionModel, item_id)
+    counts = cascade_delete(db, SessionModel, item_id, dry_run=dry_run)
+    return {"dry_run": dry_run, "deleted": counts}
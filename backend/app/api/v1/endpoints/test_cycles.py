@@ -1,18 +1,37 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
+from ....core.timestamps import DateValue
 from ....models.test_cycle import TestCycle
-from ....schemas.test_cycle import TestCycleCreate, TestCycleUpdate, TestCycleResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....schemas.test_cycle import (
+    TestCycleCreate, TestCycleUpdate, TestCycleResponse, TestCycleBurndownResponse,
+)
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ....services.test_progress import burndown
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, list_by_ids, batch_get,
+)
 
 router = APIRouter(prefix="/test-cycles", tags=["Test Cycles"])
 
 
 @router.get("", response_model=list[TestCycleResponse])
-def get_test_cycles(project_id: int | None = None, db: Session = Depends(get_db)):
+def get_test_cycles(
+    response: Response,
+    ids: str | None = None,
+    project_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        return list_by_ids(db, TestCycle, ids, response)
     return list_items(db, TestCycle, {"project_id": project_id})
 
 
+@router.post("/batch-get", response_model=BatchGetResponse[TestCycleResponse])
+def batch_get_test_cycles(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, TestCycle, data.ids)
+
+
 @router.post("", response_model=TestCycleResponse, status_code=201)
 def create_test_cycle(data: TestCycleCreate, db: Session = Depends(get_db)):
     return create_item(db, TestCycle, data)
@@ -23,6 +42,17 @@ def get_test_cycle(item_id: int, db: Session = Depends(get_db)):
     return get_item(db, TestCycle, item_id)
 
 
+@router.get("/{item_id}/burndown", response_model=TestCycleBurndownResponse)
+def get_test_cycle_burndown(
+    item_id: int,
+    date_from: DateValue = None,
+    date_to: DateValue = None,
+    db: Session = Depends(get_db),
+):
+    cycle = get_item(db, TestCycle, item_id)
+    return burndown(db, cycle, date_from, date_to)
+
+
 @router.put("/{item_id}", response_model=TestCycleResponse)
 def update_test_cycle(item_id: int, data: TestCycleUpdate, db: Session = Depends(get_db)):
     return update_item(db, TestCycle, item_id, data)
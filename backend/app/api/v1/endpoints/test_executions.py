@@ -1,16 +1,41 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
+from ....core.timestamps import DateValue
 from ....models.test_execution import TestExecution
-from ....schemas.test_execution import TestExecutionCreate, TestExecutionUpdate, TestExecutionResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....models.test_progress import TestExecutionEvent
+from ....schemas.test_execution import (
+    TestExecutionCreate, TestExecutionUpdate, TestExecutionResponse, TestExecutionEventResponse,
+)
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, range_conditions, list_by_ids,
+    batch_get,
+)
 
 router = APIRouter(prefix="/test-executions", tags=["Test Executions"])
 
 
 @router.get("", response_model=list[TestExecutionResponse])
-def get_test_executions(test_cycle_id: int | None = None, db: Session = Depends(get_db)):
-    return list_items(db, TestExecution, {"test_cycle_id": test_cycle_id})
+def get_test_executions(
+    response: Response,
+    ids: str | None = None,
+    test_cycle_id: int | None = None,
+    executed_from: DateValue = None,
+    executed_to: DateValue = None,
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        return list_by_ids(db, TestExecution, ids, response)
+    return list_items(
+        db, TestExecution, {"test_cycle_id": test_cycle_id},
+        range_conditions(TestExecution.execution_date, executed_from, executed_to),
+    )
+
+
+@router.post("/batch-get", response_model=BatchGetResponse[TestExecutionResponse])
+def batch_get_test_executions(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, TestExecution, data.ids)
 
 
 @router.post("", response_model=TestExecutionResponse, status_code=201)
@@ -23,6 +48,14 @@ def get_test_execution(item_id: int, db: Session = Depends(get_db)):
     return get_item(db, TestExecution, item_id)
 
 
+@router.get("/{item_id}/history", response_model=list[TestExecutionEventResponse])
+def get_test_execution_history(item_id: int, db: Session = Depends(get_db)):
+    # also answers for deleted executions: the log outlives them
+    return db.query(TestExecutionEvent).filter(
+        TestExecutionEvent.test_execution_id == item_id
+    ).order_by(TestExecutionEvent.id).all()
+
+
 @router.put("/{item_id}", response_model=TestExecutionResponse)
 def update_test_execution(item_id: int, data: TestExecutionUpdate, db: Session = Depends(get_db)):
     return update_item(db, TestExecution, item_id, data)
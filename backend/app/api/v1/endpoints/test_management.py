@@ -1,22 +1,34 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from ....core.database import get_db
+from ...deps import get_db
 from ....models.test_management import TestManagement
 from ....schemas.test_management import TestManagementCreate, TestManagementUpdate, TestManagementResponse
-from ._crud_helper import list_items, get_item, create_item, update_item, delete_item
+from ....schemas.batch import BatchGetRequest, BatchGetResponse
+from ._crud_helper import (
+    list_items, get_item, create_item, update_item, delete_item, list_by_ids, batch_get,
+)
 
 router = APIRouter(prefix="/tests", tags=["Test Management"])
 
 
 @router.get("", response_model=list[TestManagementResponse])
 def get_tests(
+    response: Response,
+    ids: str | None = None,
     project_id: int | None = None,
     test_type: str | None = None,
     db: Session = Depends(get_db),
 ):
+    if ids is not None:
+        return list_by_ids(db, TestManagement, ids, response)
     return list_items(db, TestManagement, {"project_id": project_id, "test_type": test_type})
 
 
+@router.post("/batch-get", response_model=BatchGetResponse[TestManagementResponse])
+def batch_get_tests(data: BatchGetRequest, db: Session = Depends(get_db)):
+    return batch_get(db, TestManagement, data.ids)
+
+
 @router.post("", response_model=TestManagementResponse, status_code=201)
 def create_test(data: TestManagementCreate, db: Session = Depends(get_db)):
     return create_item(db, TestManagement, data)
@@ -0,0 +1,61 @@
+"""Routers imported on their first request instead of at startup.
+
+Each lazy router gets a placeholder route matching its URL prefix. The first
+request under that prefix imports the endpoint module, includes its router
+into the app (replacing the placeholder) and re-dispatches the request. The
+OpenAPI schema loads every pending router first so the docs stay complete.
+"""
+import importlib
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match
+
+
+class LazyRouterRoute(BaseRoute):
+    def __init__(self, app: FastAPI, path_prefix: str, module: str, api_prefix: str) -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+        self.module = module
+        self.api_prefix = api_prefix
+
+    def matches(self, scope):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path == self.path_prefix or path.startswith(self.path_prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def load(self) -> None:
+        if self not in self.app.router.routes:
+            return
+        router = importlib.import_module(self.module).router
+        self.app.router.routes.remove(self)
+        self.app.include_router(router, prefix=self.api_prefix)
+        self.app.openapi_schema = None
+
+    async def handle(self, scope, receive, send):
+        self.load()
+        await self.app.router(scope, receive, send)
+
+
+def include_lazy_routers(app: FastAPI, routers: dict[str, str], api_prefix: str) -> None:
+    """Register ``{url prefix: module path}`` routers to be imported on first use."""
+    pending = [
+        LazyRouterRoute(app, api_prefix + prefix, module, api_prefix)
+        for prefix, module in routers.items()
+    ]
+    app.router.routes.extend(pending)
+
+    build_openapi = app.openapi
+
+    def openapi():
+        for route in pending:
+            route.load()
+        return build_openapi()
+
+    app.openapi = openapi
+
+
+def load_all(app: FastAPI) -> None:
+    for route in [r for r in app.router.routes if isinstance(r, LazyRouterRoute)]:
+        route.load()
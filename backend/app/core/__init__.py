@@ -1,2 +1,2 @@
 from .config import settings
-from .database import get_db, engine, SessionLocal, Base
+from .database import engine, SessionLocal, Base
@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from pathlib import Path
 import os
@@ -15,9 +16,126 @@ class Settings(BaseSettings):
         )
     )
 
-    @property
-    def DATABASE_URL(self) -> str:
-        return f"sqlite:///{self.DATABASE_PATH}"
+    # Any SQLAlchemy URL, e.g. "postgresql+psycopg2://user:pw@host/db" or
+    # "sqlite://" (in-memory: no change log writer or job runner threads);
+    # defaults to the SQLite file at DATABASE_PATH.
+    DATABASE_URL: str = ""
+
+    # Engine profile overrides; None keeps the per-dialect default
+    # (see ENGINE_PROFILES in core/database.py).
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_PRE_PING: bool | None = None
+    DB_POOL_RECYCLE: int | None = None
+    DB_STATEMENT_CACHE_SIZE: int | None = None
+
+    # Per-project SQLite shards: the main database becomes the catalog and
+    # each project's rows live in SHARD_DIRECTORY/project_<id>.db.
+    SHARDING_ENABLED: bool = False
+    SHARD_DIRECTORY: Path | None = None
+    # Shard engines kept open (least recently used ones are disposed).
+    SHARD_MAX_OPEN: int = 64
+    # Threads used by cross-project endpoints to query shards in parallel.
+    SHARD_FANOUT_WORKERS: int = 8
+
+    # Archive tier: projects in ARCHIVE_STATUSES are moved here by
+    # `maintenance.py archive-projects`; defaults to archive.db next to DATABASE_PATH.
+    ARCHIVE_DATABASE_URL: str = ""
+    ARCHIVE_STATUSES: list[str] = ["closed"]
+
+    # Create/upgrade the schema on startup and first DB use; disable when
+    # schema changes are applied explicitly with `maintenance.py init-schema`.
+    SCHEMA_AUTO_INIT: bool = True
+    # Import optional routers on their first request instead of at startup.
+    LAZY_ROUTERS: bool = True
+
+    METRICS_ENABLED: bool = True
+
+    # Single-statement INSERT/UPDATE ... RETURNING writes in the CRUD helpers
+    # (falls back automatically where the dialect lacks RETURNING, and for
+    # models with mapper listeners, see _crud_helper._returning_path).
+    RETURNING_WRITES: bool = True
+
+    # Per-request SQL statement budget (None disables it); "log" or "raise".
+    SQL_STATEMENT_BUDGET: int | None = None
+    SQL_BUDGET_ACTION: str = "log"
+    # Warn when one identical statement runs this many times in a request (0 = off).
+    SQL_REPEAT_THRESHOLD: int = 0
+
+    # Risk scoring: label -> level maps for Risk.probability / Risk.impact.
+    # Numeric strings ("1".."5") are accepted as levels directly.
+    RISK_PROBABILITY_LEVELS: dict[str, int] = {
+        "very low": 1, "low": 2, "medium": 3, "high": 4, "very high": 5,
+    }
+    RISK_IMPACT_LEVELS: dict[str, int] = {
+        "very low": 1, "low": 2, "medium": 3, "high": 4, "very high": 5,
+    }
+    # Optional explicit score matrix indexed [probability - 1][impact - 1];
+    # when unset the score is probability * impact.
+    RISK_SCORE_MATRIX: list[list[float]] | None = None
+
+    # Estimated Jaccard similarity (title + description tokens) from which two
+    # requirements of a project are reported as likely duplicates.
+    DUPLICATE_THRESHOLD: float = 0.5
+
+    # Cross-project requirement similarity (services.similarity): memory-mapped
+    # TF-IDF base under SIMILARITY_INDEX_DIR (default: similarity_index/ next to
+    # DATABASE_PATH), rebuilt once more than SIMILARITY_DELTA_LIMIT requirements
+    # changed since the last build.
+    SIMILARITY_INDEX_DIR: Path | None = None
+    SIMILARITY_DELTA_LIMIT: int = 2000
+
+    # Conversion of effort estimates ("40h", "2 weeks") into person-days.
+    EFFORT_HOURS_PER_DAY: float = 8.0
+    EFFORT_DAYS_PER_WEEK: float = 5.0
+    EFFORT_DAYS_PER_MONTH: float = 20.0
+
+    # Background refresh of the per-cycle test progress snapshots
+    # (services.test_progress); 0 disables the in-process job.
+    TEST_SNAPSHOT_INTERVAL_SECONDS: int = 3600
+    # How far back a run fills in missing days.
+    TEST_SNAPSHOT_MAX_BACKFILL_DAYS: int = 366
+
+    # Change history (services.change_log): the CRUD helpers queue field diffs
+    # and a background thread writes them to change_log in batches.
+    CHANGE_LOG_ENABLED: bool = True
+    CHANGE_LOG_QUEUE_SIZE: int = 10000
+    CHANGE_LOG_BATCH_SIZE: int = 500
+    CHANGE_LOG_FLUSH_SECONDS: float = 1.0
+    # Full queue: "block" waits up to CHANGE_LOG_BLOCK_SECONDS, then writes the
+    # entry on the request thread; "drop" discards it (counted and logged).
+    CHANGE_LOG_BACKPRESSURE: str = "block"
+    CHANGE_LOG_BLOCK_SECONDS: float = 0.5
+    # Request header naming the user recorded as changed_by.
+    CHANGE_LOG_USER_HEADER: str = "X-User"
+
+    # Background jobs (services.jobs): worker threads per API process, and
+    # per-type concurrency overrides (job type -> running jobs across processes).
+    JOBS_ENABLED: bool = True
+    JOB_WORKERS: int = 4
+    JOB_CONCURRENCY: dict[str, int] = {}
+    JOB_POLL_SECONDS: float = 2.0
+    # A running job whose heartbeat is older than this is considered
+    # interrupted and queued again, up to JOB_MAX_ATTEMPTS runs in total.
+    JOB_STALE_SECONDS: float = 60.0
+    JOB_MAX_ATTEMPTS: int = 3
+
+    # Session minutes (services.minutes): rendered documents kept per session
+    # and format, and threads rendering an analysis's sessions in bulk.
+    MINUTES_CACHE_SIZE: int = 512
+    MINUTES_WORKERS: int = 4
+
+    @model_validator(mode="after")
+    def _default_database_url(self):
+        if not self.DATABASE_URL:
+            self.DATABASE_URL = f"sqlite:///{self.DATABASE_PATH}"
+        if not self.ARCHIVE_DATABASE_URL:
+            self.ARCHIVE_DATABASE_URL = f"sqlite:///{self.DATABASE_PATH.parent / 'archive.db'}"
+        if self.SHARD_DIRECTORY is None:
+            self.SHARD_DIRECTORY = self.DATABASE_PATH.parent / "shards"
+        if self.SIMILARITY_INDEX_DIR is None:
+            self.SIMILARITY_INDEX_DIR = self.DATABASE_PATH.parent / "similarity_index"
+        return self
 
     class Config:
         case_sensitive = True
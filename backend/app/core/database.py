@@ -1,29 +1,111 @@
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import StaticPool
 from .config import settings
+from .metrics import mark_worker_start
+from .query_counter import instrument_engine
+from .schema import ensure_schema
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False, "timeout": 30},
-    pool_pre_ping=True,
-)
+# Per-dialect engine defaults; DB_* settings override individual keys.
+# "statement_cache_size" maps to SQLAlchemy's compiled statement cache.
+ENGINE_PROFILES = {
+    "sqlite": {
+        "pool_size": 5, "max_overflow": 10, "pre_ping": False, "recycle": -1,
+        "statement_cache_size": 500,
+    },
+    "postgresql": {
+        "pool_size": 10, "max_overflow": 20, "pre_ping": True, "recycle": 1800,
+        "statement_cache_size": 1000,
+    },
+    "mysql": {
+        "pool_size": 10, "max_overflow": 20, "pre_ping": True, "recycle": 3600,
+        "statement_cache_size": 1000,
+    },
+}
+_DEFAULT_PROFILE = ENGINE_PROFILES["postgresql"]
 
+# Callables applied to every engine make_engine() creates (e.g. metrics).
+ENGINE_HOOKS = [instrument_engine]
 
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")
-    cursor.execute("PRAGMA busy_timeout=5000")
-    cursor.close()
+SQLITE_PRAGMAS = ("PRAGMA journal_mode=WAL", "PRAGMA busy_timeout=5000")
 
 
+def is_sqlite_memory(url: URL) -> bool:
+    database = url.database or ""
+    return url.get_backend_name() == "sqlite" and (
+        database in ("", ":memory:") or "mode=memory" in database
+    )
+
+
+def engine_profile(url: URL) -> dict:
+    profile = dict(ENGINE_PROFILES.get(url.get_backend_name(), _DEFAULT_PROFILE))
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "recycle": settings.DB_POOL_RECYCLE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    profile.update({k: v for k, v in overrides.items() if v is not None})
+    return profile
+
+
+def make_engine(database_url: str) -> Engine:
+    """Create an engine with the dialect's profile; SQLite gets its pragmas."""
+    url = make_url(database_url)
+    profile = engine_profile(url)
+    kwargs = {
+        "pool_pre_ping": profile["pre_ping"],
+        "query_cache_size": profile["statement_cache_size"],
+    }
+    if url.get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False, "timeout": 30}
+        if is_sqlite_memory(url):
+            # one shared connection, otherwise every checkout sees an empty database;
+            # the API lifespan then starts no background threads on it
+            kwargs["poolclass"] = StaticPool
+        else:
+            kwargs.update(pool_size=profile["pool_size"], max_overflow=profile["max_overflow"])
+    else:
+        kwargs.update(
+            pool_size=profile["pool_size"],
+            max_overflow=profile["max_overflow"],
+            pool_recycle=profile["recycle"],
+        )
+    new_engine = create_engine(url, **kwargs)
+
+    if url.get_backend_name() == "sqlite":
+        pragmas = SQLITE_PRAGMAS[1:] if is_sqlite_memory(url) else SQLITE_PRAGMAS
+
+        @event.listens_for(new_engine, "connect")
+        def set_sqlite_pragma(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    for hook in ENGINE_HOOKS:
+        hook(new_engine)
+    return new_engine
+
+
+engine = make_engine(settings.DATABASE_URL)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def open_session(project_id=None):
+    """New session; with sharding, on ``project_id``'s shard when it has one.
+
+    The request dependencies built on this live in ``app.api.deps``.
+    """
+    mark_worker_start()
+    if settings.SCHEMA_AUTO_INIT:
+        ensure_schema(engine)
+    if settings.SHARDING_ENABLED and project_id is not None:
+        from .sharding import shard_router
+
+        return shard_router().session(project_id)
+    return SessionLocal()
@@ -0,0 +1,196 @@
+"""Request metrics exported in Prometheus text format.
+
+A small in-process registry rather than ``prometheus_client``: histograms have
+fixed, pre-allocated buckets and one child per label set, created the first
+time a route/status is seen and reused afterwards (label strings are rendered
+once, at creation). All histogram updates happen on the event-loop thread in
+:class:`MetricsMiddleware`; worker threads only write into the per-request
+:class:`RequestStats`, so no locking is needed.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    __slots__ = ("start", "worker_start", "db_time", "statements")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.worker_start = 0.0
+        self.db_time = 0.0
+        self.statements = 0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+class _HistogramChild:
+    __slots__ = ("counts", "sum", "labels")
+
+    def __init__(self, size: int, labels: str) -> None:
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.labels = labels
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...], buckets) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._le = [repr(float(b)) for b in self.buckets] + ["+Inf"]
+        self._children: dict[tuple, _HistogramChild] = {}
+
+    def child(self, *label_values) -> _HistogramChild:
+        child = self._children.get(label_values)
+        if child is None:
+            labels = ",".join(
+                f'{k}="{_escape(str(v))}"' for k, v in zip(self.label_names, label_values)
+            )
+            child = _HistogramChild(len(self.buckets) + 1, labels)
+            self._children[label_values] = child
+        return child
+
+    def observe(self, child: _HistogramChild, value: float) -> None:
+        child.counts[bisect_left(self.buckets, value)] += 1
+        child.sum += value
+
+    def render(self, out: list[str]) -> None:
+        out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} histogram")
+        for child in list(self._children.values()):
+            sep = "," if child.labels else ""
+            cumulative = 0
+            for le, count in zip(self._le, child.counts):
+                cumulative += count
+                out.append(f'{self.name}_bucket{{{child.labels}{sep}le="{le}"}} {cumulative}')
+            out.append(f"{self.name}_sum{{{child.labels}}} {child.sum}")
+            out.append(f"{self.name}_count{{{child.labels}}} {cumulative}")
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def render(self, out: list[str]) -> None:
+        out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} gauge")
+        out.append(f"{self.name} {self.value}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template and status code.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+THREADPOOL_WAIT = Histogram(
+    "http_threadpool_wait_seconds",
+    "Time from request arrival until its first sync dependency ran on a worker thread.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per request.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+DB_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    STATEMENT_BUCKETS,
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+
+REGISTRY = [REQUEST_LATENCY, THREADPOOL_WAIT, DB_TIME, DB_STATEMENTS, IN_FLIGHT]
+
+
+def render_metrics() -> str:
+    out: list[str] = []
+    for metric in REGISTRY:
+        metric.render(out)
+    out.append("")
+    return "\n".join(out)
+
+
+def mark_worker_start() -> None:
+    """Record when the request first reached a worker thread (called when a session is opened)."""
+    stats = _current.get()
+    if stats is not None and not stats.worker_start:
+        stats.worker_start = time.perf_counter()
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is not None:
+            stats.db_time += time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+            stats.statements += 1
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; the route template is read from ``scope["route"]``."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(time.perf_counter())
+        token = _current.set(stats)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.value += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.value -= 1
+            _current.reset(token)
+            elapsed = time.perf_counter() - stats.start
+            route = scope.get("route")
+            path = route.path if route is not None else UNMATCHED_ROUTE
+            method = scope["method"]
+
+            REQUEST_LATENCY.observe(REQUEST_LATENCY.child(method, path, status), elapsed)
+            if stats.worker_start:
+                THREADPOOL_WAIT.observe(
+                    THREADPOOL_WAIT.child(method, path), stats.worker_start - stats.start
+                )
+            DB_TIME.observe(DB_TIME.child(method, path), stats.db_time)
+            DB_STATEMENTS.observe(DB_STATEMENTS.child(method, path), stats.statements)
@@ -0,0 +1,139 @@
+"""SQL statement counting, per-request budgets and N+1 detection.
+
+A ``before_cursor_execute`` hook feeds two kinds of counters:
+
+* the per-request counter installed by :class:`QueryBudgetMiddleware`, checked
+  against ``SQL_STATEMENT_BUDGET`` (``SQL_BUDGET_ACTION`` = ``log`` or
+  ``raise``) and against ``SQL_REPEAT_THRESHOLD`` for repeated identical
+  statements, the usual N+1 signature;
+* counters opened with :func:`count_queries` / :func:`assert_query_count`,
+  meant for tests and dev scripts::
+
+      with assert_query_count(2):
+          client.post("/api/v1/projects", json={"project_name": "P"})
+
+Both are context variables, so they only see statements run in the context
+that opened them and in contexts copied from it: ``TestClient`` requests,
+``run_in_threadpool`` endpoints and explicitly propagated workers, but not the
+change-log writer, the job runner or the snapshot task, whose threads and
+tasks were started elsewhere.
+"""
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryCounter:
+    __slots__ = ("count", "statements", "budget", "_lock")
+
+    def __init__(self, budget: int | None = None) -> None:
+        self.count = 0
+        self.statements: Counter[str] = Counter()
+        self.budget = budget
+        # worker threads running in a copy of the request's context share the counter
+        self._lock = threading.Lock()
+
+    def record(self, statement: str) -> None:
+        with self._lock:
+            self.count += 1
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_request_counter: ContextVar[QueryCounter | None] = ContextVar("query_counter", default=None)
+_scoped_counters: ContextVar[tuple[QueryCounter, ...]] = ContextVar(
+    "query_counters", default=()
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for counter in _scoped_counters.get():
+        counter.record(statement)
+
+    counter = _request_counter.get()
+    if counter is None:
+        return
+    counter.record(statement)
+    if (
+        counter.budget is not None
+        and counter.count > counter.budget
+        and settings.SQL_BUDGET_ACTION == "raise"
+    ):
+        raise QueryBudgetExceeded(
+            f"{counter.count} SQL statements exceed the budget of {counter.budget}"
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def count_queries():
+    """Count the statements this context executes on instrumented engines inside the block."""
+    counter = QueryCounter()
+    token = _scoped_counters.set(_scoped_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _scoped_counters.reset(token)
+
+
+@contextmanager
+def assert_query_count(expected: int):
+    """Fail with the executed statements unless exactly ``expected`` ran."""
+    with count_queries() as counter:
+        yield counter
+    if counter.count != expected:
+        executed = "\n".join(f"  [{n}x] {sql}" for sql, n in counter.statements.items())
+        raise AssertionError(
+            f"expected {expected} SQL statement(s), {counter.count} executed:\n{executed}"
+        )
+
+
+class QueryBudgetMiddleware:
+    """Pure ASGI middleware applying the statement budget and N+1 check per request."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter(settings.SQL_STATEMENT_BUDGET)
+        token = _request_counter.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_counter.reset(token)
+            self._report(scope, counter)
+
+    @staticmethod
+    def _report(scope, counter: QueryCounter) -> None:
+        route = scope.get("route")
+        where = f"{scope['method']} {route.path if route is not None else scope['path']}"
+        if counter.budget is not None and counter.count > counter.budget:
+            logger.warning(
+                "%s executed %d SQL statements (budget %d)", where, counter.count, counter.budget
+            )
+        threshold = settings.SQL_REPEAT_THRESHOLD
+        if threshold:
+            for sql, n in counter.repeated(threshold):
+                logger.warning("%s: possible N+1, statement ran %d times: %s", where, n, sql)
@@ -0,0 +1,159 @@
+"""Schema initialization at startup instead of import time.
+
+Runs from the app lifespan, lazily when the first session is opened, or
+explicitly via ``maintenance.py init-schema``. A fingerprint of the model metadata is
+stored in ``schema_version``. When it matches, startup costs one SELECT;
+otherwise missing tables are created and missing columns/indexes are added to
+existing tables (additive changes only), then the new fingerprint is stored.
+The one exception is SQLite ``AUTOINCREMENT``, which cannot be added in
+place: tables created without it are rebuilt once (copy, drop, rename).
+"""
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+_meta = MetaData()
+schema_version = Table(
+    "schema_version",
+    _meta,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String, nullable=False),
+    Column("updated_at", String),
+)
+
+_lock = threading.Lock()
+_ready: set[str] = set()
+
+
+def _metadata():
+    from .database import Base
+    from .. import models  # noqa: F401  (registers every table on Base.metadata)
+
+    return Base.metadata
+
+
+def fingerprint(metadata) -> str:
+    parts = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts += [f"{c.name}:{c.type!r}:{c.nullable}" for c in table.columns]
+        parts += sorted(i.name for i in table.indexes)
+        parts += sorted(f"{k}={v}" for k, v in table.dialect_kwargs.items())
+    return f"{zlib.crc32('|'.join(parts).encode()):08x}"
+
+
+def _ensure_sqlite_directory(engine: Engine) -> None:
+    if engine.dialect.name == "sqlite":
+        database = engine.url.database
+        if database and database != ":memory:" and not database.startswith("file:"):
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+
+
+def _stored_fingerprint(engine: Engine) -> str | None:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(schema_version.c.fingerprint).where(schema_version.c.id == 1)
+            ).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def _lacks_autoincrement(conn, table: Table) -> bool:
+    if conn.dialect.name != "sqlite" or not table.dialect_options["sqlite"]["autoincrement"]:
+        return False
+    ddl = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": table.name},
+    ).scalar()
+    return ddl is not None and "AUTOINCREMENT" not in ddl.upper()
+
+
+def _rebuild(conn, table: Table) -> None:
+    """Recreate ``table`` from the model and copy its rows (keeping their ids)."""
+    old = f"{table.name}__rebuild"
+    present = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    conn.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{old}"'))
+    for index in inspect(conn).get_indexes(old):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    table.create(conn)
+    columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name in present)
+    conn.execute(text(f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{old}"'))
+    conn.execute(text(f'DROP TABLE "{old}"'))
+
+
+def _upgrade(conn, metadata) -> list[str]:
+    changes = []
+    existing = set(inspect(conn).get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            table.create(conn)
+            changes.append(f"create table {table.name}")
+            continue
+        if _lacks_autoincrement(conn, table):
+            # SQLite cannot add AUTOINCREMENT to a table; the copied ids seed
+            # sqlite_sequence, so no id up to the current highest is reused
+            _rebuild(conn, table)
+            changes.append(f"rebuild table {table.name} with AUTOINCREMENT")
+            continue
+        present = {c["name"] for c in inspect(conn).get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present:
+                ddl = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {ddl}'))
+                changes.append(f"add column {table.name}.{column.name}")
+        indexes = {i["name"] for i in inspect(conn).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(conn)
+                changes.append(f"create index {index.name}")
+    return changes
+
+
+def init_schema(engine: Engine, force: bool = False) -> list[str]:
+    """Bring the database up to the model schema; returns the changes applied."""
+    metadata = _metadata()
+    current = fingerprint(metadata)
+    _ensure_sqlite_directory(engine)
+    if not force and _stored_fingerprint(engine) == current:
+        return []
+
+    with engine.begin() as conn:
+        changes = _upgrade(conn, metadata)
+        schema_version.create(conn, checkfirst=True)
+        conn.execute(schema_version.delete())
+        conn.execute(
+            schema_version.insert().values(
+                id=1, fingerprint=current, updated_at=datetime.now().isoformat()
+            )
+        )
+    return changes
+
+
+def drop_schema(engine: Engine) -> None:
+    """Drop every model table and the stored fingerprint (works on a fresh checkout too)."""
+    _ensure_sqlite_directory(engine)
+    _metadata().drop_all(bind=engine)
+    schema_version.drop(engine, checkfirst=True)
+    with _lock:
+        _ready.discard(str(engine.url))
+
+
+def ensure_schema(engine: Engine) -> None:
+    """Run :func:`init_schema` once per process and engine; cheap afterwards."""
+    key = str(engine.url)
+    if key in _ready:
+        return
+    with _lock:
+        if key not in _ready:
+            init_schema(engine)
+            _ready.add(key)
+
+
+def reset_schema_state() -> None:
+    _ready.clear()
@@ -0,0 +1,206 @@
+"""Optional per-project SQLite shards.
+
+With ``SHARDING_ENABLED`` each project's rows live in their own SQLite file
+under ``SHARD_DIRECTORY``. The main database acts as the catalog: its
+``project_shards`` table maps project ids to shard URLs and hands out new
+project ids. Projects without a catalog entry (created before sharding was
+enabled and not yet moved with ``maintenance.py shard-projects``) keep living
+in the main database. Requests without a project id are rejected, except on
+the routes that fan out over the shards themselves (``app.api.deps.get_main_db``).
+
+Shard engines are opened on first use; beyond ``SHARD_MAX_OPEN`` the least
+recently used ones are disposed.
+"""
+import contextvars
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from .config import settings
+from .schema import ensure_schema
+from .timestamps import UTCDateTime, utcnow
+
+T = TypeVar("T")
+
+_meta = MetaData()
+project_shards = Table(
+    "project_shards",
+    _meta,
+    Column("project_id", Integer, primary_key=True, autoincrement=False),
+    Column("database_url", String, nullable=False),
+    Column("created_at", UTCDateTime),
+)
+
+
+class ShardRouter:
+    def __init__(self, catalog: Engine, catalog_sessions: sessionmaker, directory: Path,
+                 max_open: int = 64, workers: int = 8) -> None:
+        self.catalog = catalog
+        self.catalog_sessions = catalog_sessions
+        self.directory = Path(directory)
+        self.max_open = max_open
+        self.workers = workers
+        self._lock = threading.RLock()
+        self._urls: dict[int, str] = {}
+        self._open: OrderedDict[str, tuple[Engine, sessionmaker]] = OrderedDict()
+        self._catalog_ready = False
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _ensure_catalog(self) -> None:
+        if not self._catalog_ready:
+            _meta.create_all(self.catalog)
+            self._catalog_ready = True
+
+    def shard_url(self, project_id: int) -> str:
+        return f"sqlite:///{self.directory / f'project_{project_id}.db'}"
+
+    def url_for(self, project_id: int) -> str | None:
+        url = self._urls.get(project_id)
+        if url is None:
+            self._ensure_catalog()
+            with self.catalog.connect() as conn:
+                url = conn.execute(
+                    select(project_shards.c.database_url)
+                    .where(project_shards.c.project_id == project_id)
+                ).scalar()
+            if url is not None:
+                self._urls[project_id] = url
+        return url
+
+    def project_ids(self) -> list[int]:
+        self._ensure_catalog()
+        with self.catalog.connect() as conn:
+            return list(conn.execute(
+                select(project_shards.c.project_id).order_by(project_shards.c.project_id)
+            ).scalars())
+
+    def _sessions_for(self, url: str) -> sessionmaker:
+        from .database import make_engine
+
+        with self._lock:
+            if url in self._open:
+                self._open.move_to_end(url)
+                return self._open[url][1]
+            self.directory.mkdir(parents=True, exist_ok=True)
+            engine = make_engine(url)
+            ensure_schema(engine)
+            factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            self._open[url] = (engine, factory)
+            while len(self._open) > self.max_open:
+                _, (evicted, _) = self._open.popitem(last=False)
+                evicted.dispose()
+            return factory
+
+    def session(self, project_id: int) -> Session:
+        """Session on the project's shard, or on the main database if it has none."""
+        url = self.url_for(project_id)
+        if url is None:
+            return self.catalog_sessions()
+        return self._sessions_for(url)()
+
+    def register(self, project_id: int, url: str | None = None) -> str:
+        self._ensure_catalog()
+        url = url or self.shard_url(project_id)
+        with self.catalog.begin() as conn:
+            conn.execute(project_shards.insert().values(
+                project_id=project_id, database_url=url, created_at=utcnow()
+            ))
+        self._urls[project_id] = url
+        return url
+
+    def allocate(self) -> int:
+        """Reserve a new project id (above every sharded and unsharded project)."""
+        from ..models.project import Project
+
+        self._ensure_catalog()
+        with self._lock:
+            while True:
+                with self.catalog.connect() as conn:
+                    sharded = conn.execute(select(func.max(project_shards.c.project_id))).scalar()
+                    unsharded = conn.execute(select(func.max(Project.id))).scalar()
+                project_id = max(sharded or 0, unsharded or 0) + 1
+                try:
+                    self.register(project_id)
+                except IntegrityError:  # another worker took it
+                    continue
+                return project_id
+
+    def release(self, project_id: int, delete_file: bool = True) -> None:
+        """Drop the project's catalog entry and, by default, its shard file."""
+        url = self.url_for(project_id)
+        if url is None:
+            return
+        with self.catalog.begin() as conn:
+            conn.execute(delete(project_shards).where(project_shards.c.project_id == project_id))
+        self._urls.pop(project_id, None)
+        with self._lock:
+            opened = self._open.pop(url, None)
+        if opened:
+            opened[0].dispose()
+        if delete_file and url.startswith("sqlite:///"):
+            path = Path(url[len("sqlite:///"):])
+            for suffix in ("", "-wal", "-shm"):
+                path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+    def databases(self, include_main: bool = True) -> list[sessionmaker]:
+        """Session factories of every shard, the main database first if included."""
+        targets = [self.url_for(pid) for pid in self.project_ids()]
+        factories = [self._sessions_for(url) for url in dict.fromkeys(u for u in targets if u)]
+        if include_main:
+            factories.insert(0, self.catalog_sessions)
+        return factories
+
+    def fan_out(self, fn: Callable[[Session], T], include_main: bool = True) -> list[T]:
+        """Run ``fn(session)`` on every shard (and the main database) in parallel."""
+        factories = self.databases(include_main)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="shard")
+
+        def run(factory):
+            db = factory()
+            try:
+                return fn(db)
+            finally:
+                db.close()
+
+        # copy the context so per-request SQL counters/metrics see shard queries
+        futures = [
+            self._executor.submit(contextvars.copy_context().run, run, factory)
+            for factory in factories
+        ]
+        return [f.result() for f in futures]
+
+    def dispose(self) -> None:
+        with self._lock:
+            while self._open:
+                _, (engine, _) = self._open.popitem()
+                engine.dispose()
+        self._urls.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_router: ShardRouter | None = None
+_router_lock = threading.Lock()
+
+
+def shard_router() -> ShardRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                from .database import SessionLocal, engine
+
+                _router = ShardRouter(
+                    engine, SessionLocal, settings.SHARD_DIRECTORY,
+                    settings.SHARD_MAX_OPEN, settings.SHARD_FANOUT_WORKERS,
+                )
+    return _router
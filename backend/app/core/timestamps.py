@@ -0,0 +1,180 @@
+"""Typed date/timestamp columns over legacy free-form strings.
+
+Older rows hold whatever the client or ``datetime.now().isoformat()`` wrote:
+ISO with ``T`` or a space, with or without fractions/offsets, bare dates,
+``DD.MM.YYYY``, ``DD/MM/YYYY``, ``YYYY-MM`` / ``YYYY`` (first of the month /
+year) or epoch numbers. :func:`parse_timestamp` and
+:func:`parse_date` accept all of those. On SQLite the column types store a
+canonical fixed-width UTC text form, so lexical order is chronological and a
+plain index serves range filters; other dialects get native types.
+Naive values are taken to be UTC.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Annotated, Optional
+
+from pydantic import BeforeValidator
+from sqlalchemy import Date, DateTime, String
+from sqlalchemy.types import TypeDecorator
+
+_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%Y/%m/%d",
+    "%Y-%m",
+    "%Y",  # bare years are Jan 1, not epoch seconds
+)
+_STORAGE = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _from_epoch(value: float) -> datetime:
+    if abs(value) > 1e11:  # milliseconds
+        value /= 1000
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse any supported representation into an aware UTC datetime.
+
+    Returns ``None`` for empty values; raises ``ValueError`` if unparseable.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime.combine(value, time())
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _from_epoch(value)
+    else:
+        text = str(value).strip()
+        if not text:
+            return None
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            parsed = None
+            for fmt in _FORMATS:
+                try:
+                    parsed = datetime.strptime(text, fmt)
+                    break
+                except ValueError:
+                    continue
+            if parsed is None:
+                try:
+                    return _from_epoch(float(text))
+                except ValueError:
+                    raise ValueError(f"unrecognized date/time value: {value!r}") from None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_date(value) -> Optional[date]:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    parsed = parse_timestamp(value)
+    return parsed.date() if parsed else None
+
+
+def format_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime(_STORAGE)
+
+
+class UTCDateTime(TypeDecorator):
+    """Aware UTC datetime; canonical ``YYYY-MM-DD HH:MM:SS.ffffff`` text on SQLite."""
+
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        parsed = parse_timestamp(value)
+        if parsed is None or dialect.name != "sqlite":
+            return parsed
+        return format_timestamp(parsed)
+
+    def process_result_value(self, value, dialect):
+        try:
+            return parse_timestamp(value)
+        except ValueError:
+            return None
+
+
+class LenientDate(TypeDecorator):
+    """Calendar date; ``YYYY-MM-DD`` text on SQLite."""
+
+    impl = Date
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(Date())
+
+    def process_bind_param(self, value, dialect):
+        parsed = parse_date(value)
+        if parsed is None or dialect.name != "sqlite":
+            return parsed
+        return parsed.isoformat()
+
+    def process_result_value(self, value, dialect):
+        try:
+            return parse_date(value)
+        except ValueError:
+            return None
+
+
+DATE_WINDOWS = ("overdue", "today", "this_week", "next_week", "this_month")
+
+
+def date_window(name: str, today: Optional[date] = None) -> tuple[Optional[date], Optional[date]]:
+    """Inclusive ``(first, last)`` day bounds for a named window; weeks start on Monday."""
+    today = today or utcnow().date()
+    monday = today - timedelta(days=today.weekday())
+    if name == "overdue":
+        return None, today - timedelta(days=1)
+    if name == "today":
+        return today, today
+    if name == "this_week":
+        return monday, monday + timedelta(days=6)
+    if name == "next_week":
+        return monday + timedelta(days=7), monday + timedelta(days=13)
+    if name == "this_month":
+        first = today.replace(day=1)
+        following = (first + timedelta(days=32)).replace(day=1)
+        return first, following - timedelta(days=1)
+    raise ValueError(f"unknown date window {name!r}; expected one of {', '.join(DATE_WINDOWS)}")
+
+
+def _lenient(parser):
+    def validate(value):
+        if isinstance(value, str) and not value.strip():
+            return None
+        return parser(value)
+
+    return BeforeValidator(validate)
+
+
+# Request/response field types: accept every legacy format, emit ISO 8601.
+Timestamp = Annotated[Optional[datetime], _lenient(parse_timestamp)]
+DateValue = Annotated[Optional[date], _lenient(parse_date)]
@@ -1,7 +1,57 @@
+import asyncio
+import importlib
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .core.config import settings
-from .api.v1.router import api_router
+from .core.database import ENGINE_HOOKS, engine, is_sqlite_memory
+from .core.schema import ensure_schema
+from .api.v1.router import api_router, lazy_routers
+from .api.v1.lazy import include_lazy_routers
+
+log = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.SCHEMA_AUTO_INIT:
+        ensure_schema(engine)
+    snapshots = None
+    if settings.TEST_SNAPSHOT_INTERVAL_SECONDS > 0:
+        from .services.test_progress import run_snapshot_job
+
+        snapshots = asyncio.create_task(run_snapshot_job(settings.TEST_SNAPSHOT_INTERVAL_SECONDS))
+    # An in-memory database is one connection shared through StaticPool, so no
+    # long-lived threads use it: change log entries are then written inline
+    # and queued jobs are not run.
+    threads = not is_sqlite_memory(engine.url)
+    if settings.CHANGE_LOG_ENABLED:
+        from .services.change_log import writer
+
+        if threads:
+            writer.start()
+    if settings.JOBS_ENABLED:
+        from .services.jobs import runner
+
+        if threads:
+            runner.start()
+        else:
+            log.warning("in-memory database: the job runner is not started")
+    yield
+    if settings.JOBS_ENABLED:
+        await asyncio.to_thread(runner.stop)
+    if snapshots is not None:
+        snapshots.cancel()
+    if settings.CHANGE_LOG_ENABLED:
+        await asyncio.to_thread(writer.stop)
+    if settings.SHARDING_ENABLED:
+        from .core.sharding import shard_router
+
+        shard_router().dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -10,13 +60,9 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
-from .core.database import engine, Base
-from .models import *
-
-Base.metadata.create_all(bind=engine)
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -27,9 +73,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Missing-Ids", "X-Total-Count"],
 )
 
+if settings.CHANGE_LOG_ENABLED:
+    from .services.change_log import ChangeLogUserMiddleware
+
+    app.add_middleware(ChangeLogUserMiddleware)
+
+if settings.SQL_STATEMENT_BUDGET is not None or settings.SQL_REPEAT_THRESHOLD:
+    from .core.query_counter import QueryBudgetMiddleware
+
+    app.add_middleware(QueryBudgetMiddleware)
+
+if settings.METRICS_ENABLED:
+    from .core.metrics import MetricsMiddleware, instrument_engine, render_metrics
+
+    instrument_engine(engine)
+    ENGINE_HOOKS.append(instrument_engine)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+if settings.LAZY_ROUTERS:
+    include_lazy_routers(app, lazy_routers, settings.API_V1_STR)
+else:
+    for module in lazy_routers.values():
+        app.include_router(importlib.import_module(module).router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
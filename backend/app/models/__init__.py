@@ -1,5 +1,9 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
 from .project import Project
 from .scenario import Scenario
+from .scenario_link import ScenarioLink, ScenarioClosure
 from .analysis import Analysis
 from .session import Session
 from .requirement import Requirement
@@ -15,11 +19,30 @@ from .risk import Risk
 from .action import Action
 from .attendee import Attendee
 from .agenda import Agenda
+from .fitgap_cube import FitGapCube, RequirementCube
+from .requirement_index import RequirementSignature, RequirementBucket
+from .classifier import ClassifierLabel, ClassifierFeature, RequirementSuggestion
+from .effort import EffortRollup
+from .test_progress import TestExecutionEvent, TestCycleSnapshot
+from .change_log import ChangeLog
+from .job import Job
 
 __all__ = [
-    "Project", "Scenario", "Analysis", "Session",
+    "Project", "Scenario", "ScenarioLink", "ScenarioClosure",
+    "Analysis", "Session",
     "Requirement", "WricefItem", "ConfigItem",
     "TestManagement", "TestCycle", "TestExecution",
     "Question", "FitGap", "Decision", "Risk",
     "Action", "Attendee", "Agenda",
+    "FitGapCube", "RequirementCube", "RequirementSignature", "RequirementBucket",
+    "ClassifierLabel", "ClassifierFeature", "RequirementSuggestion", "EffortRollup",
+    "TestExecutionEvent", "TestCycleSnapshot", "ChangeLog", "Job",
 ]
+
+
+@event.listens_for(Mapper, "after_configured", once=True)
+def _register_listeners() -> None:
+    # The services keep derived state in step through mapper listeners. They
+    # are imported once the mappers are configured, i.e. before the first ORM
+    # query or flush, rather than whenever a model is imported.
+    from .. import services  # noqa: F401
@@ -1,18 +1,21 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class Action(Base):
     __tablename__ = "action_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     action_id = Column(String)
     title = Column(String)
     description = Column(Text)
     assigned_to = Column(String)
-    due_date = Column(String)
+    due_date = Column(LenientDate, index=True)
     status = Column(String, default="open")
     priority = Column(String)
     related_decision_id = Column(String)
-    created_at = Column(String)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -6,7 +6,7 @@ class Agenda(Base):
     __tablename__ = "session_agenda"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     topic = Column(String)
     description = Column(Text)
     duration = Column(String)
@@ -14,3 +14,5 @@ class Agenda(Base):
     sort_order = Column(Integer)
     notes = Column(Text)
     status = Column(String)
+
+    __table_args__ = {"sqlite_autoincrement": True}
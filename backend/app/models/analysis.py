@@ -1,18 +1,21 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class Analysis(Base):
     __tablename__ = "analyses"
 
     id = Column(Integer, primary_key=True, index=True)
-    scenario_id = Column(Integer)
+    scenario_id = Column(Integer, index=True)
     code = Column(String)
     title = Column(String, nullable=False)
     analysis_type = Column(String, default="workshop")
     status = Column(String, default="planned")
     description = Column(Text)
-    scheduled_date = Column(String)
-    completed_date = Column(String)
-    created_at = Column(String)
-    updated_at = Column(String)
+    scheduled_date = Column(LenientDate)
+    completed_date = Column(LenientDate)
+    created_at = Column(UTCDateTime)
+    updated_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -6,9 +6,11 @@ class Attendee(Base):
     __tablename__ = "session_attendees"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     name = Column(String)
     role = Column(String)
     email = Column(String)
     department = Column(String)
     attendance_status = Column(String)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Index, Integer, String, Text
+from ..core.database import Base
+from ..core.timestamps import UTCDateTime
+
+
+# Field-level history of API writes (services.change_log); entity is the
+# table name and changes a JSON object of field -> [old, new].
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String, nullable=False)
+    changes = Column(Text, nullable=False, default="{}")
+    changed_by = Column(String)
+    changed_at = Column(UTCDateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity", "entity_id", "changed_at"),
+        Index("ix_change_log_changed", "changed_at"),
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Float, Index, Integer, String
+from ..core.database import Base
+from ..core.timestamps import UTCDateTime
+
+
+# Naive Bayes training counts (services.classifier): classified requirements and
+# their feature total per classification ...
+class ClassifierLabel(Base):
+    __tablename__ = "classifier_labels"
+
+    label = Column(String, primary_key=True)
+    documents = Column(Integer, nullable=False, default=0)
+    features = Column(Integer, nullable=False, default=0)
+
+
+# ... and occurrences of each hashed text feature per classification.
+class ClassifierFeature(Base):
+    __tablename__ = "classifier_features"
+
+    label = Column(String, primary_key=True)
+    feature = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_classifier_features_feature", "feature"),)
+
+
+# Latest suggested classification of a requirement with its posterior probability.
+class RequirementSuggestion(Base):
+    __tablename__ = "requirement_suggestions"
+
+    requirement_id = Column(Integer, primary_key=True, autoincrement=False)
+    project_id = Column(Integer)
+    classification = Column(String, nullable=False)
+    confidence = Column(Float, nullable=False)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = (Index("ix_requirement_suggestions_project", "project_id"),)
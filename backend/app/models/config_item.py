@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import UTCDateTime
 
 
 class ConfigItem(Base):
@@ -9,7 +10,7 @@ class ConfigItem(Base):
     code = Column(String)
     project_id = Column(Integer)
     requirement_id = Column(Integer)
-    scenario_id = Column(Integer)
+    scenario_id = Column(Integer, index=True)
     config_type = Column(String, default="standard")
     title = Column(String, nullable=False)
     description = Column(Text)
@@ -17,5 +18,7 @@ class ConfigItem(Base):
     t_code = Column(String)
     config_details = Column(Text)
     unit_test_steps = Column(Text)
-    created_at = Column(String)
-    updated_at = Column(String)
+    created_at = Column(UTCDateTime)
+    updated_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -1,18 +1,21 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class Decision(Base):
     __tablename__ = "decisions"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     decision_id = Column(String)
     title = Column(String)
     description = Column(Text)
     impact = Column(String)
     decided_by = Column(String)
-    decision_date = Column(String)
+    decision_date = Column(LenientDate)
     status = Column(String, default="pending")
     related_gap_id = Column(String)
-    created_at = Column(String)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Float, Index, Integer, String
+from ..core.database import Base
+
+
+# Effort totals per WRICEF project / fit-gap session and type, complexity, status
+# and assignee, maintained by services.effort.
+class EffortRollup(Base):
+    __tablename__ = "effort_rollup"
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)  # "wricef" | "fitgap"
+    project_id = Column(Integer)  # WRICEF rows
+    session_id = Column(Integer)  # fit-gap rows
+    item_type = Column(String)
+    complexity = Column(String)
+    status = Column(String)
+    assigned_to = Column(String)
+    item_count = Column(Integer, nullable=False, default=0)
+    estimated = Column(Integer, nullable=False, default=0)
+    effort_days = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index("ix_effort_rollup_project", "project_id"),
+        Index("ix_effort_rollup_session", "session_id"),
+    )
@@ -1,12 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Float, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import UTCDateTime
 
 
 class FitGap(Base):
     __tablename__ = "fitgap"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     gap_id = Column(String)
     process_area = Column(String)
     gap_description = Column(Text)
@@ -14,8 +15,11 @@ class FitGap(Base):
     solution_type = Column(String)
     priority = Column(String)
     effort_estimate = Column(String)
+    effort_days = Column(Float)  # parsed from the text above (services.effort)
     assigned_to = Column(String)
     related_decision_id = Column(String)
     related_wricef_id = Column(String)
     notes = Column(Text)
-    created_at = Column(String)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Index, Integer, String
+from ..core.database import Base
+
+
+# Pre-aggregated fit/gap counts per session and dimension combination,
+# maintained by services.fitgap_cube.
+class FitGapCube(Base):
+    __tablename__ = "fitgap_cube"
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer)
+    process_area = Column(String)
+    fit_gap_status = Column(String)
+    solution_type = Column(String)
+    priority = Column(String)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_fitgap_cube_session", "session_id"),)
+
+
+# Pre-aggregated requirement counts per project/session/analysis, module and classification.
+class RequirementCube(Base):
+    __tablename__ = "requirement_cube"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer)
+    session_id = Column(Integer)
+    analysis_id = Column(Integer)
+    module = Column(String)
+    classification = Column(String)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_requirement_cube_project", "project_id"),)
@@ -0,0 +1,29 @@
+from sqlalchemy import Boolean, Column, Float, Index, Integer, String, Text
+from ..core.database import Base
+from ..core.timestamps import UTCDateTime
+
+
+# Background jobs (services.jobs); params and result are JSON text.
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    job_type = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")
+    params = Column(Text, nullable=False, default="{}")
+    progress = Column(Float, nullable=False, default=0.0)
+    message = Column(String)
+    result = Column(Text)
+    error = Column(Text)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker = Column(String)
+    created_at = Column(UTCDateTime, nullable=False)
+    started_at = Column(UTCDateTime)
+    finished_at = Column(UTCDateTime)
+    heartbeat_at = Column(UTCDateTime)
+
+    __table_args__ = (
+        Index("ix_jobs_status_type", "status", "job_type"),
+        Index("ix_jobs_created", "created_at"),
+    )
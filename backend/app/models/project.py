@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class Project(Base):
@@ -12,11 +13,13 @@ class Project(Base):
     customer_industry = Column(String)
     description = Column(Text)
     status = Column(String, default="planning")
-    start_date = Column(String)
-    end_date = Column(String)
-    go_live_date = Column(String)
+    start_date = Column(LenientDate)
+    end_date = Column(LenientDate)
+    go_live_date = Column(LenientDate)
     project_manager = Column(String)
     solution_architect = Column(String)
     functional_lead = Column(String)
     technical_lead = Column(String)
-    created_at = Column(String)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
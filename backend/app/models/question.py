@@ -1,12 +1,13 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import UTCDateTime
 
 
 class Question(Base):
     __tablename__ = "questions"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     question_id = Column(String)
     question_text = Column(Text)
     answer_text = Column(Text)
@@ -14,4 +15,6 @@ class Question(Base):
     priority = Column(String)
     assigned_to = Column(String)
     category = Column(String)
-    created_at = Column(String)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import UTCDateTime
 
 
 class Requirement(Base):
@@ -13,15 +14,17 @@ class Requirement(Base):
     module = Column(String)
     priority = Column(String)
     status = Column(String, default="open")
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     project_id = Column(Integer)
     gap_id = Column(String)
-    analysis_id = Column(Integer)
+    analysis_id = Column(Integer, index=True)
     fit_type = Column(String)
     conversion_status = Column(String)
     conversion_type = Column(String)
     conversion_id = Column(Integer)
-    converted_at = Column(String)
+    converted_at = Column(UTCDateTime, index=True)
     converted_by = Column(String)
-    created_at = Column(String)
-    updated_at = Column(String)
+    created_at = Column(UTCDateTime, index=True)
+    updated_at = Column(UTCDateTime, index=True)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, Index, Integer, LargeBinary
+from ..core.database import Base
+
+
+# MinHash signature of a requirement's title + description (services.duplicates).
+class RequirementSignature(Base):
+    __tablename__ = "requirement_signatures"
+
+    requirement_id = Column(Integer, primary_key=True, autoincrement=False)
+    project_id = Column(Integer)
+    signature = Column(LargeBinary, nullable=False)
+
+    __table_args__ = (Index("ix_requirement_signatures_project", "project_id"),)
+
+
+# LSH band buckets of the signatures; requirements sharing a bucket are candidates.
+class RequirementBucket(Base):
+    __tablename__ = "requirement_buckets"
+
+    requirement_id = Column(Integer, primary_key=True, autoincrement=False)
+    band = Column(Integer, primary_key=True, autoincrement=False)
+    project_id = Column(Integer)
+    bucket = Column(BigInteger, nullable=False)
+
+    __table_args__ = (Index("ix_requirement_buckets_lookup", "project_id", "bucket"),)
@@ -1,21 +1,24 @@
 from sqlalchemy import Column, Integer, String, Text, Float
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class Risk(Base):
     __tablename__ = "risks_issues"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer)
+    session_id = Column(Integer, index=True)
     item_id = Column(String)
     type = Column(String, default="risk")
     title = Column(String)
     description = Column(Text)
     probability = Column(String)
     impact = Column(String)
-    risk_score = Column(Float)
+    risk_score = Column(Float, index=True)
     mitigation_plan = Column(Text)
     owner = Column(String)
     status = Column(String, default="open")
-    due_date = Column(String)
-    created_at = Column(String)
+    due_date = Column(LenientDate, index=True)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import UTCDateTime
 
 
 class Scenario(Base):
@@ -15,5 +16,7 @@ class Scenario(Base):
     priority = Column(String)
     is_composite = Column(Integer, default=0)
     included_scenario_ids = Column(String)
-    created_at = Column(String)
-    updated_at = Column(String)
+    created_at = Column(UTCDateTime)
+    updated_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Index, Integer
+from ..core.database import Base
+
+
+# Direct membership edge: composite_id includes member_id.
+class ScenarioLink(Base):
+    __tablename__ = "scenario_links"
+
+    composite_id = Column(Integer, primary_key=True)
+    member_id = Column(Integer, primary_key=True)
+    sort_order = Column(Integer, default=0)
+
+    __table_args__ = (Index("ix_scenario_links_member", "member_id", "composite_id"),)
+
+
+# Transitive closure of scenario_links; depth is the shortest path length.
+class ScenarioClosure(Base):
+    __tablename__ = "scenario_closure"
+
+    ancestor_id = Column(Integer, primary_key=True)
+    descendant_id = Column(Integer, primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_scenario_closure_descendant", "descendant_id", "ancestor_id"),)
@@ -1,21 +1,26 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class Session(Base):
     __tablename__ = "analysis_sessions"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer)
-    scenario_id = Column(Integer)
-    analysis_id = Column(Integer)
+    project_id = Column(Integer, index=True)
+    scenario_id = Column(Integer, index=True)
+    analysis_id = Column(Integer, index=True)
     session_name = Column(String, nullable=False)
     session_code = Column(String)
     module = Column(String)
     facilitator = Column(String)
-    session_date = Column(String)
+    session_date = Column(LenientDate, index=True)
     status = Column(String, default="planned")
     notes = Column(Text)
     location = Column(String)
     duration = Column(String)
-    created_at = Column(String)
+    created_at = Column(UTCDateTime)
+    # bumped on every ORM write to the session or its minutes' rows (services.minutes)
+    change_version = Column(Integer, default=0)
+
+    __table_args__ = {"sqlite_autoincrement": True}
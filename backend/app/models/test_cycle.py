@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text, Float
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class TestCycle(Base):
@@ -12,12 +13,14 @@ class TestCycle(Base):
     description = Column(Text)
     cycle_type = Column(String, default="sit")
     status = Column(String, default="planned")
-    start_date = Column(String)
-    end_date = Column(String)
+    start_date = Column(LenientDate)
+    end_date = Column(LenientDate)
     total_tests = Column(Integer, default=0)
     passed_tests = Column(Integer, default=0)
     failed_tests = Column(Integer, default=0)
     blocked_tests = Column(Integer, default=0)
     completion_percentage = Column(Float, default=0.0)
-    created_at = Column(String)
-    updated_at = Column(String)
+    created_at = Column(UTCDateTime)
+    updated_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
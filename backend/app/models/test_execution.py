@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class TestExecution(Base):
@@ -11,8 +12,10 @@ class TestExecution(Base):
     execution_code = Column(String)
     status = Column(String, default="not_run")
     executed_by = Column(String)
-    execution_date = Column(String)
+    execution_date = Column(LenientDate, index=True)
     actual_result = Column(Text)
     notes = Column(Text)
     defect_id = Column(String)
-    created_at = Column(String)
+    created_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
 
 
 class TestManagement(Base):
@@ -20,6 +21,8 @@ class TestManagement(Base):
     expected_result = Column(Text)
     actual_result = Column(Text)
     assigned_to = Column(String)
-    execution_date = Column(String)
-    created_at = Column(String)
-    updated_at = Column(String)
+    execution_date = Column(LenientDate)
+    created_at = Column(UTCDateTime)
+    updated_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Index, Integer, String
+from ..core.database import Base
+from ..core.timestamps import LenientDate, UTCDateTime
+
+
+# Append-only log of test execution status changes (services.test_progress);
+# new_status is NULL when the execution was deleted.
+class TestExecutionEvent(Base):
+    __tablename__ = "test_execution_events"
+
+    id = Column(Integer, primary_key=True)
+    test_execution_id = Column(Integer, nullable=False)
+    test_cycle_id = Column(Integer)
+    old_status = Column(String)
+    new_status = Column(String)
+    changed_at = Column(UTCDateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_test_execution_events_execution", "test_execution_id"),
+        Index("ix_test_execution_events_cycle", "test_cycle_id"),
+        Index("ix_test_execution_events_changed", "changed_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+# Execution counts per test cycle at the end of each day (or at taken_at for today).
+class TestCycleSnapshot(Base):
+    __tablename__ = "test_cycle_snapshots"
+
+    test_cycle_id = Column(Integer, primary_key=True, autoincrement=False)
+    day = Column(LenientDate, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    blocked = Column(Integer, nullable=False, default=0)
+    not_run = Column(Integer, nullable=False, default=0)
+    taken_at = Column(UTCDateTime, nullable=False)
+
+    __table_args__ = (Index("ix_test_cycle_snapshots_day", "day"),)
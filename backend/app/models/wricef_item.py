@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Float, Integer, String, Text
 from ..core.database import Base
+from ..core.timestamps import UTCDateTime
 
 
 class WricefItem(Base):
@@ -9,7 +10,7 @@ class WricefItem(Base):
     code = Column(String)
     project_id = Column(Integer)
     requirement_id = Column(Integer)
-    scenario_id = Column(Integer)
+    scenario_id = Column(Integer, index=True)
     wricef_type = Column(String, default="E")
     title = Column(String, nullable=False)
     description = Column(Text)
@@ -17,9 +18,12 @@ class WricefItem(Base):
     priority = Column(String)
     complexity = Column(String)
     estimated_effort = Column(String)
+    effort_days = Column(Float)  # parsed from the text above (services.effort)
     assigned_to = Column(String)
     functional_spec = Column(Text)
     technical_spec = Column(Text)
     unit_test_steps = Column(Text)
-    created_at = Column(String)
-    updated_at = Column(String)
+    created_at = Column(UTCDateTime)
+    updated_at = Column(UTCDateTime)
+
+    __table_args__ = {"sqlite_autoincrement": True}
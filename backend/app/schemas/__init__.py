@@ -1,17 +1,30 @@
-from .project import ProjectCreate, ProjectUpdate, ProjectResponse
-from .scenario import ScenarioCreate, ScenarioUpdate, ScenarioResponse
+from .project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectEffortResponse
+from .scenario import (
+    ScenarioCreate, ScenarioUpdate, ScenarioResponse, ScenarioMembersUpdate, ScenarioTreeNode,
+)
 from .analysis import AnalysisCreate, AnalysisUpdate, AnalysisResponse
 from .session import SessionCreate, SessionUpdate, SessionResponse
-from .requirement import RequirementCreate, RequirementUpdate, RequirementResponse
+from .requirement import (
+    RequirementCreate, RequirementUpdate, RequirementResponse, RequirementCreateResponse,
+    RequirementDuplicate, DuplicateClustersResponse, SimilarRequirementsResponse,
+    ClassificationSuggestRequest, ClassificationSuggestion, ClassificationSuggestResponse,
+)
 from .wricef_item import WricefItemCreate, WricefItemUpdate, WricefItemResponse
 from .config_item import ConfigItemCreate, ConfigItemUpdate, ConfigItemResponse
 from .test_management import TestManagementCreate, TestManagementUpdate, TestManagementResponse
-from .test_cycle import TestCycleCreate, TestCycleUpdate, TestCycleResponse
-from .test_execution import TestExecutionCreate, TestExecutionUpdate, TestExecutionResponse
+from .test_cycle import (
+    TestCycleCreate, TestCycleUpdate, TestCycleResponse, TestCycleBurndownResponse,
+)
+from .test_execution import (
+    TestExecutionCreate, TestExecutionUpdate, TestExecutionResponse, TestExecutionEventResponse,
+)
 from .question import QuestionCreate, QuestionUpdate, QuestionResponse
-from .fitgap import FitGapCreate, FitGapUpdate, FitGapResponse
+from .fitgap import FitGapCreate, FitGapUpdate, FitGapResponse, FitGapCubeResponse
 from .decision import DecisionCreate, DecisionUpdate, DecisionResponse
-from .risk import RiskCreate, RiskUpdate, RiskResponse
+from .risk import RiskCreate, RiskUpdate, RiskResponse, RiskMatrixResponse
 from .action import ActionCreate, ActionUpdate, ActionResponse
 from .attendee import AttendeeCreate, AttendeeUpdate, AttendeeResponse
 from .agenda import AgendaCreate, AgendaUpdate, AgendaResponse
+from .batch import BatchGetRequest, BatchGetResponse
+from .change_log import ChangeLogEntryResponse, ChangeLogStatsResponse
+from .job import JobCreate, JobResponse, JobTypeResponse
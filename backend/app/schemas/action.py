@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class ActionBase(BaseModel):
     session_id: Optional[int] = None
@@ -8,7 +10,7 @@ class ActionBase(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     assigned_to: Optional[str] = None
-    due_date: Optional[str] = None
+    due_date: Optional[DateValue] = None
     status: Optional[str] = "open"
     priority: Optional[str] = None
     related_decision_id: Optional[str] = None
@@ -22,7 +24,7 @@ class ActionUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     assigned_to: Optional[str] = None
-    due_date: Optional[str] = None
+    due_date: Optional[DateValue] = None
     status: Optional[str] = None
     priority: Optional[str] = None
     related_decision_id: Optional[str] = None
@@ -31,4 +33,4 @@ class ActionUpdate(BaseModel):
 class ActionResponse(ActionBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
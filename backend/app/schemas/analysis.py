@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class AnalysisBase(BaseModel):
     scenario_id: Optional[int] = None
@@ -9,8 +11,8 @@ class AnalysisBase(BaseModel):
     analysis_type: Optional[str] = "workshop"
     status: Optional[str] = "planned"
     description: Optional[str] = None
-    scheduled_date: Optional[str] = None
-    completed_date: Optional[str] = None
+    scheduled_date: Optional[DateValue] = None
+    completed_date: Optional[DateValue] = None
 
 
 class AnalysisCreate(AnalysisBase):
@@ -24,12 +26,14 @@ class AnalysisUpdate(BaseModel):
     analysis_type: Optional[str] = None
     status: Optional[str] = None
     description: Optional[str] = None
-    scheduled_date: Optional[str] = None
-    completed_date: Optional[str] = None
+    scheduled_date: Optional[DateValue] = None
+    completed_date: Optional[DateValue] = None
 
 
 class AnalysisResponse(AnalysisBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    updated_at: Optional[Timestamp] = None
+    # child counts and open/overdue rollups, only with ?with_counts=true
+    counts: Optional[dict[str, int]] = None
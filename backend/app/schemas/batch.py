@@ -0,0 +1,16 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+MAX_BATCH_IDS = 10_000
+
+
+class BatchGetRequest(BaseModel):
+    ids: list[int] = Field(max_length=MAX_BATCH_IDS)
+
+
+class BatchGetResponse(BaseModel, Generic[T]):
+    items: list[T]
+    missing: list[int]
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+
+from ..core.timestamps import Timestamp
+
+
+class ChangeLogEntryResponse(BaseModel):
+    id: int
+    entity: str
+    entity_id: int
+    action: str
+    # field -> [old, new]
+    changes: dict[str, list[Any]]
+    changed_by: Optional[str] = None
+    changed_at: Timestamp
+
+
+class ChangeLogStatsResponse(BaseModel):
+    running: bool
+    queued: int
+    written: int
+    written_inline: int
+    dropped: int
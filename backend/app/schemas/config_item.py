@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import Timestamp
+
 
 class ConfigItemBase(BaseModel):
     code: Optional[str] = None
@@ -37,5 +39,5 @@ class ConfigItemUpdate(BaseModel):
 class ConfigItemResponse(ConfigItemBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    updated_at: Optional[Timestamp] = None
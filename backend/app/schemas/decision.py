@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class DecisionBase(BaseModel):
     session_id: Optional[int] = None
@@ -9,7 +11,7 @@ class DecisionBase(BaseModel):
     description: Optional[str] = None
     impact: Optional[str] = None
     decided_by: Optional[str] = None
-    decision_date: Optional[str] = None
+    decision_date: Optional[DateValue] = None
     status: Optional[str] = "pending"
     related_gap_id: Optional[str] = None
 
@@ -23,7 +25,7 @@ class DecisionUpdate(BaseModel):
     description: Optional[str] = None
     impact: Optional[str] = None
     decided_by: Optional[str] = None
-    decision_date: Optional[str] = None
+    decision_date: Optional[DateValue] = None
     status: Optional[str] = None
     related_gap_id: Optional[str] = None
 
@@ -31,4 +33,4 @@ class DecisionUpdate(BaseModel):
 class DecisionResponse(DecisionBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
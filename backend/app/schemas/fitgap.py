@@ -1,5 +1,7 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Any, Optional
+
+from ..core.timestamps import Timestamp
 
 
 class FitGapBase(BaseModel):
@@ -11,6 +13,7 @@ class FitGapBase(BaseModel):
     solution_type: Optional[str] = None
     priority: Optional[str] = None
     effort_estimate: Optional[str] = None
+    effort_days: Optional[float] = None
     assigned_to: Optional[str] = None
     related_decision_id: Optional[str] = None
     related_wricef_id: Optional[str] = None
@@ -28,6 +31,7 @@ class FitGapUpdate(BaseModel):
     solution_type: Optional[str] = None
     priority: Optional[str] = None
     effort_estimate: Optional[str] = None
+    effort_days: Optional[float] = None
     assigned_to: Optional[str] = None
     related_decision_id: Optional[str] = None
     related_wricef_id: Optional[str] = None
@@ -37,4 +41,17 @@ class FitGapUpdate(BaseModel):
 class FitGapResponse(FitGapBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+
+
+class FitGapCubeSlice(BaseModel):
+    dimensions: list[str]
+    cells: list[dict[str, Any]]
+    total: int
+
+
+class FitGapCubeResponse(BaseModel):
+    project_id: int
+    scenario_id: Optional[int] = None
+    fitgap: FitGapCubeSlice
+    requirements: FitGapCubeSlice
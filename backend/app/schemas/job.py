@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+
+from ..core.timestamps import Timestamp
+
+
+class JobCreate(BaseModel):
+    job_type: str
+    params: dict[str, Any] = {}
+
+
+class JobResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    params: dict[str, Any]
+    progress: float
+    message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    cancel_requested: bool
+    attempts: int
+    created_at: Timestamp
+    started_at: Optional[Timestamp] = None
+    finished_at: Optional[Timestamp] = None
+
+
+class JobTypeResponse(BaseModel):
+    name: str
+    description: str
+    concurrency: int
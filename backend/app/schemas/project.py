@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class ProjectBase(BaseModel):
     project_code: Optional[str] = None
@@ -9,9 +11,9 @@ class ProjectBase(BaseModel):
     customer_industry: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = "planning"
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
-    go_live_date: Optional[str] = None
+    start_date: Optional[DateValue] = None
+    end_date: Optional[DateValue] = None
+    go_live_date: Optional[DateValue] = None
     project_manager: Optional[str] = None
     solution_architect: Optional[str] = None
     functional_lead: Optional[str] = None
@@ -29,9 +31,9 @@ class ProjectUpdate(BaseModel):
     customer_industry: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
-    go_live_date: Optional[str] = None
+    start_date: Optional[DateValue] = None
+    end_date: Optional[DateValue] = None
+    go_live_date: Optional[DateValue] = None
     project_manager: Optional[str] = None
     solution_architect: Optional[str] = None
     functional_lead: Optional[str] = None
@@ -41,4 +43,38 @@ class ProjectUpdate(BaseModel):
 class ProjectResponse(ProjectBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    # True for rows served from the archive database
+    archived: bool = False
+
+
+class EffortSlice(BaseModel):
+    value: Optional[str] = None
+    items: int
+    estimated: int
+    effort_days: float
+
+
+class EffortTotals(BaseModel):
+    items: int
+    estimated: int
+    effort_days: float
+
+
+class EffortBreakdown(BaseModel):
+    total: EffortTotals
+    by_type: list[EffortSlice]
+    by_status: list[EffortSlice]
+    # WRICEF items only
+    by_complexity: Optional[list[EffortSlice]] = None
+
+
+class ProjectEffortResponse(BaseModel):
+    project_id: int
+    unit: str
+    total: EffortTotals
+    by_source: list[EffortSlice]
+    by_assignee: list[EffortSlice]
+    # absent when ?source= selects the other one
+    wricef: Optional[EffortBreakdown] = None
+    fitgap: Optional[EffortBreakdown] = None
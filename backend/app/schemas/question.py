@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import Timestamp
+
 
 class QuestionBase(BaseModel):
     session_id: Optional[int] = None
@@ -29,4 +31,4 @@ class QuestionUpdate(BaseModel):
 class QuestionResponse(QuestionBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
@@ -1,6 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
+from ..core.timestamps import Timestamp
+from .batch import MAX_BATCH_IDS
+
 
 class RequirementBase(BaseModel):
     code: Optional[str] = None
@@ -37,7 +40,7 @@ class RequirementUpdate(BaseModel):
     conversion_status: Optional[str] = None
     conversion_type: Optional[str] = None
     conversion_id: Optional[int] = None
-    converted_at: Optional[str] = None
+    converted_at: Optional[Timestamp] = None
     converted_by: Optional[str] = None
 
 
@@ -47,7 +50,81 @@ class RequirementResponse(RequirementBase):
     conversion_status: Optional[str] = None
     conversion_type: Optional[str] = None
     conversion_id: Optional[int] = None
-    converted_at: Optional[str] = None
+    converted_at: Optional[Timestamp] = None
     converted_by: Optional[str] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    updated_at: Optional[Timestamp] = None
+
+
+class RequirementDuplicate(BaseModel):
+    id: int
+    code: Optional[str] = None
+    title: Optional[str] = None
+    similarity: float
+
+
+class RequirementCreateResponse(RequirementResponse):
+    # only filled with ?return_duplicates=true
+    duplicates: Optional[list[RequirementDuplicate]] = None
+
+
+class DuplicateCluster(BaseModel):
+    size: int
+    requirements: list[RequirementDuplicate]
+
+
+class DuplicateClustersResponse(BaseModel):
+    project_id: int
+    threshold: float
+    clusters: list[DuplicateCluster]
+
+
+class ConversionTarget(BaseModel):
+    type: str
+    id: int
+    code: Optional[str] = None
+    title: Optional[str] = None
+    status: Optional[str] = None
+
+
+class SimilarRequirement(BaseModel):
+    id: int
+    project_id: Optional[int] = None
+    code: Optional[str] = None
+    title: Optional[str] = None
+    classification: Optional[str] = None
+    score: float
+    conversion: Optional[ConversionTarget] = None
+
+
+class SimilarRequirementsResponse(BaseModel):
+    requirement_id: int
+    results: list[SimilarRequirement]
+    index: dict
+
+
+class ClassificationSuggestRequest(BaseModel):
+    # default: every unclassified requirement
+    project_id: Optional[int] = None
+    requirement_ids: Optional[list[int]] = Field(None, max_length=MAX_BATCH_IDS)
+    include_classified: bool = False
+    min_confidence: float = Field(0.0, ge=0, le=1)
+    store: bool = True
+
+
+class ClassificationSuggestion(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    requirement_id: int
+    project_id: Optional[int] = None
+    classification: str
+    confidence: float
+    probabilities: Optional[dict[str, float]] = None
+    created_at: Optional[Timestamp] = None
+
+
+class ClassificationSuggestResponse(BaseModel):
+    classifier: dict
+    scored: int
+    stored: int
+    suggestions: list[ClassificationSuggestion]
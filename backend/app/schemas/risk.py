@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class RiskBase(BaseModel):
     session_id: Optional[int] = None
@@ -14,7 +16,7 @@ class RiskBase(BaseModel):
     mitigation_plan: Optional[str] = None
     owner: Optional[str] = None
     status: Optional[str] = "open"
-    due_date: Optional[str] = None
+    due_date: Optional[DateValue] = None
 
 
 class RiskCreate(RiskBase):
@@ -31,10 +33,27 @@ class RiskUpdate(BaseModel):
     mitigation_plan: Optional[str] = None
     owner: Optional[str] = None
     status: Optional[str] = None
-    due_date: Optional[str] = None
+    due_date: Optional[DateValue] = None
 
 
 class RiskResponse(RiskBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+
+
+class RiskMatrixCell(BaseModel):
+    probability: int
+    impact: int
+    score: float
+    count: int
+
+
+class RiskMatrixResponse(BaseModel):
+    project_id: int
+    probability_levels: list[int]
+    impact_levels: list[int]
+    cells: list[RiskMatrixCell]
+    total: int
+    unscored: int
+    top_risks: list[RiskResponse]
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import Timestamp
+
 
 class ScenarioBase(BaseModel):
     project_id: Optional[int] = None
@@ -33,5 +35,15 @@ class ScenarioUpdate(BaseModel):
 class ScenarioResponse(ScenarioBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    updated_at: Optional[Timestamp] = None
+    # child counts and open/overdue rollups, only with ?with_counts=true
+    counts: Optional[dict[str, int]] = None
+
+
+class ScenarioMembersUpdate(BaseModel):
+    member_ids: list[int]
+
+
+class ScenarioTreeNode(ScenarioResponse):
+    depth: int = 1
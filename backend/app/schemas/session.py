@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class SessionBase(BaseModel):
     project_id: Optional[int] = None
@@ -10,7 +12,7 @@ class SessionBase(BaseModel):
     session_code: Optional[str] = None
     module: Optional[str] = None
     facilitator: Optional[str] = None
-    session_date: Optional[str] = None
+    session_date: Optional[DateValue] = None
     status: Optional[str] = "planned"
     notes: Optional[str] = None
     location: Optional[str] = None
@@ -29,7 +31,7 @@ class SessionUpdate(BaseModel):
     session_code: Optional[str] = None
     module: Optional[str] = None
     facilitator: Optional[str] = None
-    session_date: Optional[str] = None
+    session_date: Optional[DateValue] = None
     status: Optional[str] = None
     notes: Optional[str] = None
     location: Optional[str] = None
@@ -39,4 +41,7 @@ class SessionUpdate(BaseModel):
 class SessionResponse(SessionBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    change_version: Optional[int] = None
+    # child counts and open/overdue rollups, only with ?with_counts=true
+    counts: Optional[dict[str, int]] = None
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class TestCycleBase(BaseModel):
     project_id: Optional[int] = None
@@ -9,8 +11,8 @@ class TestCycleBase(BaseModel):
     description: Optional[str] = None
     cycle_type: Optional[str] = "sit"
     status: Optional[str] = "planned"
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[DateValue] = None
+    end_date: Optional[DateValue] = None
     total_tests: Optional[int] = 0
     passed_tests: Optional[int] = 0
     failed_tests: Optional[int] = 0
@@ -29,8 +31,8 @@ class TestCycleUpdate(BaseModel):
     description: Optional[str] = None
     cycle_type: Optional[str] = None
     status: Optional[str] = None
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[DateValue] = None
+    end_date: Optional[DateValue] = None
     total_tests: Optional[int] = None
     passed_tests: Optional[int] = None
     failed_tests: Optional[int] = None
@@ -41,5 +43,26 @@ class TestCycleUpdate(BaseModel):
 class TestCycleResponse(TestCycleBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    updated_at: Optional[Timestamp] = None
+
+
+class BurndownPoint(BaseModel):
+    day: DateValue
+    total: int
+    passed: int
+    failed: int
+    blocked: int
+    not_run: int
+    other: int
+    executed: int
+    remaining: int
+    ideal_remaining: Optional[float] = None
+
+
+class TestCycleBurndownResponse(BaseModel):
+    test_cycle_id: int
+    start_date: Optional[DateValue] = None
+    end_date: Optional[DateValue] = None
+    taken_at: Optional[Timestamp] = None
+    points: list[BurndownPoint]
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class TestExecutionBase(BaseModel):
     test_cycle_id: Optional[int] = None
@@ -8,7 +10,7 @@ class TestExecutionBase(BaseModel):
     execution_code: Optional[str] = None
     status: Optional[str] = "not_run"
     executed_by: Optional[str] = None
-    execution_date: Optional[str] = None
+    execution_date: Optional[DateValue] = None
     actual_result: Optional[str] = None
     notes: Optional[str] = None
     defect_id: Optional[str] = None
@@ -24,7 +26,7 @@ class TestExecutionUpdate(BaseModel):
     execution_code: Optional[str] = None
     status: Optional[str] = None
     executed_by: Optional[str] = None
-    execution_date: Optional[str] = None
+    execution_date: Optional[DateValue] = None
     actual_result: Optional[str] = None
     notes: Optional[str] = None
     defect_id: Optional[str] = None
@@ -33,4 +35,14 @@ class TestExecutionUpdate(BaseModel):
 class TestExecutionResponse(TestExecutionBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+
+
+class TestExecutionEventResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    test_execution_id: int
+    test_cycle_id: Optional[int] = None
+    old_status: Optional[str] = None
+    new_status: Optional[str] = None
+    changed_at: Timestamp
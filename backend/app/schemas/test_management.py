@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import DateValue, Timestamp
+
 
 class TestManagementBase(BaseModel):
     code: Optional[str] = None
@@ -17,7 +19,7 @@ class TestManagementBase(BaseModel):
     expected_result: Optional[str] = None
     actual_result: Optional[str] = None
     assigned_to: Optional[str] = None
-    execution_date: Optional[str] = None
+    execution_date: Optional[DateValue] = None
 
 
 class TestManagementCreate(TestManagementBase):
@@ -39,11 +41,11 @@ class TestManagementUpdate(BaseModel):
     expected_result: Optional[str] = None
     actual_result: Optional[str] = None
     assigned_to: Optional[str] = None
-    execution_date: Optional[str] = None
+    execution_date: Optional[DateValue] = None
 
 
 class TestManagementResponse(TestManagementBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    updated_at: Optional[Timestamp] = None
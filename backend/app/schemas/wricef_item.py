@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from ..core.timestamps import Timestamp
+
 
 class WricefItemBase(BaseModel):
     code: Optional[str] = None
@@ -14,6 +16,7 @@ class WricefItemBase(BaseModel):
     priority: Optional[str] = None
     complexity: Optional[str] = None
     estimated_effort: Optional[str] = None
+    effort_days: Optional[float] = None
     assigned_to: Optional[str] = None
     functional_spec: Optional[str] = None
     technical_spec: Optional[str] = None
@@ -36,6 +39,7 @@ class WricefItemUpdate(BaseModel):
     priority: Optional[str] = None
     complexity: Optional[str] = None
     estimated_effort: Optional[str] = None
+    effort_days: Optional[float] = None
     assigned_to: Optional[str] = None
     functional_spec: Optional[str] = None
     technical_spec: Optional[str] = None
@@ -45,5 +49,5 @@ class WricefItemUpdate(BaseModel):
 class WricefItemResponse(WricefItemBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[Timestamp] = None
+    updated_at: Optional[Timestamp] = None
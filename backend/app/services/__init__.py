@@ -0,0 +1,17 @@
+"""Service layer.
+
+The modules below keep derived columns and tables in step through mapper
+listeners. They are imported here, and ``app.models`` imports this package
+once the mappers are configured, so the listeners are registered before the
+first ORM query or flush, whichever routers, scripts or jobs happen to be
+loaded, without loading the services whenever a model is imported.
+"""
+from . import (  # noqa: F401  (registers mapper listeners)
+    classifier,
+    duplicates,
+    effort,
+    fitgap_cube,
+    minutes,
+    risk_scoring,
+    test_progress,
+)
@@ -0,0 +1,114 @@
+"""Archive tier for closed projects.
+
+``archive_project`` copies a project's rows (ids preserved) and their change
+history into the archive database at ``ARCHIVE_DATABASE_URL`` and deletes them
+from the live one; ``restore_project`` does the reverse. The archive is served read-only under
+``/archive`` and through ``include_archived`` on the project list.
+"""
+import threading
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..core.config import settings
+from ..core.schema import ensure_schema
+from ..models.project import Project
+from .cascade import DERIVED, PLANS, cascade_delete
+from .project_transfer import copy_project, delete_history
+
+_lock = threading.Lock()
+_sessions: sessionmaker | None = None
+
+# SQLite's default host-parameter limit is 999 on older builds.
+_CHUNK = 500
+
+
+def archive_sessions() -> sessionmaker:
+    global _sessions
+    if _sessions is None:
+        with _lock:
+            if _sessions is None:
+                from ..core.database import make_engine
+
+                engine = make_engine(settings.ARCHIVE_DATABASE_URL)
+                ensure_schema(engine)
+                _sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return _sessions
+
+
+def get_archive_db():
+    db = archive_sessions()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def archivable_project_ids(db: Session) -> list[int]:
+    statuses = [s.lower() for s in settings.ARCHIVE_STATUSES]
+    return list(db.execute(
+        select(Project.id).where(func.lower(Project.status).in_(statuses)).order_by(Project.id)
+    ).scalars())
+
+
+def _move(source: Session, target: Session, project_id: int) -> dict[str, int]:
+    counts = copy_project(source, target, project_id)
+    target.commit()
+    delete_history(source, project_id)  # committed by the cascade
+    cascade_delete(source, Project, project_id, record=False)
+    return counts
+
+
+def archive_project(db: Session, project_id: int) -> dict[str, int]:
+    """Move one project from the live database into the archive."""
+    if db.get(Project, project_id) is None:
+        raise ValueError(f"project {project_id} not found")
+    archive = archive_sessions()()
+    try:
+        if archive.get(Project, project_id) is not None:
+            # left over from an interrupted run; the live copy wins
+            delete_history(archive, project_id)
+            cascade_delete(archive, Project, project_id, record=False)
+        return _move(db, archive, project_id)
+    except Exception:
+        archive.rollback()
+        raise
+    finally:
+        archive.close()
+
+
+def _conflicts(archive: Session, db: Session, project_id: int) -> dict[str, int]:
+    plan, _ = PLANS[Project](project_id)
+    conflicts: dict[str, int] = {}
+    for model, where in plan:
+        if not hasattr(model, "id") or model in DERIVED:
+            continue  # link rows are covered by their scenarios; aggregates are rebuilt
+        ids = list(archive.execute(select(model.id).where(where)).scalars())
+        for start in range(0, len(ids), _CHUNK):
+            chunk = ids[start:start + _CHUNK]
+            taken = db.execute(
+                select(func.count()).select_from(model).where(model.id.in_(chunk))
+            ).scalar_one()
+            if taken:
+                name = model.__tablename__
+                conflicts[name] = conflicts.get(name, 0) + taken
+    return conflicts
+
+
+def restore_project(db: Session, project_id: int) -> dict[str, int]:
+    """Move one project from the archive back into the live database."""
+    archive = archive_sessions()()
+    try:
+        if archive.get(Project, project_id) is None:
+            raise ValueError(f"project {project_id} is not archived")
+        conflicts = _conflicts(archive, db, project_id)
+        if conflicts:
+            detail = ", ".join(f"{table}: {n}" for table, n in conflicts.items())
+            raise ValueError(f"ids of project {project_id} were reused in the live database ({detail})")
+        try:
+            return _move(archive, db, project_id)
+        except Exception:
+            db.rollback()
+            raise
+    finally:
+        archive.close()
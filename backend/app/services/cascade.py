@@ -0,0 +1,337 @@
+"""Set-based cascade deletes and orphan sweeping.
+
+Each cascade is a plan of ``(model, where)`` pairs ordered leaves-first. The
+``where`` clauses are ``IN (subquery)`` filters rooted at the deleted row, so a
+subtree is removed with one ``DELETE`` per table inside one transaction and
+nothing is loaded through the ORM. The same plan answers dry-run counts.
+Rows that only point at the deleted subtree through a nullable reference
+(requirements of a session or analysis, WRICEF and config items of a scenario)
+are kept and their reference set to NULL (``DETACH``).
+
+These statements bypass the mapper listeners, so the cascade keeps their
+derived state itself, in the same transaction: cube and effort cells of
+deleted sessions and projects are in the plan, requirement cube cells of
+detached requirements are rebuilt per project, and change-log entries are
+written for deleted and detached rows. Cached minutes of deleted sessions are
+dropped after the commit. Classifier counts are kept on purpose (see
+:mod:`.classifier`); the similarity index masks deleted requirements on its
+next refresh (see :mod:`.similarity`).
+"""
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+
+from ..models.action import Action
+from ..models.agenda import Agenda
+from ..models.analysis import Analysis
+from ..models.classifier import RequirementSuggestion
+from ..models.attendee import Attendee
+from ..models.config_item import ConfigItem
+from ..models.decision import Decision
+from ..models.effort import EffortRollup
+from ..models.fitgap import FitGap
+from ..models.fitgap_cube import FitGapCube, RequirementCube
+from ..models.project import Project
+from ..models.question import Question
+from ..models.requirement import Requirement
+from ..models.requirement_index import RequirementBucket, RequirementSignature
+from ..models.risk import Risk
+from ..models.scenario import Scenario
+from ..models.scenario_link import ScenarioLink
+from ..models.session import Session as SessionModel
+from ..models.test_cycle import TestCycle
+from ..models.test_execution import TestExecution
+from ..models.test_management import TestManagement
+from ..models.test_progress import TestCycleSnapshot, TestExecutionEvent
+from ..models.wricef_item import WricefItem
+from . import change_log, minutes
+from .fitgap_cube import rebuild_cube
+from .rollups import SESSION_CHILDREN
+from .scenario_membership import (
+    link_filters,
+    rebuild_closure,
+    refresh_composites,
+    surviving_composites,
+)
+
+# Rows deleted with their session: its entities plus the per-session aggregates.
+SESSION_ROWS = [*SESSION_CHILDREN.values(), FitGapCube, EffortRollup]
+
+# Aggregates derived from other rows: deleted with their plan, rebuilt (not copied)
+# when a project moves between databases.
+DERIVED = (
+    FitGapCube, RequirementCube, RequirementSignature, RequirementBucket, RequirementSuggestion,
+    EffortRollup,
+)
+
+# (child, foreign key, parent) in parent-before-child order, used by the sweeper.
+RELATIONS = [
+    (Scenario, "project_id", Project),
+    (Analysis, "scenario_id", Scenario),
+    (SessionModel, "project_id", Project),
+    (SessionModel, "scenario_id", Scenario),
+    (SessionModel, "analysis_id", Analysis),
+    *[(model, "session_id", SessionModel) for model in SESSION_ROWS],
+    (Requirement, "project_id", Project),
+    (RequirementCube, "project_id", Project),
+    (RequirementSignature, "requirement_id", Requirement),
+    (RequirementBucket, "requirement_id", Requirement),
+    (RequirementSuggestion, "requirement_id", Requirement),
+    (WricefItem, "project_id", Project),
+    (EffortRollup, "project_id", Project),
+    (ConfigItem, "project_id", Project),
+    (TestManagement, "project_id", Project),
+    (TestCycle, "project_id", Project),
+    (TestExecution, "test_cycle_id", TestCycle),
+    (TestExecution, "test_case_id", TestManagement),
+    (TestExecutionEvent, "test_cycle_id", TestCycle),
+    (TestCycleSnapshot, "test_cycle_id", TestCycle),
+    (ScenarioLink, "composite_id", Scenario),
+    (ScenarioLink, "member_id", Scenario),
+]
+
+# (child, nullable foreign key, parent): dangling references are set to NULL, not deleted.
+DETACHED_RELATIONS = [
+    (Requirement, "session_id", SessionModel),
+    (Requirement, "analysis_id", Analysis),
+    (WricefItem, "scenario_id", Scenario),
+    (ConfigItem, "scenario_id", Scenario),
+]
+
+# Tables whose deleted rows get change-log entries (the ones with a history endpoint).
+LOGGED = (
+    Project, Scenario, Analysis, SessionModel, Requirement, WricefItem, ConfigItem,
+    TestManagement, TestCycle, TestExecution,
+    Question, FitGap, Decision, Risk, Action, Attendee, Agenda,
+)
+
+
+def _sessions(session_filter) -> list:
+    session_ids = select(SessionModel.id).where(session_filter)
+    return [(model, model.session_id.in_(session_ids)) for model in SESSION_ROWS] + [
+        (SessionModel, session_filter)
+    ]
+
+
+def _session_plan(session_id: int):
+    return _sessions(SessionModel.id == session_id), None
+
+
+def _analysis_plan(analysis_id: int):
+    return _sessions(SessionModel.analysis_id == analysis_id) + [
+        (Analysis, Analysis.id == analysis_id)
+    ], None
+
+
+def _scenario_sessions(scenario_id: int):
+    analyses = select(Analysis.id).where(Analysis.scenario_id == scenario_id)
+    return or_(SessionModel.scenario_id == scenario_id, SessionModel.analysis_id.in_(analyses))
+
+
+def _scenario_plan(scenario_id: int):
+    return _sessions(_scenario_sessions(scenario_id)) + [
+        (Analysis, Analysis.scenario_id == scenario_id),
+        *link_filters([scenario_id]),
+        (Scenario, Scenario.id == scenario_id),
+    ], [scenario_id]
+
+
+def _project_plan(project_id: int):
+    scenarios = select(Scenario.id).where(Scenario.project_id == project_id)
+    analyses = select(Analysis.id).where(Analysis.scenario_id.in_(scenarios))
+    cycles = select(TestCycle.id).where(TestCycle.project_id == project_id)
+    tests = select(TestManagement.id).where(TestManagement.project_id == project_id)
+    session_filter = or_(
+        SessionModel.project_id == project_id,
+        SessionModel.scenario_id.in_(scenarios),
+        SessionModel.analysis_id.in_(analyses),
+    )
+    return _sessions(session_filter) + [
+        (Analysis, Analysis.scenario_id.in_(scenarios)),
+        (
+            TestExecution,
+            or_(TestExecution.test_cycle_id.in_(cycles), TestExecution.test_case_id.in_(tests)),
+        ),
+        (TestExecutionEvent, TestExecutionEvent.test_cycle_id.in_(cycles)),
+        (TestCycleSnapshot, TestCycleSnapshot.test_cycle_id.in_(cycles)),
+        (TestCycle, TestCycle.project_id == project_id),
+        (TestManagement, TestManagement.project_id == project_id),
+        (ConfigItem, ConfigItem.project_id == project_id),
+        (WricefItem, WricefItem.project_id == project_id),
+        (EffortRollup, EffortRollup.project_id == project_id),
+        (Requirement, Requirement.project_id == project_id),
+        (RequirementCube, RequirementCube.project_id == project_id),
+        (RequirementSignature, RequirementSignature.project_id == project_id),
+        (RequirementBucket, RequirementBucket.project_id == project_id),
+        (RequirementSuggestion, RequirementSuggestion.project_id == project_id),
+        *link_filters(scenarios),
+        (Scenario, Scenario.project_id == project_id),
+        (Project, Project.id == project_id),
+    ], scenarios
+
+
+PLANS = {
+    Project: _project_plan,
+    Scenario: _scenario_plan,
+    Analysis: _analysis_plan,
+    SessionModel: _session_plan,
+}
+
+
+def _detach_sessions(session_filter) -> list:
+    sessions = select(SessionModel.id).where(session_filter)
+    return [(Requirement, "session_id", Requirement.session_id.in_(sessions))]
+
+
+# model -> (model, column, where) references to NULL before the plan runs. A
+# project's own requirements and items are deleted by its plan instead.
+DETACH = {
+    Project: lambda project_id: [],
+    Scenario: lambda scenario_id: _detach_sessions(_scenario_sessions(scenario_id)) + [
+        (
+            Requirement,
+            "analysis_id",
+            Requirement.analysis_id.in_(
+                select(Analysis.id).where(Analysis.scenario_id == scenario_id)
+            ),
+        ),
+        (WricefItem, "scenario_id", WricefItem.scenario_id == scenario_id),
+        (ConfigItem, "scenario_id", ConfigItem.scenario_id == scenario_id),
+    ],
+    Analysis: lambda analysis_id: _detach_sessions(SessionModel.analysis_id == analysis_id) + [
+        (Requirement, "analysis_id", Requirement.analysis_id == analysis_id),
+    ],
+    SessionModel: lambda session_id: _detach_sessions(SessionModel.id == session_id),
+}
+
+
+def _count(db: Session, model, where) -> int:
+    return db.execute(select(func.count()).select_from(model).where(where)).scalar_one()
+
+
+def _detach(db: Session, target, column: str, where, record: bool) -> tuple[int, set]:
+    """NULL ``column`` where ``where`` holds; returns (rows, their project ids)."""
+    rows = db.execute(
+        select(target.id, getattr(target, column), target.project_id).where(where)
+    ).all()
+    if not rows:
+        return 0, set()
+    db.execute(
+        update(target).where(where).values({column: None}),
+        execution_options={"synchronize_session": False},
+    )
+    if record:
+        change_log.record_many(
+            db, target, [(row_id, "update", {column: [old, None]}) for row_id, old, _ in rows]
+        )
+    return len(rows), {project_id for _, _, project_id in rows}
+
+
+def _delete(db: Session, target, where, want_ids: bool) -> tuple[int, list[int]]:
+    """Delete ``where``; returns (rows, their ids if ``want_ids``)."""
+    stmt = delete(target).where(where)
+    options = {"synchronize_session": False}
+    if not want_ids:
+        return db.execute(stmt, execution_options=options).rowcount, []
+    if db.get_bind().dialect.delete_returning:
+        ids = list(db.execute(stmt.returning(target.id), execution_options=options).scalars())
+    else:
+        ids = list(db.execute(select(target.id).where(where)).scalars())
+        db.execute(stmt, execution_options=options)
+    return len(ids), ids
+
+
+def cascade_delete(db: Session, model, item_id: int, dry_run: bool = False,
+                   record: bool = True) -> dict[str, int]:
+    """Delete ``model`` row ``item_id`` and its subtree; returns rows per table.
+
+    ``record=False`` skips the change log, for projects that are moved rather
+    than deleted (archive, shards).
+    """
+    plan, scenario_ids = PLANS[model](item_id)
+    detach = DETACH[model](item_id)
+    counts: dict[str, int] = {}
+
+    if dry_run:
+        for target, column, where in detach:
+            counts[f"{target.__tablename__}.{column}"] = _count(db, target, where)
+        for target, where in plan:
+            name = target.__tablename__
+            counts[name] = counts.get(name, 0) + _count(db, target, where)
+        return counts
+
+    record = record and settings.CHANGE_LOG_ENABLED
+    session_ids: list[int] = []
+    try:
+        if scenario_ids is not None:
+            ancestors, parents = surviving_composites(db, scenario_ids)
+        projects: set = set()
+        for target, column, where in detach:
+            detached, touched = _detach(db, target, column, where, record)
+            counts[f"{target.__tablename__}.{column}"] = detached
+            if target is Requirement:
+                projects |= touched
+        for target, where in plan:
+            name = target.__tablename__
+            logged = record and target in LOGGED
+            deleted, ids = _delete(db, target, where, logged or target is SessionModel)
+            counts[name] = counts.get(name, 0) + deleted
+            if logged:
+                change_log.record_many(db, target, [(i, "delete", {}) for i in ids])
+            if target is SessionModel:
+                session_ids += ids
+        for project_id in projects - {None}:
+            rebuild_cube(db, project_id)
+        if scenario_ids is not None:
+            refresh_composites(db, ancestors, parents)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.expire_all()
+    minutes.forget(db.get_bind(), session_ids)
+    return counts
+
+
+def _orphan_filter(child, fk: str, parent):
+    column = getattr(child, fk)
+    return column.isnot(None) & column.notin_(select(parent.id))
+
+
+def sweep_orphans(db: Session, dry_run: bool = False) -> dict[str, int]:
+    """Remove rows whose parent no longer exists, and NULL dangling optional references.
+
+    Parents are swept before children, so one pass also removes rows orphaned by
+    the sweep itself. A dry run only reports rows that are orphaned right now.
+    """
+    counts: dict[str, int] = {}
+    try:
+        for child, fk, parent in RELATIONS:
+            key = f"{child.__tablename__}.{fk}"
+            where = _orphan_filter(child, fk, parent)
+            if dry_run:
+                counts[key] = _count(db, child, where)
+            else:
+                counts[key] = db.execute(
+                    delete(child).where(where), execution_options={"synchronize_session": False}
+                ).rowcount
+        projects: set = set()
+        for child, fk, parent in DETACHED_RELATIONS:
+            key = f"{child.__tablename__}.{fk}"
+            where = _orphan_filter(child, fk, parent)
+            if dry_run:
+                counts[key] = _count(db, child, where)
+                continue
+            counts[key], touched = _detach(db, child, fk, where, settings.CHANGE_LOG_ENABLED)
+            if child is Requirement:
+                projects |= touched
+        if not dry_run:
+            rebuild_closure(db)
+            for project_id in projects - {None}:
+                rebuild_cube(db, project_id)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {k: v for k, v in counts.items() if v}
@@ -0,0 +1,275 @@
+"""Field-level change history, written off the request path.
+
+The CRUD helpers and the convert endpoints call :func:`record` after their
+commit with the diff of the write (``{field: [old, new]}``). ``record`` only
+puts the entry on a bounded in-process queue; a writer thread started in the
+API lifespan drains it and inserts the entries in batches of up to
+``CHANGE_LOG_BATCH_SIZE``, one transaction per batch and database (entries
+carry the engine of the session that made the change, so sharded projects
+keep their history in their own shard).
+
+When the queue is full, ``CHANGE_LOG_BACKPRESSURE`` decides: ``block`` waits
+up to ``CHANGE_LOG_BLOCK_SECONDS`` for room and then writes the entry on the
+request thread, so nothing is lost but slow storage slows writers down;
+``drop`` discards the entry and counts it. Without a running writer (scripts,
+``maintenance.py``) entries are written immediately. On shutdown the writer
+flushes whatever is queued before the process exits.
+
+Cascade deletes write their entries with :func:`record_many` inside the
+delete's transaction instead.
+
+``changed_by`` comes from the ``CHANGE_LOG_USER_HEADER`` request header, set
+per request by :class:`ChangeLogUserMiddleware`.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from datetime import date, datetime
+
+from sqlalchemy import insert, inspect
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.timestamps import utcnow
+from ..models.change_log import ChangeLog
+
+log = logging.getLogger(__name__)
+
+# Bookkeeping columns that are not reported as changes.
+IGNORED = ("id", "created_at", "updated_at")
+
+_user: ContextVar[str | None] = ContextVar("change_log_user", default=None)
+_STOP = object()
+_CHUNK = 500
+
+
+def _jsonable(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def column_values(obj) -> dict:
+    """Column attribute values of a loaded ORM object."""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def diff(before: dict, after: dict) -> dict:
+    """``{field: [old, new]}`` for every field whose value differs."""
+    return {
+        key: [before.get(key), after.get(key)]
+        for key in dict.fromkeys([*before, *after])
+        if key not in IGNORED and before.get(key) != after.get(key)
+    }
+
+
+class ChangeLogWriter:
+    """Bounded queue plus the thread that writes its entries in batches."""
+
+    def __init__(self, size: int, batch_size: int, flush_seconds: float,
+                 policy: str = "block", block_seconds: float = 0.5) -> None:
+        if policy not in ("block", "drop"):
+            raise ValueError(f"unknown change log backpressure policy {policy!r}")
+        self.queue: queue.Queue = queue.Queue(maxsize=size)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.policy = policy
+        self.block_seconds = block_seconds
+        self.written = 0
+        self.dropped = 0
+        self.inline = 0
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if not self.running:
+            self._thread = threading.Thread(target=self._run, name="change-log", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 30) -> None:
+        """Write everything queued so far and end the thread."""
+        if not self.running:
+            return
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, bind, entry: dict) -> None:
+        if not self.running:
+            self._write_inline(bind, entry)
+            return
+        try:
+            if self.policy == "drop":
+                self.queue.put_nowait((bind, entry))
+            else:
+                self.queue.put((bind, entry), timeout=self.block_seconds)
+            return
+        except queue.Full:
+            pass
+        if self.policy == "drop":
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                log.warning("change log queue full; %d entries dropped", self.dropped)
+            return
+        self._write_inline(bind, entry)
+
+    def flush(self, timeout: float = 10) -> bool:
+        """Wait until every queued entry is written; ``False`` on timeout."""
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return not self.queue.unfinished_tasks
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.queue.qsize(),
+            "written": self.written,
+            "written_inline": self.inline,
+            "dropped": self.dropped,
+        }
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                item = self.queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                continue
+            batch = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception:
+                self.dropped += len(batch)
+                log.exception("writing %d change log entries failed", len(batch))
+            finally:
+                for _ in range(len(batch) + stopping):
+                    self.queue.task_done()
+
+    def _write_inline(self, bind, entry: dict) -> None:
+        # the change itself is already committed; never fail the request over its history
+        try:
+            self._write([(bind, entry)])
+            self.inline += 1
+        except Exception:
+            self.dropped += 1
+            log.exception("writing a change log entry failed")
+
+    def _write(self, batch: list[tuple]) -> None:
+        by_bind: dict = {}
+        for bind, entry in batch:
+            by_bind.setdefault(bind, []).append(entry)
+        for bind, entries in by_bind.items():
+            with bind.begin() as connection:
+                connection.execute(insert(ChangeLog.__table__), entries)
+        self.written += len(batch)
+
+
+writer = ChangeLogWriter(
+    settings.CHANGE_LOG_QUEUE_SIZE,
+    settings.CHANGE_LOG_BATCH_SIZE,
+    settings.CHANGE_LOG_FLUSH_SECONDS,
+    settings.CHANGE_LOG_BACKPRESSURE,
+    settings.CHANGE_LOG_BLOCK_SECONDS,
+)
+
+
+def record(db: Session, model, entity_id: int, action: str, changes: dict) -> None:
+    """Queue one history entry; updates without changes are skipped."""
+    if not settings.CHANGE_LOG_ENABLED or (action == "update" and not changes):
+        return
+    writer.submit(db.get_bind(), {
+        "entity": model.__tablename__,
+        "entity_id": entity_id,
+        "action": action,
+        "changes": json.dumps(changes, default=_jsonable),
+        "changed_by": _user.get(),
+        "changed_at": utcnow(),
+    })
+
+
+def record_many(db: Session, model, entries: list[tuple[int, str, dict]]) -> None:
+    """Write ``(entity_id, action, changes)`` entries inside ``db``'s transaction.
+
+    For set-based writes (cascade deletes), whose history commits or rolls
+    back with them instead of going through the queue.
+    """
+    if not settings.CHANGE_LOG_ENABLED or not entries:
+        return
+    user, now = _user.get(), utcnow()
+    rows = [
+        {
+            "entity": model.__tablename__,
+            "entity_id": entity_id,
+            "action": action,
+            "changes": json.dumps(changes, default=_jsonable),
+            "changed_by": user,
+            "changed_at": now,
+        }
+        for entity_id, action, changes in entries
+    ]
+    for start in range(0, len(rows), _CHUNK):
+        db.execute(insert(ChangeLog.__table__), rows[start:start + _CHUNK])
+
+
+def history_rows(entries: list[ChangeLog], field: str | None = None,
+                 entity: str | None = None) -> list[dict]:
+    """Entries with ``changes`` decoded (and, with ``field``, narrowed to it).
+
+    ``entity`` replaces the stored table name, e.g. with the resource's path.
+    """
+    rows = []
+    for entry in entries:
+        changes = json.loads(entry.changes or "{}")
+        if field is not None:
+            changes = {field: changes[field]} if field in changes else {}
+        rows.append({
+            "id": entry.id,
+            "entity": entity or entry.entity,
+            "entity_id": entry.entity_id,
+            "action": entry.action,
+            "changes": changes,
+            "changed_by": entry.changed_by,
+            "changed_at": entry.changed_at,
+        })
+    return rows
+
+
+class ChangeLogUserMiddleware:
+    """Pure ASGI middleware making the request's user header available to :func:`record`."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.header = settings.CHANGE_LOG_USER_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        user = next((v for k, v in scope["headers"] if k == self.header), None)
+        token = _user.set(user.decode("latin-1") if user else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _user.reset(token)
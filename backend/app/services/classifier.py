@@ -0,0 +1,323 @@
+"""Fit/Gap classification suggestions from already classified requirements.
+
+A multinomial naive Bayes model over hashed text features: the tokens of a
+requirement's title and description (:mod:`.text_features`) plus its module,
+each hashed into ``2**FEATURE_BITS`` buckets so the vocabulary never has to be
+stored or rebuilt. The model is nothing but counts (``classifier_labels``,
+``classifier_features``), so training is incremental: mapper listeners
+(registered by importing this module) add a requirement's features when it is
+classified and subtract them when its text or classification changes or it is
+deleted. ``retrain_classifier`` (``maintenance.py retrain-classifier``)
+recounts everything after bulk loads.
+
+Counts are global across projects and are kept when a project is deleted or
+archived, so closed projects keep teaching the model until the next retrain.
+``suggest_classifications`` scores a batch in one pass: it reads the counts of
+the batch's distinct features once, then (with NumPy) computes every
+requirement's log-likelihoods with a single scatter-add.
+"""
+import math
+from collections import Counter
+
+from sqlalchemy import bindparam, delete, event, func, insert, or_, select, update
+from sqlalchemy.orm import Session, attributes
+
+from ..core.timestamps import utcnow
+from ..models.classifier import ClassifierFeature, ClassifierLabel, RequirementSuggestion
+from ..models.requirement import Requirement
+from .text_features import stable_hash, tokens
+
+# The classifications convert_requirement accepts.
+LABELS = ("Fit", "Gap", "Partial Fit")
+FEATURE_BITS = 20
+ALPHA = 1.0
+_CHUNK = 500
+_TRAINED = ("classification", "title", "description", "module")
+
+
+def features(title: str | None, description: str | None, module: str | None) -> Counter:
+    counts = Counter(stable_hash(token, FEATURE_BITS) for token in tokens(title, description))
+    if module:
+        counts[stable_hash(f"module:{module.strip().lower()}", FEATURE_BITS)] += 1
+    return counts
+
+
+def _label(value: str | None) -> str | None:
+    value = (value or "").strip()
+    return value if value in LABELS else None
+
+
+def _add(connection, label: str, counts: Counter, sign: int) -> None:
+    """Add (``sign=1``) or remove (``-1``) one document's ``counts`` under ``label``."""
+    labels, table = ClassifierLabel.__table__, ClassifierFeature.__table__
+    total = sum(counts.values())
+    result = connection.execute(
+        update(labels).where(labels.c.label == label).values(
+            documents=labels.c.documents + sign, features=labels.c.features + sign * total,
+        )
+    )
+    if result.rowcount == 0 and sign > 0:
+        connection.execute(insert(labels).values(label=label, documents=1, features=total))
+    if not counts:
+        return
+    existing = set(connection.execute(
+        select(table.c.feature).where(table.c.label == label, table.c.feature.in_(list(counts)))
+    ).scalars())
+    if existing:
+        connection.execute(
+            update(table)
+            .where(table.c.label == label, table.c.feature == bindparam("f"))
+            .values(count=table.c.count + bindparam("delta")),
+            [{"f": f, "delta": sign * counts[f]} for f in existing],
+        )
+    if sign > 0 and len(existing) < len(counts):
+        connection.execute(insert(table), [
+            {"label": label, "feature": f, "count": n}
+            for f, n in counts.items() if f not in existing
+        ])
+    if sign < 0:
+        connection.execute(delete(table).where(table.c.label == label, table.c.count <= 0))
+
+
+def _state(target: Requirement, before: bool) -> tuple[str | None, Counter | None]:
+    values = {}
+    for name in _TRAINED:
+        values[name] = getattr(target, name)
+        if before:
+            history = attributes.get_history(target, name)
+            if history.has_changes():
+                values[name] = history.deleted[0] if history.deleted else None
+    label = _label(values["classification"])
+    if label is None:
+        return None, None
+    return label, features(values["title"], values["description"], values["module"])
+
+
+@event.listens_for(Requirement, "after_insert")
+def _requirement_inserted(mapper, connection, target: Requirement) -> None:
+    label, counts = _state(target, before=False)
+    if label:
+        _add(connection, label, counts, 1)
+
+
+@event.listens_for(Requirement, "after_update")
+def _requirement_updated(mapper, connection, target: Requirement) -> None:
+    if not any(attributes.get_history(target, name).has_changes() for name in _TRAINED):
+        return
+    old_label, old_counts = _state(target, before=True)
+    new_label, new_counts = _state(target, before=False)
+    if (old_label, old_counts) == (new_label, new_counts):
+        return
+    if old_label:
+        _add(connection, old_label, old_counts, -1)
+    if new_label:
+        _add(connection, new_label, new_counts, 1)
+
+
+@event.listens_for(Requirement, "after_delete")
+def _requirement_deleted(mapper, connection, target: Requirement) -> None:
+    label, counts = _state(target, before=True)
+    if label:
+        _add(connection, label, counts, -1)
+
+
+def retrain_classifier(db: Session, batch_size: int = 1000) -> dict[str, int]:
+    """Recount the model from every classified requirement; does not commit."""
+    documents, totals = Counter(), Counter()
+    counts: dict[str, Counter] = {label: Counter() for label in LABELS}
+    rows = db.execute(
+        select(Requirement.classification, Requirement.title, Requirement.description,
+               Requirement.module)
+        .where(func.trim(Requirement.classification).in_(LABELS))
+        .execution_options(yield_per=batch_size)
+    )
+    for classification, title, description, module in rows:
+        label = _label(classification)
+        doc = features(title, description, module)
+        documents[label] += 1
+        totals[label] += sum(doc.values())
+        counts[label].update(doc)
+
+    db.execute(delete(ClassifierFeature), execution_options={"synchronize_session": False})
+    db.execute(delete(ClassifierLabel), execution_options={"synchronize_session": False})
+    labels = [
+        {"label": label, "documents": documents[label], "features": totals[label]}
+        for label in LABELS if documents[label]
+    ]
+    if labels:
+        db.execute(insert(ClassifierLabel), labels)
+    cells = [
+        {"label": label, "feature": f, "count": n}
+        for label, doc in counts.items() for f, n in doc.items()
+    ]
+    for start in range(0, len(cells), batch_size):
+        db.execute(insert(ClassifierFeature), cells[start:start + batch_size])
+    return dict(documents)
+
+
+def model_stats(db: Session) -> dict:
+    labels = db.execute(select(ClassifierLabel.label, ClassifierLabel.documents)).all()
+    vocabulary = db.execute(select(func.count(func.distinct(ClassifierFeature.feature)))).scalar()
+    return {"documents": {label: n for label, n in labels if n > 0}, "features": vocabulary or 0}
+
+
+def _log_probabilities(db: Session, vocabulary: list[int],
+                       size: int) -> tuple[list[str], list[float], list]:
+    """(labels, log priors, per-feature log P(feature | label) rows) for ``vocabulary``."""
+    priors = [
+        row for row in db.execute(
+            select(ClassifierLabel.label, ClassifierLabel.documents, ClassifierLabel.features)
+            .where(ClassifierLabel.documents > 0)
+            .order_by(ClassifierLabel.label)
+        )
+    ]
+    if not priors:
+        return [], [], []
+    labels = [row.label for row in priors]
+    column = {label: i for i, label in enumerate(labels)}
+    found: dict[int, list[int]] = {}
+    for start in range(0, len(vocabulary), _CHUNK):
+        chunk = vocabulary[start:start + _CHUNK]
+        for label, feature, count in db.execute(
+            select(ClassifierFeature.label, ClassifierFeature.feature, ClassifierFeature.count)
+            .where(ClassifierFeature.feature.in_(chunk))
+        ):
+            if label in column:
+                found.setdefault(feature, [0] * len(labels))[column[label]] = count
+
+    size = max(size, 1)
+    total_documents = sum(row.documents for row in priors)
+    log_priors = [math.log(row.documents / total_documents) for row in priors]
+    denominators = [math.log(row.features + ALPHA * size) for row in priors]
+    missing = [math.log(ALPHA) - d for d in denominators]
+    rows = [
+        [math.log(n + ALPHA) - d for n, d in zip(found[f], denominators)] if f in found else missing
+        for f in vocabulary
+    ]
+    return labels, log_priors, rows
+
+
+def _numpy():
+    # imported on first scoring, so loading the module (and its listeners) stays cheap
+    try:
+        import numpy
+    except ImportError:  # scored with plain loops instead
+        return None
+    return numpy
+
+
+def _posteriors(scores: list[float]) -> list[float]:
+    top = max(scores)
+    weights = [math.exp(s - top) for s in scores]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def suggest_classifications(
+    db: Session,
+    project_id: int | None = None,
+    requirement_ids: list[int] | None = None,
+    include_classified: bool = False,
+    min_confidence: float = 0.0,
+    store: bool = True,
+) -> dict:
+    """Score requirements (default: the unclassified ones) and optionally store the results.
+
+    Commits when ``store`` is set. Requirements without any text get no suggestion,
+    and neither does anything while fewer than two labels have been trained (a
+    single label would always win with confidence 1.0).
+    """
+    stmt = select(
+        Requirement.id, Requirement.project_id, Requirement.title, Requirement.description,
+        Requirement.module,
+    )
+    if project_id is not None:
+        stmt = stmt.where(Requirement.project_id == project_id)
+    if not include_classified:
+        stmt = stmt.where(or_(
+            Requirement.classification.is_(None),
+            func.trim(Requirement.classification).notin_(LABELS),
+        ))
+    if requirement_ids is None:
+        batches = [stmt]
+    else:
+        ids = sorted(set(requirement_ids))
+        batches = [
+            stmt.where(Requirement.id.in_(ids[start:start + _CHUNK]))
+            for start in range(0, len(ids), _CHUNK)
+        ]
+    docs = [
+        (row.id, row.project_id, features(row.title, row.description, row.module))
+        for batch in batches for row in db.execute(batch.order_by(Requirement.id))
+    ]
+    docs = [doc for doc in docs if doc[2]]
+
+    vocabulary = sorted({f for _, _, counts in docs for f in counts})
+    stats = model_stats(db)
+    labels, log_priors, rows = _log_probabilities(db, vocabulary, stats["features"])
+    result = {"classifier": stats, "scored": 0, "stored": 0, "suggestions": []}
+    if len(labels) < 2 or not docs:
+        return result
+
+    np = _numpy()
+    if np is not None:
+        position = {f: i for i, f in enumerate(vocabulary)}
+        doc_index, feature_index, weights = [], [], []
+        for i, (_, _, counts) in enumerate(docs):
+            for f, n in counts.items():
+                doc_index.append(i)
+                feature_index.append(position[f])
+                weights.append(n)
+        table = np.asarray(rows, dtype=np.float64)
+        scores = np.tile(np.asarray(log_priors), (len(docs), 1))
+        np.add.at(
+            scores, np.asarray(doc_index),
+            table[np.asarray(feature_index)] * np.asarray(weights, dtype=np.float64)[:, None],
+        )
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        probabilities = probabilities.tolist()
+    else:
+        row_of = dict(zip(vocabulary, rows))
+        probabilities = []
+        for _, _, counts in docs:
+            scores = list(log_priors)
+            for f, n in counts.items():
+                for j, value in enumerate(row_of[f]):
+                    scores[j] += n * value
+            probabilities.append(_posteriors(scores))
+
+    suggestions = []
+    for (requirement_id, pid, _), probs in zip(docs, probabilities):
+        best = max(range(len(labels)), key=probs.__getitem__)
+        if probs[best] < min_confidence:
+            continue
+        suggestions.append({
+            "requirement_id": requirement_id,
+            "project_id": pid,
+            "classification": labels[best],
+            "confidence": round(probs[best], 4),
+            "probabilities": {label: round(p, 4) for label, p in zip(labels, probs)},
+        })
+    result["scored"] = len(docs)
+    result["suggestions"] = suggestions
+
+    if store and suggestions:
+        now = utcnow()
+        ids = [s["requirement_id"] for s in suggestions]
+        for start in range(0, len(ids), _CHUNK):
+            db.execute(
+                delete(RequirementSuggestion)
+                .where(RequirementSuggestion.requirement_id.in_(ids[start:start + _CHUNK])),
+                execution_options={"synchronize_session": False},
+            )
+        db.execute(insert(RequirementSuggestion), [
+            {"requirement_id": s["requirement_id"], "project_id": s["project_id"],
+             "classification": s["classification"], "confidence": s["confidence"],
+             "created_at": now}
+            for s in suggestions
+        ])
+        db.commit()
+        result["stored"] = len(suggestions)
+    return result
@@ -0,0 +1,100 @@
+"""Requirement conversion into WRICEF and config items.
+
+``Fit`` requirements become config items, ``Gap`` and ``Partial Fit`` ones
+WRICEF items. Used by ``POST /requirements/{id}/convert`` and, for many
+requirements at once, by the ``convert-requirements`` job.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core.timestamps import utcnow
+from ..models.config_item import ConfigItem
+from ..models.requirement import Requirement
+from ..models.wricef_item import WricefItem
+from . import change_log
+
+CONVERTIBLE = ("Fit", "Gap", "Partial Fit")
+_CHUNK = 500
+_CONVERSION = ("conversion_status", "conversion_type", "conversion_id", "converted_at")
+
+
+def convert_requirement(db: Session, req: Requirement) -> dict:
+    """Create the requirement's config or WRICEF item; raises ``ValueError``. Commits."""
+    if req.conversion_status == "converted":
+        raise ValueError("Already converted")
+
+    classification = (req.classification or "").strip()
+    now = utcnow()
+    before = {key: getattr(req, key) for key in _CONVERSION}
+
+    if classification == "Fit":
+        item = ConfigItem(
+            title=req.title,
+            config_type=req.module or "standard",
+            description=req.description,
+            status="planned",
+            project_id=req.project_id,
+            requirement_id=req.id,
+            created_at=now,
+        )
+        conversion_type = "config"
+    elif classification in ("Gap", "Partial Fit"):
+        item = WricefItem(
+            title=req.title,
+            wricef_type="E",
+            description=req.description,
+            status="identified",
+            priority=req.priority,
+            project_id=req.project_id,
+            requirement_id=req.id,
+            created_at=now,
+        )
+        conversion_type = "wricef"
+    else:
+        raise ValueError(f"Invalid classification: {classification}")
+    db.add(item)
+    db.commit()
+    db.refresh(item)
+    created_id = item.id
+
+    created = change_log.diff({}, change_log.column_values(item))
+    after = {
+        "conversion_status": "converted",
+        "conversion_type": conversion_type,
+        "conversion_id": created_id,
+        "converted_at": now,
+    }
+    for key, val in after.items():
+        setattr(req, key, val)
+    db.commit()
+    change_log.record(db, type(item), created_id, "create", created)
+    change_log.record(db, Requirement, req.id, "convert", change_log.diff(before, after))
+
+    return {
+        "message": "Converted successfully",
+        "conversion_type": conversion_type,
+        "created_item_id": created_id,
+    }
+
+
+def convertible_ids(db: Session, project_id: int | None = None,
+                    requirement_ids: list[int] | None = None) -> list[int]:
+    """Ids of classified, not yet converted requirements (optionally limited), in id order."""
+    stmt = (
+        select(Requirement.id)
+        .where(
+            func.trim(Requirement.classification).in_(CONVERTIBLE),
+            Requirement.conversion_status.is_distinct_from("converted"),
+        )
+        .order_by(Requirement.id)
+    )
+    if project_id is not None:
+        stmt = stmt.where(Requirement.project_id == project_id)
+    if requirement_ids is None:
+        return list(db.execute(stmt).scalars())
+    wanted = sorted(set(requirement_ids))
+    ids = []
+    for start in range(0, len(wanted), _CHUNK):
+        chunk = wanted[start:start + _CHUNK]
+        ids += db.execute(stmt.where(Requirement.id.in_(chunk))).scalars()
+    return ids
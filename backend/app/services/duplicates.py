@@ -0,0 +1,300 @@
+"""Near-duplicate requirements via MinHash signatures and an LSH band index.
+
+Each requirement's title + description is reduced to a token set
+(:mod:`.text_features`) and a MinHash signature of ``BANDS * ROWS`` values;
+the share of equal values estimates the Jaccard similarity of two token sets.
+The signature is cut into ``BANDS`` bands and each band hashed into a bucket,
+so requirements with similar wording share at least one bucket with high
+probability (about 0.93 at Jaccard 0.5, 0.999 at 0.7). Lookups only read the
+buckets of one signature through the ``(project_id, bucket)`` index and then
+compare the few candidate signatures, independent of project size.
+
+Mapper listeners (registered by importing this module) keep the index in step
+with ORM writes; ``rebuild_duplicate_index`` (``maintenance.py
+rebuild-duplicate-index``) recomputes it after bulk loads.
+"""
+import hashlib
+import random
+from array import array
+from functools import lru_cache
+
+from sqlalchemy import delete, event, func, insert, select, true
+from sqlalchemy.orm import Session, attributes
+
+from ..core.config import settings
+from ..models.requirement import Requirement
+from ..models.requirement_index import RequirementBucket, RequirementSignature
+from .text_features import stable_hash, tokens
+
+BANDS = 20
+ROWS = 3
+NUM_PERM = BANDS * ROWS
+_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are persisted, so the permutations must never change.
+_rnd = random.Random(0x5EED)
+_PERMS = [(_rnd.randrange(1, _PRIME), _rnd.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_INDEXED = ("title", "description", "project_id")
+# Stays below SQLite's bound-parameter limit (999 on older builds).
+_CHUNK = 500
+
+
+@lru_cache(maxsize=16384)
+def _token_hashes(token: str) -> array:
+    # The vocabulary is small and repetitive, so most tokens hit the cache and a
+    # signature is one C-level min() per position.
+    h = stable_hash(token, 61)
+    return array("Q", [(a * h + b) % _PRIME for a, b in _PERMS])
+
+
+def signature(title: str | None, description: str | None = None) -> list[int] | None:
+    """MinHash signature of the text's token set; ``None`` if it has no tokens."""
+    rows = [_token_hashes(token) for token in set(tokens(title, description))]
+    if not rows:
+        return None
+    if len(rows) == 1:
+        return list(rows[0])
+    return list(map(min, *rows))
+
+
+def similarity(a, b) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _pack(sig: list[int]) -> bytes:
+    return array("Q", sig).tobytes()
+
+
+def _unpack(raw: bytes) -> array:
+    sig = array("Q")
+    sig.frombytes(raw)
+    return sig
+
+
+def _buckets(sig: list[int]) -> list[tuple[int, int]]:
+    result = []
+    for band in range(BANDS):
+        chunk = _pack(sig[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(bytes([band]) + chunk, digest_size=8).digest()
+        result.append((band, int.from_bytes(digest, "big") & ((1 << 63) - 1)))
+    return result
+
+
+def _rows(requirement_id: int, project_id: int | None, sig: list[int]) -> tuple[dict, list[dict]]:
+    return (
+        {"requirement_id": requirement_id, "project_id": project_id, "signature": _pack(sig)},
+        [
+            {"requirement_id": requirement_id, "band": band, "project_id": project_id,
+             "bucket": bucket}
+            for band, bucket in _buckets(sig)
+        ],
+    )
+
+
+def _unindex(connection, requirement_id: int) -> None:
+    for model in (RequirementSignature, RequirementBucket):
+        connection.execute(delete(model.__table__).where(
+            model.__table__.c.requirement_id == requirement_id
+        ))
+
+
+def _index(connection, target: Requirement) -> None:
+    _unindex(connection, target.id)
+    sig = signature(target.title, target.description)
+    if sig is None:
+        return
+    row, buckets = _rows(target.id, target.project_id, sig)
+    connection.execute(insert(RequirementSignature.__table__).values(row))
+    connection.execute(insert(RequirementBucket.__table__), buckets)
+
+
+@event.listens_for(Requirement, "after_insert")
+def _requirement_inserted(mapper, connection, target: Requirement) -> None:
+    _index(connection, target)
+
+
+@event.listens_for(Requirement, "after_update")
+def _requirement_updated(mapper, connection, target: Requirement) -> None:
+    if any(attributes.get_history(target, name).has_changes() for name in _INDEXED):
+        _index(connection, target)
+
+
+@event.listens_for(Requirement, "after_delete")
+def _requirement_deleted(mapper, connection, target: Requirement) -> None:
+    _unindex(connection, target.id)
+
+
+def rebuild_duplicate_index(db: Session, project_id: int | None = None,
+                            batch_size: int = 1000) -> int:
+    """Recompute signatures and buckets of one project (or all); does not commit."""
+    scope = true() if project_id is None else Requirement.project_id == project_id
+    for model in (RequirementSignature, RequirementBucket):
+        cells = true() if project_id is None else model.project_id == project_id
+        db.execute(delete(model).where(cells), execution_options={"synchronize_session": False})
+
+    indexed = 0
+    signatures, buckets = [], []
+
+    def flush():
+        if signatures:
+            db.execute(insert(RequirementSignature), signatures)
+            db.execute(insert(RequirementBucket), buckets)
+            signatures.clear()
+            buckets.clear()
+
+    rows = db.execute(
+        select(Requirement.id, Requirement.project_id, Requirement.title, Requirement.description)
+        .where(scope)
+        .execution_options(yield_per=batch_size)
+    )
+    for requirement_id, pid, title, description in rows:
+        sig = signature(title, description)
+        if sig is None:
+            continue
+        row, bands = _rows(requirement_id, pid, sig)
+        signatures.append(row)
+        buckets.extend(bands)
+        indexed += 1
+        if len(signatures) >= batch_size:
+            flush()
+    flush()
+    return indexed
+
+
+def _project_filter(column, project_id: int | None):
+    return column.is_(None) if project_id is None else column == project_id
+
+
+def find_duplicates(
+    db: Session,
+    title: str | None,
+    description: str | None,
+    project_id: int | None,
+    exclude_id: int | None = None,
+    threshold: float | None = None,
+    limit: int = 10,
+) -> list[dict]:
+    """Requirements of the same project whose estimated similarity reaches ``threshold``."""
+    threshold = settings.DUPLICATE_THRESHOLD if threshold is None else threshold
+    sig = signature(title, description)
+    if sig is None:
+        return []
+    candidates = (
+        select(RequirementBucket.requirement_id)
+        .where(
+            _project_filter(RequirementBucket.project_id, project_id),
+            RequirementBucket.bucket.in_([bucket for _, bucket in _buckets(sig)]),
+        )
+        .distinct()
+    )
+    if exclude_id is not None:
+        candidates = candidates.where(RequirementBucket.requirement_id != exclude_id)
+    rows = db.execute(
+        select(Requirement.id, Requirement.code, Requirement.title, RequirementSignature.signature)
+        .join(RequirementSignature, RequirementSignature.requirement_id == Requirement.id)
+        .where(Requirement.id.in_(candidates))
+    ).all()
+    matches = []
+    for requirement_id, code, req_title, raw in rows:
+        score = similarity(sig, _unpack(raw))
+        if score >= threshold:
+            matches.append({
+                "id": requirement_id, "code": code, "title": req_title,
+                "similarity": round(score, 3),
+            })
+    matches.sort(key=lambda m: (-m["similarity"], m["id"]))
+    return matches[:limit]
+
+
+def duplicate_clusters(db: Session, project_id: int, threshold: float | None = None) -> dict:
+    """Groups of the project's requirements linked by similarity >= ``threshold``.
+
+    Each shared bucket is checked against its first member only (a star, not
+    every pair), and members already in the same group are skipped, so the work
+    stays linear in the number of bucket rows even for large clusters.
+    """
+    threshold = settings.DUPLICATE_THRESHOLD if threshold is None else threshold
+    shared = (
+        select(RequirementBucket.bucket)
+        .where(RequirementBucket.project_id == project_id)
+        .group_by(RequirementBucket.bucket)
+        .having(func.count() > 1)
+    )
+    # Core rows: this can be ~BANDS rows per requirement, ORM row wrapping shows up.
+    conn = db.connection()
+    members = conn.execute(
+        select(RequirementBucket.bucket, RequirementBucket.requirement_id)
+        .where(RequirementBucket.project_id == project_id, RequirementBucket.bucket.in_(shared))
+        .order_by(RequirementBucket.bucket, RequirementBucket.requirement_id)
+    ).all()
+    paired = select(RequirementBucket.requirement_id).where(
+        RequirementBucket.project_id == project_id, RequirementBucket.bucket.in_(shared),
+    )
+    raw = dict(conn.execute(
+        select(RequirementSignature.requirement_id, RequirementSignature.signature)
+        .where(RequirementSignature.requirement_id.in_(paired))
+    ).all())
+    signatures: dict[int, array] = {}
+
+    def score(left: int, right: int) -> float:
+        if raw[left] == raw[right]:
+            return 1.0
+        for i in (left, right):
+            if i not in signatures:
+                signatures[i] = _unpack(raw[i])
+        return similarity(signatures[left], signatures[right])
+
+    parent: dict[int, int] = {}
+    best: dict[int, float] = {}
+
+    def root(x: int) -> int:
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    leader = current = None
+    for bucket, requirement_id in members:
+        if requirement_id not in raw:
+            continue
+        if bucket != current:
+            current, leader = bucket, requirement_id
+            continue
+        if root(leader) == root(requirement_id):
+            continue
+        value = score(leader, requirement_id)
+        if value < threshold:
+            continue
+        parent[root(leader)] = root(requirement_id)
+        best[leader] = max(best.get(leader, 0.0), value)
+        best[requirement_id] = max(best.get(requirement_id, 0.0), value)
+
+    details = {}
+    wanted = list(best)
+    for start in range(0, len(wanted), _CHUNK):
+        details.update((row.id, row) for row in conn.execute(
+            select(Requirement.id, Requirement.code, Requirement.title).where(
+                Requirement.project_id == project_id,
+                Requirement.id.in_(wanted[start:start + _CHUNK]),
+            )
+        ))
+    member_ids = list(best)
+    groups: dict[int, list[int]] = {}
+    for requirement_id in member_ids:
+        if requirement_id in details:
+            groups.setdefault(root(requirement_id), []).append(requirement_id)
+
+    clusters = [
+        {
+            "size": len(ids),
+            "requirements": [
+                {"id": i, "code": details[i].code, "title": details[i].title,
+                 "similarity": round(best[i], 3)}
+                for i in sorted(ids)
+            ],
+        }
+        for ids in groups.values()
+        if len(ids) > 1
+    ]
+    clusters.sort(key=lambda c: (-c["size"], c["requirements"][0]["id"]))
+    return {"project_id": project_id, "threshold": threshold, "clusters": clusters}
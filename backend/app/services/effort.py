@@ -0,0 +1,323 @@
+"""Numeric effort and per-project effort rollups.
+
+``WricefItem.estimated_effort`` and ``FitGap.effort_estimate`` are free text.
+:func:`parse_effort` turns the usual spellings ("5d", "3 days", "40h",
+"2 weeks", "1,5 PT", "1w 2d", "3-5d") into person-days, and mapper listeners
+(registered by importing this module) keep ``effort_days`` in step whenever
+the text changes, unless the client sent ``effort_days`` itself.
+``backfill_effort`` (``maintenance.py migrate-effort``) parses existing rows.
+
+``effort_rollup`` holds item counts and summed days per WRICEF project or
+fit-gap session and type x complexity x status x assignee, moved on every ORM
+write like the fit/gap cube, so :func:`project_effort` is one indexed query.
+"""
+import re
+
+from sqlalchemy import (
+    bindparam, delete, event, func, insert, literal, null, or_, select, true, update,
+)
+from sqlalchemy.orm import Session, attributes
+
+from ..core.config import settings
+from ..models.effort import EffortRollup
+from ..models.fitgap import FitGap
+from ..models.session import Session as SessionModel
+from ..models.wricef_item import WricefItem
+
+_NUMBER = r"\d+(?:[.,]\d+)?"
+_TERM = re.compile(rf"({_NUMBER})\s*([a-zäöü]*)\.?")
+_RANGE = re.compile(rf"({_NUMBER})\s*(?:-|–|to|bis)\s*({_NUMBER})\s*([a-zäöü]*)\.?")
+_APPROX = re.compile(r"^(?:~|ca\.?|approx\.?|about|circa|max\.?)\s*")
+_SEPARATOR = re.compile(r"\s*(?:\+|,\s|and\s|und\s)?\s*")
+
+_UNITS = {
+    "hours": ("h", "hr", "hrs", "hour", "hours", "std", "stunde", "stunden"),
+    "days": ("", "d", "day", "days", "pd", "pt", "md", "mt", "tag", "tage", "manday", "mandays",
+             "personday", "persondays", "manntag", "manntage", "personentag", "personentage"),
+    "weeks": ("w", "wk", "wks", "week", "weeks", "woche", "wochen"),
+    "months": ("mo", "mon", "month", "months", "pm", "monat", "monate"),
+}
+_UNIT = {spelling: unit for unit, spellings in _UNITS.items() for spelling in spellings}
+
+
+def _days(value: str, unit: str) -> float | None:
+    unit = _UNIT.get(unit)
+    if unit is None:
+        return None
+    amount = float(value.replace(",", "."))
+    if unit == "hours":
+        return amount / settings.EFFORT_HOURS_PER_DAY
+    if unit == "weeks":
+        return amount * settings.EFFORT_DAYS_PER_WEEK
+    if unit == "months":
+        return amount * settings.EFFORT_DAYS_PER_MONTH
+    return amount
+
+
+def parse_effort(text: str | None) -> float | None:
+    """Person-days for an effort string; ``None`` if it is empty or not understood.
+
+    A bare number is days; a range ("3-5d") counts as its midpoint; several
+    terms ("1w 2d", "1d + 4h") are added up.
+    """
+    if text is None:
+        return None
+    text = text.strip().lower().replace("-days", "days").replace("person-", "person")
+    text = _APPROX.sub("", text)
+    if not text:
+        return None
+    match = _RANGE.fullmatch(text)
+    if match:
+        low, high = _days(match[1], match[3]), _days(match[2], match[3])
+        return None if low is None else round((low + high) / 2, 4)
+    total, position = 0.0, 0
+    while position < len(text):
+        match = _TERM.match(text, position)
+        if not match:
+            return None
+        days = _days(match[1], match[2])
+        if days is None or (position and not match[2]):
+            return None
+        total += days
+        position = _SEPARATOR.match(text, match.end()).end()
+    return round(total, 4)
+
+
+# model -> (effort text attribute, rollup source name, {rollup column: model attribute})
+SOURCES = {
+    WricefItem: ("estimated_effort", "wricef", {
+        "project_id": "project_id", "item_type": "wricef_type", "complexity": "complexity",
+        "status": "status", "assigned_to": "assigned_to",
+    }),
+    FitGap: ("effort_estimate", "fitgap", {
+        "session_id": "session_id", "item_type": "solution_type", "status": "fit_gap_status",
+        "assigned_to": "assigned_to",
+    }),
+}
+DIMENSIONS = ("source", "item_type", "complexity", "status", "assigned_to")
+_KEY = ("project_id", "session_id", *DIMENSIONS)
+
+
+def _normalize(target, text_attribute: str) -> None:
+    text_changed = attributes.get_history(target, text_attribute).has_changes()
+    days_changed = attributes.get_history(target, "effort_days").has_changes()
+    if text_changed and not days_changed:
+        target.effort_days = parse_effort(getattr(target, text_attribute))
+
+
+def _match(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _bump(connection, key: dict, items: int, days: float | None) -> None:
+    table = EffortRollup.__table__
+    estimated = 0 if days is None else items
+    days = 0.0 if days is None else days * items
+    result = connection.execute(
+        update(table)
+        .where(*[_match(table.c[name], value) for name, value in key.items()])
+        .values(
+            item_count=table.c.item_count + items,
+            estimated=table.c.estimated + estimated,
+            effort_days=table.c.effort_days + days,
+        )
+    )
+    if result.rowcount == 0 and items > 0:
+        connection.execute(
+            insert(table).values(**key, item_count=items, estimated=estimated, effort_days=days)
+        )
+
+
+def _state(target, source: str, columns: dict, before: bool) -> tuple[dict, float | None]:
+    def value(name):
+        current = getattr(target, name)
+        if before:
+            history = attributes.get_history(target, name)
+            if history.has_changes():
+                return history.deleted[0] if history.deleted else None
+        return current
+
+    key = dict.fromkeys(_KEY)
+    key["source"] = source
+    key.update({column: value(name) for column, name in columns.items()})
+    return key, value("effort_days")
+
+
+def _register(model, text_attribute: str, source: str, columns: dict) -> None:
+    @event.listens_for(model, "before_insert")
+    @event.listens_for(model, "before_update")
+    def _parse(mapper, connection, target):
+        _normalize(target, text_attribute)
+
+    @event.listens_for(model, "after_insert")
+    def _inserted(mapper, connection, target):
+        key, days = _state(target, source, columns, before=False)
+        _bump(connection, key, 1, days)
+
+    @event.listens_for(model, "after_update")
+    def _updated(mapper, connection, target):
+        old = _state(target, source, columns, before=True)
+        new = _state(target, source, columns, before=False)
+        if old != new:
+            _bump(connection, old[0], -1, old[1])
+            _bump(connection, new[0], 1, new[1])
+
+    @event.listens_for(model, "after_delete")
+    def _deleted(mapper, connection, target):
+        key, days = _state(target, source, columns, before=True)
+        _bump(connection, key, -1, days)
+
+
+for _model, (_text, _source, _columns) in SOURCES.items():
+    _register(_model, _text, _source, _columns)
+
+
+def backfill_effort(db: Session, dry_run: bool = False, batch_size: int = 1000) -> dict:
+    """Parse the effort text of rows without ``effort_days``; commits unless ``dry_run``.
+
+    Returns per-model parsed counts and up to 20 strings that could not be parsed.
+    """
+    report = {"parsed": {}, "unparsed": {}, "examples": []}
+    for model, (text_attribute, source, _) in SOURCES.items():
+        text = getattr(model, text_attribute)
+        rows = db.execute(
+            select(model.id, text).where(model.effort_days.is_(None), text.isnot(None), text != "")
+        ).all()
+        parsed, unparsed = [], 0
+        for item_id, value in rows:
+            days = parse_effort(value)
+            if days is None:
+                unparsed += 1
+                if len(report["examples"]) < 20:
+                    report["examples"].append(value)
+            else:
+                parsed.append({"item_id": item_id, "days": days})
+        if not dry_run:
+            table = model.__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("item_id"))
+                .values(effort_days=bindparam("days"))
+            )
+            for start in range(0, len(parsed), batch_size):
+                db.execute(stmt, parsed[start:start + batch_size])
+        report["parsed"][source] = len(parsed)
+        report["unparsed"][source] = unparsed
+    if not dry_run:
+        rebuild_effort_rollup(db)
+        db.commit()
+    return report
+
+
+def rebuild_effort_rollup(db: Session, project_id: int | None = None) -> int:
+    """Recompute the rollup cells of one project (or all); does not commit."""
+    cells = true()
+    scopes = {WricefItem: true(), FitGap: true()}
+    if project_id is not None:
+        sessions = select(SessionModel.id).where(SessionModel.project_id == project_id)
+        cells = or_(EffortRollup.project_id == project_id, EffortRollup.session_id.in_(sessions))
+        scopes = {
+            WricefItem: WricefItem.project_id == project_id,
+            FitGap: FitGap.session_id.in_(sessions),
+        }
+    db.execute(delete(EffortRollup).where(cells), execution_options={"synchronize_session": False})
+
+    written = 0
+    for model, (_, source, columns) in SOURCES.items():
+        key = {name: null() for name in _KEY}
+        key["source"] = literal(source)
+        key.update({column: getattr(model, name) for column, name in columns.items()})
+        grouped = [key[name] for name in _KEY if name in columns.keys()]
+        stmt = (
+            select(
+                *[value.label(name) for name, value in key.items()],
+                func.count(),
+                func.count(model.effort_days),
+                func.coalesce(func.sum(model.effort_days), 0.0),
+            )
+            .where(scopes[model])
+            .group_by(*grouped)
+        )
+        result = db.execute(insert(EffortRollup).from_select(
+            [*_KEY, "item_count", "estimated", "effort_days"], stmt,
+        ))
+        written += result.rowcount
+    return written
+
+
+_SLICES = {"item_type": "by_type", "complexity": "by_complexity", "status": "by_status"}
+
+
+def _summary(items: int, estimated: int, days: float) -> dict:
+    return {"items": items, "estimated": estimated, "effort_days": round(days, 2)}
+
+
+def project_effort(db: Session, project_id: int, source: str | None = None) -> dict:
+    """Totals of a project's WRICEF and fit-gap effort by source and assignee,
+    plus per-source slices by type, (WRICEF) complexity and status.
+
+    ``source`` limits it to ``wricef`` or ``fitgap``; raises ``ValueError`` otherwise.
+    """
+    sources = [name for _, name, _ in SOURCES.values()]
+    if source is not None and source not in sources:
+        raise ValueError(f"unknown source {source!r}; expected {' or '.join(sources)}")
+    sessions = select(SessionModel.id).where(SessionModel.project_id == project_id)
+    group = [getattr(EffortRollup, name) for name in DIMENSIONS]
+    stmt = (
+        select(
+            *group,
+            func.sum(EffortRollup.item_count),
+            func.sum(EffortRollup.estimated),
+            func.sum(EffortRollup.effort_days),
+        )
+        .where(or_(EffortRollup.project_id == project_id, EffortRollup.session_id.in_(sessions)))
+        .group_by(*group)
+        .having(func.sum(EffortRollup.item_count) > 0)
+    )
+    if source is not None:
+        stmt = stmt.where(EffortRollup.source == source)
+
+    # item types and statuses come from different vocabularies per source
+    # (WRICEF type/status vs. fit-gap solution type/fit-gap status), so they
+    # are sliced per source; only assignees are shared
+    sourced = {
+        name: ("item_type", *(d for d in ("complexity", "status") if d in columns))
+        for _, name, columns in SOURCES.values()
+    }
+    totals = [0, 0, 0.0]
+    slices = {"source": {}, "assigned_to": {}}
+    breakdown = {
+        name: {"total": [0, 0, 0.0], **{dim: {} for dim in dims}}
+        for name, dims in sourced.items() if source in (None, name)
+    }
+
+    def add(cell: list, measures) -> None:
+        for i, measure in enumerate(measures):
+            cell[i] += measure or 0
+
+    for row in db.execute(stmt):
+        values = dict(zip(DIMENSIONS, row))
+        measures = row[len(DIMENSIONS):]
+        add(totals, measures)
+        for name in slices:
+            add(slices[name].setdefault(values[name], [0, 0, 0.0]), measures)
+        part = breakdown[values["source"]]
+        add(part["total"], measures)
+        for name in sourced[values["source"]]:
+            add(part[name].setdefault(values[name], [0, 0, 0.0]), measures)
+
+    def ordered(cells: dict) -> list[dict]:
+        rows = [{"value": value, **_summary(*cell)} for value, cell in cells.items()]
+        return sorted(rows, key=lambda r: (-r["effort_days"], -r["items"], str(r["value"])))
+
+    result = {
+        "project_id": project_id,
+        "unit": "person-days",
+        "total": _summary(*totals),
+        "by_source": ordered(slices["source"]),
+        "by_assignee": ordered(slices["assigned_to"]),
+    }
+    for name, part in breakdown.items():
+        result[name] = {"total": _summary(*part.pop("total"))}
+        result[name].update((_SLICES[dim], ordered(cells)) for dim, cells in part.items())
+    return result
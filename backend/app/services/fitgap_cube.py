@@ -0,0 +1,187 @@
+"""Pre-aggregated fit/gap and requirement counts for steering-committee breakdowns.
+
+``fitgap_cube`` holds one count per session and ``process_area`` x
+``fit_gap_status`` x ``solution_type`` x ``priority`` combination;
+``requirement_cube`` one per project/session/analysis and ``module`` x
+``classification``. Mapper listeners (registered by importing this module)
+move single rows between cells on every ORM insert/update/delete, so a query
+only sums a project's cells instead of scanning its gaps. Project and scenario
+come from the session (and, for requirements, the analysis) at query time, so
+moving a session needs no cube maintenance.
+
+Set-based writes bypass the listeners: cascade deletes remove the cube rows
+through their plan, project copies rebuild them, and ``rebuild_cube`` (also
+``maintenance.py rebuild-fitgap-cube``) recomputes them from the base tables.
+"""
+from sqlalchemy import delete, event, func, insert, select, true, update
+from sqlalchemy.orm import Session, attributes
+
+from ..models.analysis import Analysis
+from ..models.fitgap import FitGap
+from ..models.fitgap_cube import FitGapCube, RequirementCube
+from ..models.requirement import Requirement
+from ..models.session import Session as SessionModel
+
+FITGAP_DIMENSIONS = ("process_area", "fit_gap_status", "solution_type", "priority")
+REQUIREMENT_DIMENSIONS = ("module", "classification")
+
+# source model -> (cube model, key columns shared by both)
+CUBES = {
+    FitGap: (FitGapCube, ("session_id", *FITGAP_DIMENSIONS)),
+    Requirement: (
+        RequirementCube, ("project_id", "session_id", "analysis_id", *REQUIREMENT_DIMENSIONS),
+    ),
+}
+
+
+def _match(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _bump(connection, cube, key: dict, delta: int) -> None:
+    table = cube.__table__
+    result = connection.execute(
+        update(table)
+        .where(*[_match(table.c[name], value) for name, value in key.items()])
+        .values(count=table.c.count + delta)
+    )
+    if result.rowcount == 0 and delta > 0:
+        connection.execute(insert(table).values(**key, count=delta))
+
+
+def _keys(target, columns) -> tuple[dict, dict]:
+    """(key before this flush, key after it) for ``target``."""
+    new = {name: getattr(target, name) for name in columns}
+    old = dict(new)
+    for name in columns:
+        history = attributes.get_history(target, name)
+        if history.has_changes():
+            old[name] = history.deleted[0] if history.deleted else None
+    return old, new
+
+
+def _register(model, cube, columns) -> None:
+    @event.listens_for(model, "after_insert")
+    def _inserted(mapper, connection, target):
+        _bump(connection, cube, _keys(target, columns)[1], 1)
+
+    @event.listens_for(model, "after_update")
+    def _updated(mapper, connection, target):
+        old, new = _keys(target, columns)
+        if old != new:
+            _bump(connection, cube, old, -1)
+            _bump(connection, cube, new, 1)
+
+    @event.listens_for(model, "after_delete")
+    def _deleted(mapper, connection, target):
+        _bump(connection, cube, _keys(target, columns)[0], -1)
+
+
+for _model, (_cube, _columns) in CUBES.items():
+    _register(_model, _cube, _columns)
+
+
+def rebuild_cube(db: Session, project_id: int | None = None) -> dict[str, int]:
+    """Recompute the cube cells of one project (or all); does not commit."""
+    fitgap_scope = fitgap_cells = requirement_scope = requirement_cells = true()
+    if project_id is not None:
+        sessions = select(SessionModel.id).where(SessionModel.project_id == project_id)
+        fitgap_scope = FitGap.session_id.in_(sessions)
+        fitgap_cells = FitGapCube.session_id.in_(sessions)
+        requirement_scope = Requirement.project_id == project_id
+        requirement_cells = RequirementCube.project_id == project_id
+
+    counts = {}
+    for model, scope, cells in (
+        (FitGap, fitgap_scope, fitgap_cells),
+        (Requirement, requirement_scope, requirement_cells),
+    ):
+        cube, columns = CUBES[model]
+        db.execute(delete(cube).where(cells), execution_options={"synchronize_session": False})
+        key = [getattr(model, name) for name in columns]
+        grouped = select(*key, func.count()).where(scope).group_by(*key)
+        result = db.execute(insert(cube).from_select([*columns, "count"], grouped))
+        counts[cube.__tablename__] = result.rowcount
+    return counts
+
+
+def _parse_dimensions(raw: str | None, allowed: tuple[str, ...]) -> list[str]:
+    if raw is None:
+        return list(allowed)
+    dims = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = [d for d in dims if d not in allowed and d != "scenario_id"]
+    if unknown:
+        raise ValueError(
+            f"unknown dimension(s) {', '.join(unknown)}; expected {', '.join(allowed)} or scenario_id"
+        )
+    return dims
+
+
+def _slice(db: Session, stmt, columns: dict, dims: list[str], filters: dict, total) -> dict:
+    for name, values in filters.items():
+        if values:
+            stmt = stmt.where(columns[name].in_(values))
+    group = [columns[d].label(d) for d in dims]
+    rows = db.execute(
+        stmt.with_only_columns(*group, total.label("count"))
+        .group_by(*group)
+        .having(total > 0)
+        .order_by(total.desc())
+    ).mappings().all()
+    cells = [dict(row) for row in rows]
+    return {"dimensions": dims, "cells": cells, "total": sum(c["count"] for c in cells)}
+
+
+def fitgap_cube(
+    db: Session,
+    project_id: int,
+    scenario_id: int | None = None,
+    fitgap_dims: str | None = None,
+    requirement_dims: str | None = None,
+    filters: dict[str, list[str]] | None = None,
+) -> dict:
+    """Sum the project's cube cells grouped by the requested dimensions.
+
+    ``*_dims`` are comma separated (default: all; ``""`` gives totals only) and
+    may include ``scenario_id``. ``filters`` maps a dimension to allowed values.
+    Raises ``ValueError`` for unknown dimensions.
+    """
+    filters = filters or {}
+    gap_dims = _parse_dimensions(fitgap_dims, FITGAP_DIMENSIONS)
+    req_dims = _parse_dimensions(requirement_dims, REQUIREMENT_DIMENSIONS)
+
+    gap_columns = {name: getattr(FitGapCube, name) for name in FITGAP_DIMENSIONS}
+    gap_columns["scenario_id"] = SessionModel.scenario_id
+    gaps = (
+        select(FitGapCube.id)
+        .join(SessionModel, SessionModel.id == FitGapCube.session_id)
+        .where(SessionModel.project_id == project_id)
+    )
+
+    req_columns = {name: getattr(RequirementCube, name) for name in REQUIREMENT_DIMENSIONS}
+    req_columns["scenario_id"] = func.coalesce(SessionModel.scenario_id, Analysis.scenario_id)
+    requirements = (
+        select(RequirementCube.id)
+        .outerjoin(SessionModel, SessionModel.id == RequirementCube.session_id)
+        .outerjoin(Analysis, Analysis.id == RequirementCube.analysis_id)
+        .where(RequirementCube.project_id == project_id)
+    )
+
+    if scenario_id is not None:
+        gaps = gaps.where(gap_columns["scenario_id"] == scenario_id)
+        requirements = requirements.where(req_columns["scenario_id"] == scenario_id)
+
+    return {
+        "project_id": project_id,
+        "scenario_id": scenario_id,
+        "fitgap": _slice(
+            db, gaps, gap_columns, gap_dims,
+            {k: v for k, v in filters.items() if k in FITGAP_DIMENSIONS},
+            func.sum(FitGapCube.count),
+        ),
+        "requirements": _slice(
+            db, requirements, req_columns, req_dims,
+            {k: v for k, v in filters.items() if k in REQUIREMENT_DIMENSIONS},
+            func.sum(RequirementCube.count),
+        ),
+    }
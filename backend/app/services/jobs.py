@@ -0,0 +1,581 @@
+"""Background jobs for operations that are too long for a request.
+
+``POST /jobs`` stores a ``queued`` row in ``jobs`` and returns at once. The
+:class:`JobRunner` started in the API lifespan polls the table (and is woken
+on every enqueue), claims queued jobs with a conditional ``UPDATE`` and runs
+them on its own thread pool (``JOB_WORKERS``), so the request thread pool
+never waits on them. A job type runs at most ``concurrency`` jobs at a time
+across all API processes (``JOB_CONCURRENCY`` overrides the defaults below,
+enforced by the claim itself); jobs over the limit simply stay queued.
+
+Handlers are registered with :func:`job_type` and called as
+``handler(db, ctx, **params)``. ``ctx.progress(fraction, message)`` stores
+progress and is the point where a cancellation (``POST /jobs/{id}/cancel``)
+or a shutdown takes effect; queued jobs are cancelled immediately. Every
+handler reaches it at least once before committing. Jobs without a
+``project_id`` run on the main database and, with sharding, on every shard
+in turn, with one progress step per database.
+
+The runner refreshes ``heartbeat_at`` of its running jobs on every poll. A
+running job whose heartbeat is older than ``JOB_STALE_SECONDS``, or whose
+process on this host is gone when the runner starts, was interrupted: it is
+queued again, or failed after ``JOB_MAX_ATTEMPTS`` runs. A graceful shutdown
+puts jobs that reach ``ctx.progress`` back in the queue without using up an
+attempt; it waits at most its timeout for them and leaves any job still
+running to that recovery. A run writes progress and its final status only
+while its claim (worker and attempt) still holds, so a run whose job was
+recovered stops at its next ``ctx.progress`` without touching the new run.
+"""
+import inspect
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, TypeVar
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal, engine
+from ..core.schema import ensure_schema
+from ..core.timestamps import utcnow
+from ..models.job import Job
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+FINISHED = ("succeeded", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised by :meth:`JobContext.progress` once the job was cancelled."""
+
+
+class JobInterrupted(Exception):
+    """Raised by :meth:`JobContext.progress` while the runner shuts down."""
+
+
+@dataclass
+class JobType:
+    handler: Callable
+    concurrency: int
+    description: str
+
+
+JOB_TYPES: dict[str, JobType] = {}
+
+
+def job_type(name: str, concurrency: int = 1):
+    """Register ``handler(db, ctx, **params)`` as job type ``name``."""
+    def register(handler):
+        JOB_TYPES[name] = JobType(handler, concurrency, (handler.__doc__ or "").strip())
+        return handler
+    return register
+
+
+def concurrency(name: str) -> int:
+    return settings.JOB_CONCURRENCY.get(name, JOB_TYPES[name].concurrency)
+
+
+def get_jobs_db():
+    """Session on the main database (the catalog when sharding), where ``jobs`` lives."""
+    if settings.SCHEMA_AUTO_INIT:
+        ensure_schema(engine)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _session(params: dict) -> Session:
+    project_id = params.get("project_id")
+    if settings.SHARDING_ENABLED and project_id is not None:
+        from ..core.sharding import shard_router
+
+        return shard_router().session(project_id)
+    return SessionLocal()
+
+
+class JobContext:
+    def __init__(self, runner: "JobRunner", job_id: int, attempts: int) -> None:
+        self.runner = runner
+        self.job_id = job_id
+        self.attempts = attempts
+
+    def owned(self):
+        """Condition matching the job only while this run still owns it."""
+        return and_(
+            Job.id == self.job_id,
+            Job.worker == self.runner.worker_id,
+            Job.attempts == self.attempts,
+        )
+
+    def progress(self, fraction: float | None = None, message: str | None = None) -> None:
+        """Store progress; raises :class:`JobCancelled` / :class:`JobInterrupted` when due.
+
+        A run whose job was recovered (and possibly claimed again) in the
+        meantime is interrupted as well.
+        """
+        values = {"heartbeat_at": utcnow()}
+        if fraction is not None:
+            values["progress"] = min(max(fraction, 0.0), 1.0)
+        if message is not None:
+            values["message"] = message
+        with SessionLocal() as db:
+            owned = db.execute(update(Job).where(self.owned()).values(values)).rowcount
+            cancel = db.scalar(select(Job.cancel_requested).where(Job.id == self.job_id))
+            db.commit()
+        if not owned or self.runner.stopping:
+            raise JobInterrupted()
+        if cancel:
+            raise JobCancelled()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobRunner:
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+        self._running: set[int] = set()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.started:
+            return
+        self.stopping = False
+        with SessionLocal() as db:
+            self._recover(db, utcnow(), startup=True)
+            db.commit()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="job")
+        self._thread = threading.Thread(target=self._loop, name="job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 30) -> None:
+        """Stop claiming jobs; wait up to ``timeout`` for the running ones to finish or requeue."""
+        if not self.started:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.stopping = True
+        self._wake.set()
+        self._thread.join(timeout)
+        with self._idle:
+            self._idle.wait_for(
+                lambda: not self._running,
+                None if deadline is None else max(deadline - time.monotonic(), 0),
+            )
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._thread = self._executor = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self.stopping:
+            self._wake.clear()
+            try:
+                self._tick()
+            except Exception:
+                log.exception("job dispatch failed")
+            self._wake.wait(settings.JOB_POLL_SECONDS)
+
+    def _recover(self, db: Session, now, exclude=(), startup: bool = False) -> None:
+        stale = now - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        rows = db.execute(
+            select(Job.id, Job.attempts, Job.worker, Job.heartbeat_at, Job.cancel_requested)
+            .where(Job.status == "running", Job.id.notin_(list(exclude)))
+        ).all()
+        host = socket.gethostname()
+        for job_id, attempts, worker, heartbeat_at, cancel in rows:
+            owner, _, pid = (worker or "").rpartition(":")
+            dead = startup and owner == host and pid.isdigit() and (
+                worker == self.worker_id or not _alive(int(pid))
+            )
+            if not dead and heartbeat_at is not None and heartbeat_at >= stale:
+                continue
+            if cancel:
+                values = {"status": "cancelled", "finished_at": now}
+            elif attempts >= settings.JOB_MAX_ATTEMPTS:
+                values = {"status": "failed", "finished_at": now,
+                          "error": f"interrupted {attempts} time(s)"}
+            else:
+                values = {"status": "queued", "worker": None,
+                          "message": "requeued after interruption"}
+            # attempts changes with every claim, so a concurrent recovery cannot win twice
+            db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "running", Job.attempts == attempts)
+                .values(values)
+            )
+            log.warning("job %s was interrupted: %s", job_id, values["status"])
+
+    def _tick(self) -> None:
+        now = utcnow()
+        with SessionLocal() as db:
+            with self._lock:
+                own = list(self._running)
+            if own:
+                db.execute(
+                    update(Job).where(Job.id.in_(own), Job.worker == self.worker_id)
+                    .values(heartbeat_at=now)
+                )
+            self._recover(db, now, exclude=own)
+            db.commit()
+
+            slots = self.workers - len(own)
+            if slots <= 0 or self.stopping:
+                return
+            running = dict(db.execute(
+                select(Job.job_type, func.count()).where(Job.status == "running")
+                .group_by(Job.job_type)
+            ).all())
+            queued = db.execute(
+                select(Job.id, Job.job_type, Job.params, Job.attempts)
+                .where(Job.status == "queued").order_by(Job.id).limit(1000)
+            ).all()
+            for job_id, name, params, attempts in queued:
+                if slots == 0:
+                    break
+                if name not in JOB_TYPES:
+                    db.execute(update(Job).where(Job.id == job_id, Job.status == "queued").values(
+                        status="failed", finished_at=now, error=f"unknown job type {name!r}",
+                    ))
+                    db.commit()
+                    continue
+                limit = concurrency(name)
+                if running.get(name, 0) >= limit:
+                    continue
+                # the limit is part of the claim, so concurrent dispatchers cannot overshoot it
+                others = Job.__table__.alias("running_jobs")
+                busy = (
+                    select(func.count()).select_from(others)
+                    .where(others.c.job_type == name, others.c.status == "running")
+                    .scalar_subquery()
+                )
+                claimed = db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == "queued",
+                           Job.attempts == attempts, busy < limit)
+                    .values(status="running", worker=self.worker_id, started_at=now,
+                            heartbeat_at=now, attempts=attempts + 1, message=None)
+                ).rowcount
+                db.commit()
+                if not claimed:
+                    continue
+                running[name] = running.get(name, 0) + 1
+                slots -= 1
+                with self._lock:
+                    self._running.add(job_id)
+                ctx = JobContext(self, job_id, attempts + 1)
+                self._executor.submit(self._execute, ctx, name, json.loads(params))
+
+    def _execute(self, ctx: JobContext, name: str, params: dict) -> None:
+        job_id = ctx.job_id
+        values = {"status": "succeeded", "progress": 1.0}
+        db = _session(params)
+        try:
+            result = JOB_TYPES[name].handler(db, ctx, **params)
+            values["result"] = json.dumps(result, default=str)
+        except JobCancelled:
+            db.rollback()
+            values = {"status": "cancelled"}
+        except JobInterrupted:
+            db.rollback()
+            values = {"status": "queued", "worker": None, "started_at": None,
+                      "attempts": Job.attempts - 1, "message": "interrupted by shutdown"}
+        except Exception as exc:
+            db.rollback()
+            log.exception("job %s (%s) failed", job_id, name)
+            values = {"status": "failed", "error": f"{type(exc).__name__}: {exc}"}
+        finally:
+            db.close()
+        if values["status"] != "queued":
+            values["finished_at"] = utcnow()
+        try:
+            # a run that lost the job to a recovery leaves the new owner's row alone
+            with SessionLocal() as jobs:
+                jobs.execute(update(Job).where(ctx.owned()).values(values))
+                jobs.commit()
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+                self._idle.notify_all()
+            self.wake()
+
+
+runner = JobRunner(settings.JOB_WORKERS)
+
+
+def enqueue_job(db: Session, name: str, params: dict | None = None) -> Job:
+    """Queue a job after checking its type and params; raises ``ValueError``. Commits."""
+    params = params or {}
+    if name not in JOB_TYPES:
+        expected = ", ".join(sorted(JOB_TYPES))
+        raise ValueError(f"unknown job type {name!r}; expected one of {expected}")
+    try:
+        inspect.signature(JOB_TYPES[name].handler).bind(None, None, **params)
+    except TypeError as exc:
+        raise ValueError(f"invalid params for {name}: {exc}")
+    job = Job(job_type=name, status="queued", params=json.dumps(params), created_at=utcnow())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    runner.wake()
+    return job
+
+
+def cancel_job(db: Session, job: Job) -> Job:
+    """Cancel a queued job now or ask a running one to stop; raises ``ValueError`` if finished."""
+    if job.status in FINISHED:
+        raise ValueError(f"job {job.id} already {job.status}")
+    cancelled = db.execute(
+        update(Job).where(Job.id == job.id, Job.status == "queued")
+        .values(status="cancelled", cancel_requested=True, finished_at=utcnow())
+    ).rowcount
+    if not cancelled:
+        db.execute(update(Job).where(Job.id == job.id).values(cancel_requested=True))
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def job_row(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "params": json.loads(job.params or "{}"),
+        "progress": job.progress,
+        "message": job.message,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "cancel_requested": job.cancel_requested,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def _per_database(db: Session, ctx: JobContext, work: Callable[[Session], T],
+                  everywhere: bool = True) -> list[T]:
+    """``work(session)`` on ``db`` and, with sharding and ``everywhere``, on every shard.
+
+    Each database gets one progress step before its commit, so a cancellation
+    or shutdown discards the step it interrupts.
+    """
+    factories = [None]
+    if everywhere and settings.SHARDING_ENABLED:
+        from ..core.sharding import shard_router
+
+        factories += shard_router().databases(include_main=False)
+    results = []
+    for n, factory in enumerate(factories, 1):
+        session = db if factory is None else factory()
+        try:
+            results.append(work(session))
+            ctx.progress(n / len(factories), f"{n} of {len(factories)} database(s) done")
+            session.commit()
+        finally:
+            if factory is not None:
+                session.close()
+    return results
+
+
+def _summed(results: list[dict]) -> dict:
+    total: dict = {}
+    for result in results:
+        for key, value in result.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+# ─── Job types ───
+@job_type("rebuild-fitgap-cube")
+def _rebuild_fitgap_cube(db: Session, ctx: JobContext, project_id: int | None = None) -> dict:
+    """Recompute the fit/gap and requirement cube of one project (default: all)."""
+    from .fitgap_cube import rebuild_cube
+
+    return _summed(_per_database(
+        db, ctx, lambda session: rebuild_cube(session, project_id), project_id is None,
+    ))
+
+
+@job_type("rebuild-duplicate-index")
+def _rebuild_duplicate_index(db: Session, ctx: JobContext, project_id: int | None = None) -> dict:
+    """Recompute the MinHash/LSH near-duplicate index of one project (default: all)."""
+    from .duplicates import rebuild_duplicate_index
+
+    return {"indexed": sum(_per_database(
+        db, ctx, lambda session: rebuild_duplicate_index(session, project_id), project_id is None,
+    ))}
+
+
+@job_type("rebuild-similarity-index")
+def _rebuild_similarity_index(db: Session, ctx: JobContext) -> dict:
+    """Publish a new cross-project TF-IDF similarity index."""
+    from .similarity import build_index
+
+    return build_index(db, progress=ctx.progress)
+
+
+@job_type("retrain-classifier")
+def _retrain_classifier(db: Session, ctx: JobContext) -> dict:
+    """Recount the Fit/Gap naive Bayes model from every classified requirement."""
+    from .classifier import retrain_classifier
+
+    # the model is one set of counts in the main database, so this does not fan out
+    [documents] = _per_database(db, ctx, retrain_classifier, everywhere=False)
+    return {"documents": documents}
+
+
+@job_type("suggest-classifications", concurrency=2)
+def _suggest_classifications(
+    db: Session,
+    ctx: JobContext,
+    project_id: int | None = None,
+    requirement_ids: list[int] | None = None,
+    include_classified: bool = False,
+    min_confidence: float = 0.0,
+) -> dict:
+    """Score and store classification suggestions, one batch of requirements at a time."""
+    from ..models.requirement import Requirement
+    from .classifier import LABELS, suggest_classifications
+
+    if requirement_ids is None:
+        stmt = select(Requirement.id).order_by(Requirement.id)
+        if project_id is not None:
+            stmt = stmt.where(Requirement.project_id == project_id)
+        if not include_classified:
+            stmt = stmt.where(or_(
+                Requirement.classification.is_(None),
+                func.trim(Requirement.classification).notin_(LABELS),
+            ))
+        requirement_ids = list(db.execute(stmt).scalars())
+    summary = {"scored": 0, "stored": 0}
+    batch = 5000
+    for start in range(0, len(requirement_ids), batch):
+        result = suggest_classifications(
+            db, project_id, requirement_ids[start:start + batch], include_classified,
+            min_confidence, store=True,
+        )
+        summary["scored"] += result["scored"]
+        summary["stored"] += result["stored"]
+        done = min(start + batch, len(requirement_ids))
+        ctx.progress(done / len(requirement_ids), f"{done} of {len(requirement_ids)} scored")
+    return summary
+
+
+@job_type("migrate-effort")
+def _migrate_effort(db: Session, ctx: JobContext, dry_run: bool = False) -> dict:
+    """Parse free-text effort estimates into effort_days and rebuild the rollup."""
+    from .effort import backfill_effort
+
+    reports = _per_database(db, ctx, lambda session: backfill_effort(session, dry_run=dry_run))
+    return {
+        "parsed": _summed([r["parsed"] for r in reports]),
+        "unparsed": _summed([r["unparsed"] for r in reports]),
+        "examples": [e for r in reports for e in r["examples"]][:20],
+    }
+
+
+@job_type("snapshot-test-progress")
+def _snapshot_test_progress(db: Session, ctx: JobContext) -> dict:
+    """Log baseline execution statuses and write missing daily test cycle snapshots."""
+    from .test_progress import take_snapshots
+
+    days = sorted({day for part in _per_database(db, ctx, take_snapshots) for day in part})
+    return {
+        "days": len(days),
+        "first": days[0] if days else None,
+        "last": days[-1] if days else None,
+    }
+
+
+@job_type("backfill-risk-scores")
+def _backfill_risk_scores(db: Session, ctx: JobContext) -> dict:
+    """Recompute risk_score for every risk (NULL where unscorable)."""
+    from .risk_scoring import backfill_risk_scores
+
+    return {"updated": sum(_per_database(db, ctx, backfill_risk_scores))}
+
+
+@job_type("convert-requirements")
+def _convert_requirements(
+    db: Session,
+    ctx: JobContext,
+    project_id: int | None = None,
+    requirement_ids: list[int] | None = None,
+) -> dict:
+    """Convert classified requirements into config and WRICEF items (default: all pending).
+
+    Every conversion commits on its own, so a cancelled run keeps the ones done.
+    """
+    from ..models.requirement import Requirement
+    from .conversion import convert_requirement, convertible_ids
+
+    def convert(session: Session) -> dict:
+        ids = convertible_ids(session, project_id, requirement_ids)
+        counts = {"config": 0, "wricef": 0}
+        for n, requirement_id in enumerate(ids, 1):
+            result = convert_requirement(session, session.get(Requirement, requirement_id))
+            counts[result["conversion_type"]] += 1
+            if n % 100 == 0:
+                ctx.progress(None, f"{n} of {len(ids)} converted")
+        return counts
+
+    return _summed(_per_database(db, ctx, convert, project_id is None))
+
+
+@job_type("render-minutes", concurrency=2)
+def _render_minutes(
+    db: Session,
+    ctx: JobContext,
+    session_id: int | None = None,
+    analysis_id: int | None = None,
+    format: str = "md",
+    project_id: int | None = None,
+) -> dict:
+    """Render the minutes of one session or of all sessions of an analysis."""
+    from ..models.analysis import Analysis
+    from . import minutes
+
+    if (session_id is None) == (analysis_id is None):
+        raise ValueError("pass either session_id or analysis_id")
+    if session_id is not None:
+        content = minutes.session_minutes(db, session_id, format)
+        missing = f"session {session_id}"
+    else:
+        analysis = db.get(Analysis, analysis_id)
+        content = minutes.analysis_minutes(db, analysis, format) if analysis else None
+        missing = f"analysis {analysis_id}"
+    if content is None:
+        raise ValueError(f"{missing} not found")
+    ctx.progress(1.0, "rendered")
+    return {"format": format, "media_type": minutes.TEMPLATES[format].media_type,
+            "content": content}
@@ -0,0 +1,326 @@
+"""Workshop minutes rendered from a session's agenda, attendees and results.
+
+:func:`session_minutes` reads the session and its seven collections inside
+one transaction (an explicit ``BEGIN`` on SQLite, whose driver otherwise runs
+every SELECT on its own; ``REPEATABLE READ`` on PostgreSQL), so the document
+never mixes two states. The Markdown and HTML templates are compiled once at
+import: every section becomes a header string, a row format string and an
+``attrgetter``, and rendering a row is a single ``str.format``.
+
+Rendered session bodies are cached per database, session and format, and
+validated against ``analysis_sessions.change_version``. Mapper listeners
+(registered by importing this module) bump that counter on every ORM insert
+or delete of one of the session's rows and on every update that changes a
+column the minutes show or sort by, so a cached body is reused until the
+rendered document changes and a cache hit costs one primary-key read. Writes that
+bypass the ORM (bulk seeds) do not bump it. :func:`analysis_minutes` renders
+all sessions of an analysis on ``MINUTES_WORKERS`` threads, each with its
+own database session, and joins them into one document.
+"""
+import html
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date, datetime
+from operator import attrgetter
+
+from sqlalchemy import Column, event, func, select, update
+from sqlalchemy.orm import Session, attributes
+from sqlalchemy.sql import visitors
+
+from ..core.config import settings
+from ..models.action import Action
+from ..models.agenda import Agenda
+from ..models.analysis import Analysis
+from ..models.attendee import Attendee
+from ..models.decision import Decision
+from ..models.fitgap import FitGap
+from ..models.question import Question
+from ..models.risk import Risk
+from ..models.session import Session as SessionModel
+
+# (title, model, order, [(column label, attribute), ...]) in document order
+SECTIONS = (
+    ("Attendees", Attendee, (Attendee.name, Attendee.id), [
+        ("Name", "name"), ("Role", "role"), ("Department", "department"),
+        ("Attendance", "attendance_status"),
+    ]),
+    ("Agenda", Agenda, (Agenda.sort_order, Agenda.id), [
+        ("Topic", "topic"), ("Presenter", "presenter"), ("Duration", "duration"),
+        ("Status", "status"), ("Notes", "notes"),
+    ]),
+    ("Decisions", Decision, (Decision.decision_date, Decision.id), [
+        ("ID", "decision_id"), ("Decision", "title"), ("Description", "description"),
+        ("Decided by", "decided_by"), ("Date", "decision_date"), ("Status", "status"),
+    ]),
+    ("Questions", Question, (Question.id,), [
+        ("ID", "question_id"), ("Question", "question_text"), ("Answer", "answer_text"),
+        ("Assigned to", "assigned_to"), ("Status", "status"),
+    ]),
+    ("Fit/Gap", FitGap, (FitGap.process_area, FitGap.id), [
+        ("ID", "gap_id"), ("Process area", "process_area"), ("Description", "gap_description"),
+        ("Status", "fit_gap_status"), ("Solution", "solution_type"), ("Priority", "priority"),
+        ("Effort", "effort_estimate"),
+    ]),
+    ("Risks and issues", Risk, (Risk.risk_score.desc(), Risk.id), [
+        ("ID", "item_id"), ("Type", "type"), ("Title", "title"), ("Probability", "probability"),
+        ("Impact", "impact"), ("Mitigation", "mitigation_plan"), ("Owner", "owner"),
+        ("Status", "status"),
+    ]),
+    ("Action items", Action, (Action.due_date.is_(None), Action.due_date, Action.id), [
+        ("ID", "action_id"), ("Action", "title"), ("Assigned to", "assigned_to"),
+        ("Due", "due_date"), ("Priority", "priority"), ("Status", "status"),
+    ]),
+)
+SESSION_FIELDS = [
+    ("Code", "session_code"), ("Date", "session_date"), ("Module", "module"),
+    ("Facilitator", "facilitator"), ("Location", "location"), ("Duration", "duration"),
+    ("Status", "status"),
+]
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+class _Markdown:
+    media_type = "text/markdown"
+
+    @staticmethod
+    def cell(value) -> str:
+        text = html.escape(_text(value), quote=False).replace("\r", "")
+        text = text.replace("\\", "\\\\").replace("|", "\\|")
+        return text.replace("\n", "<br>")
+
+    @staticmethod
+    def table(labels: list[str]) -> tuple[str, str]:
+        head = "| " + " | ".join(labels) + " |\n" + "|---" * len(labels) + "|\n"
+        row = "| " + " | ".join(f"{{{i}}}" for i in range(len(labels))) + " |\n"
+        return head, row
+
+    section = "## {title} ({count})\n\n{table}\n"
+    empty = "## {title}\n\n_None recorded._\n\n"
+    field = "- **{label}:** {value}\n"
+    session = "# {title}\n\n{fields}\n{notes}{sections}"
+    notes = "{notes}\n\n"
+    document = "{body}"
+    separator = "\n---\n\n"
+    heading = "# {title}\n\n"
+
+
+class _Html:
+    media_type = "text/html"
+
+    @staticmethod
+    def cell(value) -> str:
+        return html.escape(_text(value)).replace("\n", "<br>")
+
+    @staticmethod
+    def table(labels: list[str]) -> tuple[str, str]:
+        head = "<table>\n<tr>" + "".join(f"<th>{html.escape(label)}</th>" for label in labels)
+        row = "<tr>" + "".join(f"<td>{{{i}}}</td>" for i in range(len(labels))) + "</tr>\n"
+        return head + "</tr>\n", row
+
+    section = "<h2>{title} ({count})</h2>\n{table}</table>\n"
+    empty = "<h2>{title}</h2>\n<p><em>None recorded.</em></p>\n"
+    field = "<li><strong>{label}:</strong> {value}</li>\n"
+    session = "<section>\n<h1>{title}</h1>\n<ul>\n{fields}</ul>\n{notes}{sections}</section>\n"
+    notes = "<p>{notes}</p>\n"
+    document = (
+        '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{title}</title>\n'
+        "</head>\n<body>\n{body}</body>\n</html>\n"
+    )
+    separator = ""
+    heading = "<h1>{title}</h1>\n"
+
+
+class _Template:
+    """One format with every section's header, row format and getter built up front."""
+
+    def __init__(self, fmt) -> None:
+        self.fmt = fmt
+        self.media_type = fmt.media_type
+        self.sections = []
+        for title, model, order, columns in SECTIONS:
+            head, row = fmt.table([label for label, _ in columns])
+            getter = attrgetter(*[name for _, name in columns])
+            self.sections.append((fmt.cell(title), model, order, head, row, getter))
+
+    def body(self, session: SessionModel, rows: list[list]) -> str:
+        fmt, cell = self.fmt, self.fmt.cell
+        fields = "".join(
+            fmt.field.format(label=label, value=cell(getattr(session, name)))
+            for label, name in SESSION_FIELDS if getattr(session, name) not in (None, "")
+        )
+        sections = []
+        for (title, _, _, head, row, getter), items in zip(self.sections, rows):
+            if not items:
+                sections.append(fmt.empty.format(title=title))
+                continue
+            table = head + "".join(row.format(*map(cell, getter(item))) for item in items)
+            sections.append(fmt.section.format(title=title, count=len(items), table=table))
+        return fmt.session.format(
+            title=cell(session.session_name),
+            fields=fields,
+            notes=fmt.notes.format(notes=cell(session.notes)) if session.notes else "",
+            sections="".join(sections),
+        )
+
+    def document(self, title: str, bodies: list[str], heading: bool = False) -> str:
+        body = self.fmt.separator.join(bodies)
+        if heading:
+            body = self.fmt.heading.format(title=self.fmt.cell(title)) + body
+        return self.fmt.document.format(title=self.fmt.cell(title), body=body)
+
+
+TEMPLATES = {"md": _Template(_Markdown), "html": _Template(_Html)}
+
+
+def template(fmt: str) -> _Template:
+    """The compiled template for ``md`` or ``html``; raises ``ValueError`` otherwise."""
+    if fmt not in TEMPLATES:
+        raise ValueError(f"unknown minutes format {fmt!r}; expected {' or '.join(TEMPLATES)}")
+    return TEMPLATES[fmt]
+
+
+# ─── Change version ───
+_sessions = SessionModel.__table__
+
+
+def _bump(connection, session_id) -> None:
+    if session_id is not None:
+        connection.execute(
+            update(_sessions)
+            .where(_sessions.c.id == session_id)
+            .values(change_version=func.coalesce(_sessions.c.change_version, 0) + 1)
+        )
+
+
+def _changed(target, names) -> bool:
+    return any(attributes.get_history(target, name).has_changes() for name in names)
+
+
+def _register(model, order, columns) -> None:
+    # the attributes shown in or sorting the section, and the one placing a row in it
+    rendered = {name for _, name in columns} | {"session_id"}
+    for clause in order:
+        rendered.update(c.key for c in visitors.iterate(clause) if isinstance(c, Column))
+
+    @event.listens_for(model, "after_insert")
+    @event.listens_for(model, "after_delete")
+    def _written(mapper, connection, target):
+        history = attributes.get_history(target, "session_id")
+        for session_id in {target.session_id, *history.deleted}:
+            _bump(connection, session_id)
+
+    @event.listens_for(model, "after_update")
+    def _updated(mapper, connection, target):
+        if _changed(target, rendered):
+            _written(mapper, connection, target)
+
+
+for _title, _model, _order, _columns in SECTIONS:
+    _register(_model, _order, _columns)
+
+_SESSION_RENDERED = ["session_name", "notes", *(name for _, name in SESSION_FIELDS)]
+
+
+@event.listens_for(SessionModel, "before_update")
+def _session_updated(mapper, connection, target: SessionModel) -> None:
+    if not _changed(target, _SESSION_RENDERED):
+        return
+    # SQL expression, so concurrent bumps from the child listeners are not lost
+    target.change_version = func.coalesce(SessionModel.change_version, 0) + 1
+
+
+# ─── Rendering ───
+_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _snapshot(db: Session) -> None:
+    """Run the following reads in one transaction snapshot."""
+    if db.in_transaction():
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    elif dialect == "sqlite":
+        db.connection().exec_driver_sql("BEGIN")
+
+
+def _body(db: Session, session: SessionModel, tmpl: _Template, fmt: str) -> str:
+    key = (str(db.get_bind().url), session.id, fmt)
+    stamp = (session.change_version or 0, session.created_at)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _cache.move_to_end(key)
+            return cached[1]
+    rows = [
+        db.execute(select(model).where(model.session_id == session.id).order_by(*order))
+        .scalars().all()
+        for _, model, order, _, _, _ in tmpl.sections
+    ]
+    body = tmpl.body(session, rows)
+    with _cache_lock:
+        _cache[key] = (stamp, body)
+        _cache.move_to_end(key)
+        while len(_cache) > settings.MINUTES_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return body
+
+
+def forget(bind, session_ids) -> None:
+    """Drop cached bodies of sessions removed by set-based deletes."""
+    url = str(bind.url)
+    with _cache_lock:
+        for session_id in session_ids:
+            for fmt in TEMPLATES:
+                _cache.pop((url, session_id, fmt), None)
+
+
+def _session_body(db: Session, session_id: int, fmt: str) -> tuple[SessionModel, str] | None:
+    tmpl = template(fmt)
+    _snapshot(db)
+    session = db.get(SessionModel, session_id)
+    if session is None:
+        return None
+    return session, _body(db, session, tmpl, fmt)
+
+
+def session_minutes(db: Session, session_id: int, fmt: str = "md") -> str | None:
+    """Minutes of one session as a document; ``None`` if the session does not exist."""
+    found = _session_body(db, session_id, fmt)
+    if found is None:
+        return None
+    session, body = found
+    return template(fmt).document(session.session_name or f"Session {session_id}", [body])
+
+
+def analysis_minutes(db: Session, analysis: Analysis, fmt: str = "md") -> str:
+    """Minutes of every session of ``analysis`` in one document, rendered in parallel."""
+    tmpl = template(fmt)
+    session_ids = db.execute(
+        select(SessionModel.id)
+        .where(SessionModel.analysis_id == analysis.id)
+        .order_by(SessionModel.session_date.is_(None), SessionModel.session_date, SessionModel.id)
+    ).scalars().all()
+    bind = db.get_bind()
+
+    def render(session_id: int) -> str | None:
+        with Session(bind=bind) as worker:
+            found = _session_body(worker, session_id, fmt)
+            return found[1] if found else None
+
+    workers = max(1, min(settings.MINUTES_WORKERS, len(session_ids)))
+    with ThreadPoolExecutor(workers, thread_name_prefix="minutes") as pool:
+        # each render runs in a copy of the request's context (statement budgets)
+        futures = [pool.submit(copy_context().run, render, sid) for sid in session_ids]
+        bodies = [body for body in (f.result() for f in futures) if body is not None]
+    return tmpl.document(analysis.title or f"Analysis {analysis.id}", bodies, heading=True)
@@ -0,0 +1,77 @@
+"""Copy every row of one project between databases.
+
+Rows are selected with the project's cascade plan (the same ``(model, where)``
+pairs :mod:`.cascade` deletes with) and inserted with their ids, parents
+first; derived aggregates are rebuilt on the target instead. The project's
+``change_log`` entries go along (with new ids, since the target has its own
+history). Used to move projects into shards and into/out of the archive.
+"""
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from ..models.change_log import ChangeLog
+from ..models.project import Project
+from ..models.scenario import Scenario
+from . import change_log
+from .cascade import DERIVED, LOGGED, PLANS
+from .duplicates import rebuild_duplicate_index
+from .effort import rebuild_effort_rollup
+from .fitgap_cube import rebuild_cube
+from .scenario_membership import rebuild_closure
+
+
+def project_rows(db: Session, project_id: int):
+    """Yield ``(table, rows)`` for the project, parents before children."""
+    plan, _ = PLANS[Project](project_id)
+    for model, where in reversed(plan):
+        if model in DERIVED:
+            continue
+        table = model.__table__
+        rows = [dict(r) for r in db.execute(select(table).where(where)).mappings()]
+        if rows:
+            yield table, rows
+
+
+def history_filter(project_id: int):
+    """``change_log`` rows of the project's rows that still exist."""
+    plan, _ = PLANS[Project](project_id)
+    return or_(*[
+        (ChangeLog.entity == model.__tablename__)
+        & ChangeLog.entity_id.in_(select(model.id).where(where))
+        for model, where in plan
+        if model in LOGGED
+    ])
+
+
+def delete_history(db: Session, project_id: int) -> int:
+    """Delete the project's ``change_log`` rows; does not commit."""
+    return db.execute(
+        delete(ChangeLog).where(history_filter(project_id)),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+
+
+def copy_project(source: Session, target: Session, project_id: int) -> dict[str, int]:
+    """Insert the project's rows from ``source`` into ``target``; does not commit."""
+    counts: dict[str, int] = {}
+    scenario_ids: set[int] = set()
+    for table, rows in project_rows(source, project_id):
+        target.execute(insert(table), rows)
+        counts[table.name] = counts.get(table.name, 0) + len(rows)
+        if table is Scenario.__table__:
+            scenario_ids.update(r["id"] for r in rows)
+    change_log.writer.flush()  # entries still queued belong to the source
+    history = [
+        {k: v for k, v in row.items() if k != "id"}
+        for row in source.execute(
+            select(ChangeLog.__table__).where(history_filter(project_id))
+        ).mappings()
+    ]
+    if history:
+        target.execute(insert(ChangeLog.__table__), history)
+        counts[ChangeLog.__tablename__] = len(history)
+    rebuild_closure(target, scenario_ids)
+    rebuild_cube(target, project_id)
+    rebuild_duplicate_index(target, project_id)
+    rebuild_effort_rollup(target, project_id)
+    return counts
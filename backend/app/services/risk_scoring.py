@@ -0,0 +1,149 @@
+"""Server-side risk scoring.
+
+``Risk.probability`` and ``Risk.impact`` are free-text labels. They are mapped
+to numeric levels through the configurable scales in ``settings`` and the
+score is written to ``Risk.risk_score`` on every insert/update (importing this
+module registers the mapper listeners). The same mapping is available as a SQL
+expression so existing rows can be backfilled with a single UPDATE.
+"""
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import and_, case, event, func, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.risk import Risk
+from ..models.session import Session as SessionModel
+
+
+def _normalize(label: Any) -> str:
+    return str(label).strip().lower().replace("_", " ").replace("-", " ")
+
+
+def _level(label: Any, levels: dict[str, int]) -> int | None:
+    if label is None:
+        return None
+    key = _normalize(label)
+    if key in levels:
+        return levels[key]
+    if key.isdigit() and int(key) in levels.values():
+        return int(key)
+    return None
+
+
+def probability_level(label: Any) -> int | None:
+    return _level(label, settings.RISK_PROBABILITY_LEVELS)
+
+
+def impact_level(label: Any) -> int | None:
+    return _level(label, settings.RISK_IMPACT_LEVELS)
+
+
+def score_levels(p: int | None, i: int | None) -> float | None:
+    if p is None or i is None:
+        return None
+    matrix = settings.RISK_SCORE_MATRIX
+    if matrix:
+        return float(matrix[p - 1][i - 1])
+    return float(p * i)
+
+
+def score_risk(probability: Any, impact: Any) -> float | None:
+    return score_levels(probability_level(probability), impact_level(impact))
+
+
+def _level_expression(column, levels: dict[str, int]):
+    normalized = func.lower(func.trim(func.replace(func.replace(column, "_", " "), "-", " ")))
+    whens = {label: level for label, level in levels.items()}
+    for level in set(levels.values()):
+        whens.setdefault(str(level), level)
+    return case(whens, value=normalized, else_=None)
+
+
+def risk_score_expression():
+    """SQL equivalent of :func:`score_risk` over the ``risks_issues`` columns."""
+    p = _level_expression(Risk.probability, settings.RISK_PROBABILITY_LEVELS)
+    i = _level_expression(Risk.impact, settings.RISK_IMPACT_LEVELS)
+    matrix = settings.RISK_SCORE_MATRIX
+    if not matrix:
+        return p * i
+    return case(
+        *[
+            (and_(p == pi + 1, i == ii + 1), float(score))
+            for pi, row in enumerate(matrix)
+            for ii, score in enumerate(row)
+        ],
+        else_=None,
+    )
+
+
+@event.listens_for(Risk, "before_insert")
+@event.listens_for(Risk, "before_update")
+def _apply_risk_score(mapper, connection, target: Risk) -> None:
+    # unscorable labels clear the score instead of leaving a stale one behind
+    target.risk_score = score_risk(target.probability, target.impact)
+
+
+def backfill_risk_scores(db: Session) -> int:
+    """Recompute ``risk_score`` for every row (NULL where unscorable). Returns rows updated."""
+    expr = risk_score_expression()
+    for index in Risk.__table__.indexes:
+        index.create(db.get_bind(), checkfirst=True)
+    result = db.execute(
+        update(Risk).where(Risk.risk_score.is_distinct_from(expr)).values(risk_score=expr),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return result.rowcount
+
+
+def risk_matrix(
+    db: Session,
+    project_id: int,
+    top_n: int = 10,
+    status: str | None = None,
+) -> dict:
+    """Probability x impact cell counts and top-N risks across a project's sessions."""
+    scope = [SessionModel.project_id == project_id]
+    if status is not None:
+        scope.append(Risk.status == status)
+
+    rows = (
+        db.query(Risk.probability, Risk.impact, func.count(Risk.id))
+        .join(SessionModel, SessionModel.id == Risk.session_id)
+        .filter(*scope)
+        .group_by(Risk.probability, Risk.impact)
+        .all()
+    )
+
+    cells: dict[tuple[int, int], int] = defaultdict(int)
+    unscored = 0
+    for probability, impact, count in rows:
+        p, i = probability_level(probability), impact_level(impact)
+        if p is None or i is None:
+            unscored += count
+        else:
+            cells[(p, i)] += count
+
+    top = (
+        db.query(Risk)
+        .join(SessionModel, SessionModel.id == Risk.session_id)
+        .filter(*scope, Risk.risk_score.isnot(None))
+        .order_by(Risk.risk_score.desc(), Risk.id)
+        .limit(top_n)
+        .all()
+    )
+
+    return {
+        "project_id": project_id,
+        "probability_levels": sorted(set(settings.RISK_PROBABILITY_LEVELS.values())),
+        "impact_levels": sorted(set(settings.RISK_IMPACT_LEVELS.values())),
+        "cells": [
+            {"probability": p, "impact": i, "score": score_levels(p, i), "count": count}
+            for (p, i), count in sorted(cells.items())
+        ],
+        "total": sum(cells.values()) + unscored,
+        "unscored": unscored,
+        "top_risks": top,
+    }
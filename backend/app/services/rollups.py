@@ -0,0 +1,148 @@
+"""Per-row child counts and status rollups for list endpoints (``with_counts=true``).
+
+Each child table is aggregated once with ``GROUP BY`` and outer-joined to the
+listed rows, so a page of sessions, analyses or scenarios costs one statement
+no matter how many rows it has. The aggregates are restricted to the ids the
+list's own filters select, so a filtered list does not scan unrelated rows.
+The counts are attached to the ORM objects as ``counts`` for the response
+models to pick up.
+"""
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from ..core.timestamps import utcnow
+from ..models.action import Action
+from ..models.agenda import Agenda
+from ..models.analysis import Analysis
+from ..models.attendee import Attendee
+from ..models.config_item import ConfigItem
+from ..models.decision import Decision
+from ..models.fitgap import FitGap
+from ..models.question import Question
+from ..models.requirement import Requirement
+from ..models.risk import Risk
+from ..models.scenario import Scenario
+from ..models.session import Session as SessionModel
+from ..models.wricef_item import WricefItem
+
+# Statuses that take a question/risk/action off the open list (case-insensitive).
+CLOSED_STATUSES = ("answered", "closed", "resolved", "mitigated", "completed", "done", "cancelled")
+
+# name -> model of the entities a session owns through ``session_id``; the
+# cascade deletes them with their session (services.cascade)
+SESSION_CHILDREN = {
+    "questions": Question,
+    "fitgaps": FitGap,
+    "decisions": Decision,
+    "risks": Risk,
+    "actions": Action,
+    "attendees": Attendee,
+    "agenda_items": Agenda,
+}
+
+# requirements only reference their session (detached, not deleted, with it)
+COUNTED_CHILDREN = {**SESSION_CHILDREN, "requirements": Requirement}
+
+SESSION_COUNTS = list(COUNTED_CHILDREN) + [
+    "open_questions", "open_risks", "open_actions", "overdue_actions",
+]
+
+
+def is_open(model):
+    return func.lower(func.coalesce(model.status, "open")).notin_(CLOSED_STATUSES)
+
+
+def _session_rollups() -> dict[str, dict]:
+    """Status rollups counted next to a child's total: child -> {name: condition}."""
+    today = utcnow().date()
+    return {
+        "questions": {"open_questions": is_open(Question)},
+        "risks": {"open_risks": is_open(Risk)},
+        "actions": {
+            "open_actions": is_open(Action),
+            "overdue_actions": is_open(Action) & (Action.due_date < today),
+        },
+    }
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _grouped(key, ids, total: str = "total", extra: dict | None = None):
+    """``SELECT key, count(*) AS <total>, <extra sums> ... WHERE key IN ids GROUP BY key``."""
+    columns = [key.label("key"), func.count().label(total)]
+    columns += [_count_if(condition).label(name) for name, condition in (extra or {}).items()]
+    return select(*columns).where(key.in_(ids)).group_by(key).subquery()
+
+
+def _per_session(session_ids):
+    """One row per selected session: its id, parents and every session count."""
+    stmt = select(
+        SessionModel.id.label("key"), SessionModel.analysis_id, SessionModel.scenario_id,
+    ).where(SessionModel.id.in_(session_ids))
+    rollups = _session_rollups()
+    for name, model in COUNTED_CHILDREN.items():
+        extra = rollups.get(name, {})
+        sub = _grouped(model.session_id, session_ids, extra=extra)
+        stmt = stmt.outerjoin(sub, sub.c.key == SessionModel.id).add_columns(
+            func.coalesce(sub.c.total, 0).label(name),
+            *(func.coalesce(sub.c[rollup], 0).label(rollup) for rollup in extra),
+        )
+    return stmt.subquery()
+
+
+def _sessions_by(per_session, parent):
+    """Session counts summed per ``parent`` column (``analysis_id`` / ``scenario_id``)."""
+    key = per_session.c[parent]
+    return select(
+        key.label("key"),
+        func.count().label("sessions"),
+        *(func.sum(per_session.c[name]).label(name) for name in SESSION_COUNTS),
+    ).where(key.isnot(None)).group_by(key).subquery()
+
+
+def _attach(rows, names) -> list:
+    items = []
+    for obj, *values in rows:
+        obj.counts = {name: int(value or 0) for name, value in zip(names, values)}
+        items.append(obj)
+    return items
+
+
+def _select_with(model, conditions, joins):
+    """``SELECT model, <counts>`` with each ``(subquery, names)`` outer-joined on ``key``."""
+    stmt = select(model)
+    names = []
+    for sub, columns in joins:
+        stmt = stmt.outerjoin(sub, sub.c.key == model.id)
+        stmt = stmt.add_columns(*(func.coalesce(sub.c[c], 0) for c in columns))
+        names += columns
+    return stmt.where(*conditions).order_by(model.id), names
+
+
+def sessions_with_counts(db: Session, conditions: list) -> list:
+    ids = select(SessionModel.id).where(*conditions)
+    stmt, names = _select_with(SessionModel, conditions, [(_per_session(ids), SESSION_COUNTS)])
+    return _attach(db.execute(stmt), names)
+
+
+def analyses_with_counts(db: Session, conditions: list) -> list:
+    ids = select(Analysis.id).where(*conditions)
+    session_ids = select(SessionModel.id).where(SessionModel.analysis_id.in_(ids))
+    stmt, names = _select_with(Analysis, conditions, [
+        (_sessions_by(_per_session(session_ids), "analysis_id"), ["sessions", *SESSION_COUNTS]),
+    ])
+    return _attach(db.execute(stmt), names)
+
+
+def scenarios_with_counts(db: Session, conditions: list) -> list:
+    ids = select(Scenario.id).where(*conditions)
+    session_ids = select(SessionModel.id).where(SessionModel.scenario_id.in_(ids))
+    stmt, names = _select_with(Scenario, conditions, [
+        (_grouped(Analysis.scenario_id, ids, "analyses"), ["analyses"]),
+        (_sessions_by(_per_session(session_ids), "scenario_id"), ["sessions", *SESSION_COUNTS]),
+        (_grouped(WricefItem.scenario_id, ids, "wricef_items"), ["wricef_items"]),
+        (_grouped(ConfigItem.scenario_id, ids, "config_items"), ["config_items"]),
+    ])
+    return _attach(db.execute(stmt), names)
@@ -0,0 +1,284 @@
+"""Composite-scenario membership.
+
+``Scenario.included_scenario_ids`` stays as the human-editable form; the
+authoritative membership lives in ``scenario_links`` and its transitive closure
+in ``scenario_closure``. The closure is rebuilt on writes only for the edited
+composite and its ancestors, so expand / reverse lookups are single indexed
+queries and cycles can be rejected with one closure probe.
+"""
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from ..models.scenario import Scenario
+from ..models.scenario_link import ScenarioClosure, ScenarioLink
+
+_SPLIT = re.compile(r"[,;|\s]+")
+
+
+def parse_member_tokens(raw: str | None) -> list[str]:
+    if not raw:
+        return []
+    return [t for t in _SPLIT.split(raw.strip()) if t]
+
+
+def resolve_members(
+    db: Session,
+    raw: str | None,
+    project_id: int | None,
+    strict: bool = True,
+) -> list[int]:
+    """Resolve a delimited id/code string to Scenario ids, preserving order.
+
+    Numeric tokens are Scenario ids; anything else is matched against
+    ``Scenario.scenario_id``. Both must belong to ``project_id`` when it is given.
+    """
+    tokens = parse_member_tokens(raw)
+    ids = {int(t) for t in tokens if t.isdigit()}
+    codes = {t for t in tokens if not t.isdigit()}
+
+    known_ids: set[int] = set()
+    if ids:
+        q = db.query(Scenario.id).filter(Scenario.id.in_(ids))
+        if project_id is not None:
+            q = q.filter(Scenario.project_id == project_id)
+        known_ids = {r[0] for r in q}
+    by_code: dict[str, int] = {}
+    if codes:
+        q = db.query(Scenario.scenario_id, Scenario.id).filter(Scenario.scenario_id.in_(codes))
+        if project_id is not None:
+            q = q.filter(Scenario.project_id == project_id)
+        by_code = {code: sid for code, sid in q}
+
+    resolved: list[int] = []
+    missing: list[str] = []
+    for t in tokens:
+        sid = int(t) if t.isdigit() and int(t) in known_ids else by_code.get(t)
+        if sid is None:
+            missing.append(t)
+        elif sid not in resolved:
+            resolved.append(sid)
+    if missing and strict:
+        raise HTTPException(status_code=400, detail=f"Unknown scenario(s): {', '.join(missing)}")
+    return resolved
+
+
+def _ancestor_ids(db: Session, scenario_id: int) -> set[int]:
+    return {
+        r[0]
+        for r in db.query(ScenarioClosure.ancestor_id).filter(
+            ScenarioClosure.descendant_id == scenario_id
+        )
+    }
+
+
+def find_cycle(db: Session, composite_id: int, member_ids: list[int]) -> list[int]:
+    """Members that already (transitively) include ``composite_id``."""
+    offending = [m for m in member_ids if m == composite_id]
+    others = [m for m in member_ids if m != composite_id]
+    if others:
+        offending += [
+            r[0]
+            for r in db.query(ScenarioClosure.ancestor_id).filter(
+                ScenarioClosure.descendant_id == composite_id,
+                ScenarioClosure.ancestor_id.in_(others),
+            )
+        ]
+    return offending
+
+
+def rebuild_closure(db: Session, roots: set[int] | None = None) -> None:
+    """Recompute closure rows whose ancestor is in ``roots`` (all rows if None)."""
+    links = ScenarioLink.__table__
+    closure = ScenarioClosure.__table__
+
+    seed = select(
+        links.c.composite_id.label("ancestor_id"),
+        links.c.member_id.label("descendant_id"),
+        literal(1).label("depth"),
+    )
+    if roots is None:
+        db.execute(delete(closure))
+    else:
+        if not roots:
+            return
+        db.execute(delete(closure).where(closure.c.ancestor_id.in_(roots)))
+        seed = seed.where(links.c.composite_id.in_(roots))
+
+    walk = seed.cte("walk", recursive=True)
+    walk = walk.union(
+        select(walk.c.ancestor_id, links.c.member_id, walk.c.depth + 1).join(
+            links, links.c.composite_id == walk.c.descendant_id
+        )
+    )
+    db.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(walk.c.ancestor_id, walk.c.descendant_id, func.min(walk.c.depth)).group_by(
+                walk.c.ancestor_id, walk.c.descendant_id
+            ),
+        )
+    )
+
+
+def set_members(
+    db: Session,
+    composite: Scenario,
+    member_ids: list[int],
+    project_id: int | None = None,
+) -> None:
+    """Replace the direct members of ``composite``; rejects cycles. Does not commit.
+
+    Members must belong to ``project_id`` (default: the composite's project).
+    """
+    if project_id is None:
+        project_id = composite.project_id
+    if member_ids:
+        foreign = sorted(
+            r[0]
+            for r in db.query(Scenario.id).filter(
+                Scenario.id.in_(member_ids), Scenario.project_id.is_distinct_from(project_id)
+            )
+        )
+        if foreign:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Scenario(s) {foreign} do not belong to project {project_id}",
+            )
+    cycle = find_cycle(db, composite.id, member_ids)
+    if cycle:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cycle: scenario(s) {cycle} already include scenario {composite.id}",
+        )
+    db.execute(delete(ScenarioLink).where(ScenarioLink.composite_id == composite.id))
+    if member_ids:
+        db.execute(
+            insert(ScenarioLink),
+            [
+                {"composite_id": composite.id, "member_id": m, "sort_order": n}
+                for n, m in enumerate(member_ids)
+            ],
+        )
+    composite.is_composite = 1 if member_ids else 0
+    composite.included_scenario_ids = ",".join(str(m) for m in member_ids) or None
+    rebuild_closure(db, _ancestor_ids(db, composite.id) | {composite.id})
+
+
+def surviving_composites(db: Session, scenario_ids) -> tuple[set[int], set[int]]:
+    """(ancestors, direct parents) of ``scenario_ids`` that are not themselves in it.
+
+    ``scenario_ids`` may be a list or a ``select`` of ids.
+    """
+    ancestors = {
+        r[0]
+        for r in db.query(ScenarioClosure.ancestor_id).filter(
+            ScenarioClosure.descendant_id.in_(scenario_ids),
+            ScenarioClosure.ancestor_id.notin_(scenario_ids),
+        )
+    }
+    parents = {
+        r[0]
+        for r in db.query(ScenarioLink.composite_id).filter(
+            ScenarioLink.member_id.in_(scenario_ids),
+            ScenarioLink.composite_id.notin_(scenario_ids),
+        )
+    }
+    return ancestors, parents
+
+
+def link_filters(scenario_ids) -> list:
+    """(model, where) pairs for every link/closure row touching ``scenario_ids``."""
+    return [
+        (
+            ScenarioLink,
+            ScenarioLink.composite_id.in_(scenario_ids) | ScenarioLink.member_id.in_(scenario_ids),
+        ),
+        (
+            ScenarioClosure,
+            ScenarioClosure.ancestor_id.in_(scenario_ids)
+            | ScenarioClosure.descendant_id.in_(scenario_ids),
+        ),
+    ]
+
+
+def refresh_composites(db: Session, ancestors: set[int], parents: set[int]) -> None:
+    """Rebuild closure rows and member strings after members were removed."""
+    rebuild_closure(db, ancestors)
+    for parent in db.query(Scenario).filter(Scenario.id.in_(parents)):
+        members = direct_member_ids(db, parent.id)
+        parent.included_scenario_ids = ",".join(str(m) for m in members) or None
+        parent.is_composite = 1 if members else 0
+
+
+def remove_scenario(db: Session, scenario_id: int) -> None:
+    """Drop every edge touching ``scenario_id`` before it is deleted. Does not commit."""
+    ancestors, parents = surviving_composites(db, [scenario_id])
+    for model, where in link_filters([scenario_id]):
+        db.execute(delete(model).where(where))
+    refresh_composites(db, ancestors, parents)
+
+
+def direct_member_ids(db: Session, composite_id: int) -> list[int]:
+    return [
+        r[0]
+        for r in db.query(ScenarioLink.member_id)
+        .filter(ScenarioLink.composite_id == composite_id)
+        .order_by(ScenarioLink.sort_order)
+    ]
+
+
+def expand(db: Session, composite_id: int) -> list[tuple[Scenario, int]]:
+    return (
+        db.query(Scenario, ScenarioClosure.depth)
+        .join(ScenarioClosure, ScenarioClosure.descendant_id == Scenario.id)
+        .filter(ScenarioClosure.ancestor_id == composite_id)
+        .order_by(ScenarioClosure.depth, Scenario.id)
+        .all()
+    )
+
+
+def included_in(db: Session, scenario_id: int) -> list[tuple[Scenario, int]]:
+    return (
+        db.query(Scenario, ScenarioClosure.depth)
+        .join(ScenarioClosure, ScenarioClosure.ancestor_id == Scenario.id)
+        .filter(ScenarioClosure.descendant_id == scenario_id)
+        .order_by(ScenarioClosure.depth, Scenario.id)
+        .all()
+    )
+
+
+def migrate_included_strings(db: Session) -> dict:
+    """Populate ``scenario_links`` from the legacy strings and rebuild the closure."""
+    ScenarioLink.__table__.create(db.get_bind(), checkfirst=True)
+    ScenarioClosure.__table__.create(db.get_bind(), checkfirst=True)
+    db.execute(delete(ScenarioLink))
+    db.execute(delete(ScenarioClosure))
+
+    composites = (
+        db.query(Scenario)
+        .filter(Scenario.included_scenario_ids.isnot(None), Scenario.included_scenario_ids != "")
+        .order_by(Scenario.id)
+        .all()
+    )
+    linked, skipped = 0, []
+    for composite in composites:
+        members = resolve_members(
+            db, composite.included_scenario_ids, composite.project_id, strict=False
+        )
+        accepted = [m for m in members if m not in find_cycle(db, composite.id, members)]
+        skipped += [(composite.id, m) for m in members if m not in accepted]
+        if accepted:
+            db.execute(
+                insert(ScenarioLink),
+                [
+                    {"composite_id": composite.id, "member_id": m, "sort_order": n}
+                    for n, m in enumerate(accepted)
+                ],
+            )
+            rebuild_closure(db, _ancestor_ids(db, composite.id) | {composite.id})
+            linked += len(accepted)
+    db.commit()
+    return {"composites": len(composites), "links": linked, "skipped_cycles": skipped}
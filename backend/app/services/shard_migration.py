@@ -0,0 +1,45 @@
+"""Move projects from the main database into their own shards.
+
+Each project is copied with its ids into a fresh shard (see
+:mod:`.project_transfer`) and registered in the catalog. The source rows are
+only deleted on request.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.sharding import ShardRouter
+from ..models.project import Project
+from .cascade import cascade_delete
+from .project_transfer import copy_project, delete_history
+
+
+def shard_project(db: Session, router: ShardRouter, project_id: int,
+                  delete_source: bool = False) -> dict[str, int]:
+    """Copy one project into a new shard; returns rows copied per table."""
+    if router.url_for(project_id) is not None:
+        raise ValueError(f"project {project_id} is already sharded")
+    if db.get(Project, project_id) is None:
+        raise ValueError(f"project {project_id} not found")
+
+    router.register(project_id)
+    shard = router.session(project_id)
+    try:
+        counts = copy_project(db, shard, project_id)
+        shard.commit()
+    except Exception:
+        shard.rollback()
+        shard.close()
+        router.release(project_id)
+        raise
+    shard.close()
+
+    if delete_source:
+        delete_history(db, project_id)  # committed by the cascade
+        cascade_delete(db, Project, project_id, record=False)
+    return counts
+
+
+def unsharded_project_ids(db: Session, router: ShardRouter) -> list[int]:
+    sharded = set(router.project_ids())
+    return [pid for pid in db.execute(select(Project.id).order_by(Project.id)).scalars()
+            if pid not in sharded]
@@ -0,0 +1,467 @@
+"""Cross-project "has this gap been solved before?" search over requirements.
+
+Every requirement is a TF-IDF document over its title, description, module and
+the title/description of the WRICEF or config item it was converted into.
+The base index is a term-major sparse matrix (CSC: ``indptr``/``indices``/
+``data``) written as flat binary arrays under ``SIMILARITY_INDEX_DIR`` and
+memory-mapped, so a process only pages in the postings of the query's terms.
+With NumPy installed the postings are scored with vectorized scatter-adds;
+without it the same arrays are read through ``memoryview`` in pure Python.
+
+Changes are picked up incrementally: before each query, requirements created,
+updated or converted since the index watermark (all indexed timestamp
+columns) are re-vectorized into an in-memory delta and their base rows are
+masked. Deletions leave no timestamp behind, so the live row count is compared
+with the documents the index knows; on a mismatch the live ids are read once
+and the missing documents are masked as well. Past ``SIMILARITY_DELTA_LIMIT`` documents the base is rebuilt and
+published as a new version; other workers notice the new ``CURRENT`` file
+and remap. IDF weights are fixed at build time.
+"""
+import functools
+import heapq
+import json
+import math
+import mmap
+import os
+import shutil
+import threading
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.timestamps import format_timestamp, parse_timestamp
+from ..models.config_item import ConfigItem
+from ..models.requirement import Requirement
+from ..models.wricef_item import WricefItem
+from .text_features import tokens
+
+
+@functools.cache
+def _numpy():
+    """NumPy, imported on first use so importing this module stays cheap."""
+    try:
+        import numpy
+    except ImportError:  # pure-Python scoring over the same memory-mapped arrays
+        return None
+    return numpy
+
+
+# file name -> array typecode
+_ARRAYS = {
+    "indptr": "q",          # n_terms + 1 offsets into indices/data
+    "indices": "i",         # document number per posting
+    "data": "f",            # normalized tf-idf weight per posting
+    "requirements": "i",    # requirement id per document
+    "projects": "i",        # project id per document (-1: none)
+}
+_NO_PROJECT = -1
+
+_SOURCE = (
+    select(
+        Requirement.id, Requirement.project_id, Requirement.title, Requirement.description,
+        Requirement.module, WricefItem.title, WricefItem.description,
+        ConfigItem.title, ConfigItem.description,
+    )
+    .outerjoin(WricefItem, and_(
+        Requirement.conversion_type == "wricef", WricefItem.id == Requirement.conversion_id,
+    ))
+    .outerjoin(ConfigItem, and_(
+        Requirement.conversion_type == "config", ConfigItem.id == Requirement.conversion_id,
+    ))
+)
+
+
+def _sources(db: Session, fn) -> list:
+    """``fn(session)`` on the main database and, with sharding, on every shard."""
+    if settings.SHARDING_ENABLED:
+        from ..core.sharding import shard_router
+
+        return shard_router().fan_out(fn)
+    return [fn(db)]
+
+
+def _documents(db: Session, where=None) -> list[tuple[int, int, list[str]]]:
+    def load(session):
+        stmt = _SOURCE if where is None else _SOURCE.where(where)
+        return [
+            (row[0], _NO_PROJECT if row[1] is None else row[1], tokens(*row[2:]))
+            for row in session.execute(stmt)
+        ]
+
+    return [doc for part in _sources(db, load) for doc in part]
+
+
+def _watermark(db: Session) -> datetime | None:
+    def latest(session):
+        values = [
+            session.execute(select(column).order_by(column.desc()).limit(1)).scalar()
+            for column in (Requirement.created_at, Requirement.updated_at, Requirement.converted_at)
+        ]
+        return max((v for v in values if v is not None), default=None)
+
+    values = [v for v in _sources(db, latest) if v is not None]
+    return max(values, default=None)
+
+
+def _live_count(db: Session) -> int:
+    def count(session):
+        return session.execute(select(func.count()).select_from(Requirement)).scalar_one()
+
+    return sum(_sources(db, count))
+
+
+def _live_keys(db: Session) -> set[tuple[int, int]]:
+    def keys(session):
+        return [
+            (_NO_PROJECT if project_id is None else project_id, requirement_id)
+            for requirement_id, project_id in session.execute(
+                select(Requirement.id, Requirement.project_id)
+            )
+        ]
+
+    return {key for part in _sources(db, keys) for key in part}
+
+
+def _weights(terms: list[str], idf: dict[str, float], default_idf: float) -> dict[str, float]:
+    counts = Counter(terms)
+    weights = {
+        term: (1 + math.log(n)) * idf.get(term, default_idf) for term, n in counts.items()
+    }
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {term: w / norm for term, w in weights.items()}
+
+
+def build_index(db: Session, directory: Path | None = None, progress=None) -> dict:
+    """Vectorize every requirement and publish a new base version.
+
+    ``progress(fraction, message)`` is called once the documents are vectorized,
+    before anything is written; it may raise to abandon the build.
+    """
+    directory = Path(directory or settings.SIMILARITY_INDEX_DIR)
+    watermark = _watermark(db)
+    docs = _documents(db)
+
+    df = Counter(term for _, _, terms in docs for term in set(terms))
+    vocab = sorted(df)
+    n_docs = len(docs)
+    idf = {term: math.log((1 + n_docs) / (1 + df[term])) + 1 for term in vocab}
+    column = {term: i for i, term in enumerate(vocab)}
+
+    postings: list[list[tuple[int, float]]] = [[] for _ in vocab]
+    for doc, (_, _, terms) in enumerate(docs):
+        for term, weight in _weights(terms, idf, 1.0).items():
+            postings[column[term]].append((doc, weight))
+
+    arrays = {name: array(code) for name, code in _ARRAYS.items()}
+    arrays["indptr"].append(0)
+    for column_postings in postings:
+        for doc, weight in column_postings:
+            arrays["indices"].append(doc)
+            arrays["data"].append(weight)
+        arrays["indptr"].append(len(arrays["indices"]))
+    for requirement_id, project_id, _ in docs:
+        arrays["requirements"].append(requirement_id)
+        arrays["projects"].append(project_id)
+    if progress is not None:
+        progress(0.9, f"{n_docs} documents vectorized")
+
+    version = f"v{time.time_ns()}"
+    target = directory / version
+    target.mkdir(parents=True, exist_ok=True)
+    for name, values in arrays.items():
+        with open(target / f"{name}.bin", "wb") as fh:
+            values.tofile(fh)
+    meta = {
+        "version": version,
+        "documents": n_docs,
+        "vocab": vocab,
+        "idf": [idf[term] for term in vocab],
+        "watermark": format_timestamp(watermark) if watermark else None,
+    }
+    (target / "meta.json").write_text(json.dumps(meta))
+    pointer = directory / "CURRENT.tmp"
+    pointer.write_text(version)
+    os.replace(pointer, directory / "CURRENT")
+    # Keep the previous version: other workers may still have it mapped.
+    versions = sorted(p for p in directory.iterdir() if p.is_dir() and p.name.startswith("v"))
+    for old in versions[:-2]:
+        shutil.rmtree(old, ignore_errors=True)
+    return {"version": version, "documents": n_docs, "terms": len(vocab)}
+
+
+class _Mapped:
+    """One published base version, memory-mapped read-only."""
+
+    def __init__(self, path: Path) -> None:
+        meta = json.loads((path / "meta.json").read_text())
+        self.version = meta["version"]
+        self.documents = meta["documents"]
+        self.column = {term: i for i, term in enumerate(meta["vocab"])}
+        self.idf = dict(zip(meta["vocab"], meta["idf"]))
+        self.default_idf = max(meta["idf"], default=1.0)
+        self.watermark = parse_timestamp(meta["watermark"])
+        self._maps = []
+        for name, code in _ARRAYS.items():
+            setattr(self, name, self._map(path / f"{name}.bin", code))
+        self.position = {
+            (self.projects[doc], self.requirements[doc]): doc for doc in range(self.documents)
+        }
+
+    def _map(self, path: Path, code: str):
+        np = _numpy()
+        size = path.stat().st_size
+        if size == 0:
+            values = array(code)
+            return np.asarray(values) if np is not None else memoryview(values)
+        with open(path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        if np is not None:
+            return np.frombuffer(mapped, dtype=array(code).typecode)
+        return memoryview(mapped).cast(code)
+
+    def postings(self, term: str):
+        col = self.column.get(term)
+        if col is None:
+            return None
+        start, end = int(self.indptr[col]), int(self.indptr[col + 1])
+        return self.indices[start:end], self.data[start:end]
+
+
+class SimilarityIndex:
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.RLock()
+        self._base: _Mapped | None = None
+        self._current_mtime = None
+        self._delta: dict[tuple[int, int], dict[str, float]] = {}
+        self._stale: set[int] = set()
+        self._removed: set[tuple[int, int]] = set()
+        self._watermark: datetime | None = None
+
+    def _load(self, db: Session) -> None:
+        pointer = self.directory / "CURRENT"
+        if not pointer.exists():
+            build_index(db, self.directory)
+        mtime = pointer.stat().st_mtime_ns
+        if self._base is not None and mtime == self._current_mtime:
+            return
+        self._base = _Mapped(self.directory / pointer.read_text().strip())
+        self._current_mtime = mtime
+        self._delta.clear()
+        self._stale.clear()
+        self._removed.clear()
+        self._watermark = self._base.watermark
+
+    def refresh(self, db: Session) -> None:
+        """Map the current base, fold in changed requirements and mask deleted ones."""
+        with self._lock:
+            self._load(db)
+            self._fold_changes(db)
+            self._drop_deleted(db)
+
+    def _fold_changes(self, db: Session) -> None:
+        """Re-vectorize requirements changed since the watermark into the delta."""
+        mark = self._watermark
+        latest = _watermark(db)
+        if latest is None or (mark is not None and latest < mark):
+            return
+        changed = None
+        if mark is not None:
+            changed = or_(
+                Requirement.created_at >= mark,
+                Requirement.updated_at >= mark,
+                Requirement.converted_at >= mark,
+            )
+        docs = _documents(db, changed)
+        base = self._base
+        for requirement_id, project_id, terms in docs:
+            key = (project_id, requirement_id)
+            self._delta[key] = _weights(terms, base.idf, base.default_idf)
+            doc = base.position.get(key)
+            if doc is not None:
+                self._stale.add(doc)
+        self._watermark = latest
+        if len(self._delta) > settings.SIMILARITY_DELTA_LIMIT:
+            build_index(db, self.directory)
+            self._load(db)
+
+    def _known(self) -> int:
+        base = self._base
+        added = sum(1 for key in self._delta if key not in base.position)
+        return base.documents - len(self._removed) + added
+
+    def _drop_deleted(self, db: Session) -> None:
+        """Mask documents whose requirement is gone (deleted, or moved to another project)."""
+        if _live_count(db) == self._known():
+            return
+        live = _live_keys(db)
+        known = {key for key in self._base.position if key not in self._removed}
+        known.update(self._delta)
+        for key in known - live:
+            self._delta.pop(key, None)
+            doc = self._base.position.get(key)
+            if doc is not None:
+                self._stale.add(doc)
+                self._removed.add(key)
+
+    def _base_top(self, query: dict[str, float], limit: int, min_score: float,
+                  skip: set[int], project_id: int | None) -> list[tuple]:
+        """Best ``limit`` base documents, ignoring ``skip`` and (if given) ``project_id``."""
+        base = self._base
+        if not base.documents:
+            return []
+        np = _numpy()
+        if np is not None:
+            dense = np.zeros(base.documents, dtype=np.float32)
+            for term, weight in query.items():
+                hit = base.postings(term)
+                if hit is not None:
+                    dense[hit[0]] += weight * hit[1]
+            if skip:
+                dense[list(skip)] = 0
+            if project_id is not None:
+                dense[base.projects == project_id] = 0
+            hits = np.flatnonzero(dense >= max(min_score, 1e-9))
+            if len(hits) > limit:
+                hits = hits[np.argpartition(dense[hits], -limit)[-limit:]]
+            return [
+                ((int(base.projects[doc]), int(base.requirements[doc])), float(dense[doc]))
+                for doc in hits.tolist()
+            ]
+        sparse: dict[int, float] = {}
+        for term, weight in query.items():
+            hit = base.postings(term)
+            if hit is not None:
+                for doc, value in zip(hit[0], hit[1]):
+                    sparse[doc] = sparse.get(doc, 0.0) + weight * value
+        best = heapq.nlargest(
+            limit,
+            (
+                (value, doc) for doc, value in sparse.items()
+                if value >= min_score and doc not in skip
+                and (project_id is None or base.projects[doc] != project_id)
+            ),
+        )
+        return [((base.projects[doc], base.requirements[doc]), value) for value, doc in best]
+
+    def similar(self, db: Session, requirement: Requirement, k: int = 10,
+                min_score: float = 0.0, other_projects: bool = False) -> list[tuple]:
+        """``[((project_id, requirement_id), score)]``, best first, excluding ``requirement``."""
+        self.refresh(db)
+        own = (_NO_PROJECT if requirement.project_id is None else requirement.project_id,
+               requirement.id)
+        with self._lock:
+            query = self._delta.get(own)
+            if query is None:
+                query = _weights(tokens(*_text(db, requirement)), self._base.idf,
+                                 self._base.default_idf)
+            skip = set(self._stale)
+            if own in self._base.position:
+                skip.add(self._base.position[own])
+            excluded = own[0] if other_projects else None
+            ranked = self._base_top(query, k, min_score, skip, excluded)
+            for key, vector in self._delta.items():
+                if key == own or (other_projects and key[0] == own[0]):
+                    continue
+                value = sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+                if value > 0 and value >= min_score:
+                    ranked.append((key, value))
+        ranked.sort(key=lambda item: (-item[1], item[0][1]))
+        return ranked[:k]
+
+    def stats(self) -> dict:
+        base = self._base
+        return {
+            "version": base.version if base else None,
+            "documents": base.documents if base else 0,
+            "pending": len(self._delta),
+            "vectorized": _numpy() is not None,
+        }
+
+
+def _text(db: Session, requirement: Requirement) -> tuple:
+    row = db.execute(_SOURCE.where(Requirement.id == requirement.id)).first()
+    return tuple(row[2:]) if row else (requirement.title, requirement.description, requirement.module)
+
+
+_index: SimilarityIndex | None = None
+_index_lock = threading.Lock()
+
+
+def similarity_index() -> SimilarityIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SimilarityIndex(settings.SIMILARITY_INDEX_DIR)
+    return _index
+
+
+def _targets(session: Session, requirement_ids: list[int]) -> dict[int, dict]:
+    rows = session.execute(
+        select(
+            Requirement.id, Requirement.project_id, Requirement.code, Requirement.title,
+            Requirement.classification, Requirement.conversion_type, Requirement.conversion_id,
+        ).where(Requirement.id.in_(requirement_ids))
+    ).all()
+    wricef_ids = [r.conversion_id for r in rows if r.conversion_type == "wricef" and r.conversion_id]
+    config_ids = [r.conversion_id for r in rows if r.conversion_type == "config" and r.conversion_id]
+    objects = {}
+    for kind, model, ids in (("wricef", WricefItem, wricef_ids), ("config", ConfigItem, config_ids)):
+        if ids:
+            for obj in session.execute(
+                select(model.id, model.code, model.title, model.status).where(model.id.in_(ids))
+            ):
+                objects[(kind, obj.id)] = {
+                    "type": kind, "id": obj.id, "code": obj.code, "title": obj.title,
+                    "status": obj.status,
+                }
+    return {
+        r.id: {
+            "id": r.id, "project_id": r.project_id, "code": r.code, "title": r.title,
+            "classification": r.classification,
+            "conversion": objects.get((r.conversion_type, r.conversion_id)),
+        }
+        for r in rows
+    }
+
+
+def similar_requirements(db: Session, requirement: Requirement, k: int = 10,
+                         min_score: float = 0.0, other_projects: bool = False) -> dict:
+    """Top-``k`` similar requirements across projects with their conversion targets."""
+    index = similarity_index()
+    # Over-fetch a little: rows deleted since the refresh only drop out here.
+    ranked = index.similar(db, requirement, k + 5, min_score, other_projects)
+    by_project: dict[int, list[int]] = {}
+    for (project_id, requirement_id), _ in ranked:
+        by_project.setdefault(project_id, []).append(requirement_id)
+
+    details: dict[tuple[int, int], dict] = {}
+    for project_id, ids in by_project.items():
+        if settings.SHARDING_ENABLED and project_id != _NO_PROJECT:
+            from ..core.sharding import shard_router
+
+            session = shard_router().session(project_id)
+            try:
+                found = _targets(session, ids)
+            finally:
+                session.close()
+        else:
+            found = _targets(db, ids)
+        details.update(((project_id, rid), row) for rid, row in found.items())
+
+    results = []
+    for key, score in ranked:
+        row = details.get(key)
+        if row is not None:
+            results.append({**row, "score": round(score, 4)})
+        if len(results) == k:
+            break
+    return {"requirement_id": requirement.id, "results": results, "index": index.stats()}
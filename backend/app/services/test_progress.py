@@ -0,0 +1,296 @@
+"""Test execution history and daily per-cycle snapshots for burn-down charts.
+
+Mapper listeners (registered by importing this module) append a
+``test_execution_events`` row whenever an execution is created, deleted, or
+changes status or cycle; the log is never updated. ``take_snapshots`` replays
+the log into ``test_cycle_snapshots``: one row per cycle and day with the
+counts as of the end of that day, so ``burndown`` reads a handful of rows
+instead of the executions. Today's row is a running snapshot of the current
+state that is overwritten until the day is over; finished days, including any
+missed while the API was down, are replayed from the log on the next run.
+
+Executions that predate the log (or were bulk inserted) get baseline events on
+the next run: ``not_run`` from their creation and, if already executed, their
+current status from ``execution_date``.
+
+The API runs ``take_snapshots`` every ``TEST_SNAPSHOT_INTERVAL_SECONDS`` on a
+background task (``maintenance.py snapshot-test-progress`` runs it once).
+"""
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import delete, event, exists, func, insert, select
+from sqlalchemy.orm import Session, attributes
+
+from ..core.config import settings
+from ..core.timestamps import utcnow
+from ..models.test_cycle import TestCycle
+from ..models.test_execution import TestExecution
+from ..models.test_progress import TestCycleSnapshot, TestExecutionEvent
+
+log = logging.getLogger(__name__)
+
+BUCKETS = ("passed", "failed", "blocked", "not_run")
+
+
+def status_bucket(status: str | None) -> str | None:
+    """``passed``/``failed``/``blocked``/``not_run``; ``None`` for any other status."""
+    key = (status or "not_run").strip().lower().replace(" ", "_").replace("-", "_")
+    return key if key in BUCKETS else None
+
+
+def _record(connection, target: TestExecution, old_status, new_status, cycle_id) -> None:
+    connection.execute(insert(TestExecutionEvent.__table__).values(
+        test_execution_id=target.id, test_cycle_id=cycle_id,
+        old_status=old_status, new_status=new_status, changed_at=utcnow(),
+    ))
+
+
+def _before(target: TestExecution, name: str):
+    history = attributes.get_history(target, name)
+    if history.has_changes():
+        return history.deleted[0] if history.deleted else None
+    return getattr(target, name)
+
+
+@event.listens_for(TestExecution, "after_insert")
+def _execution_inserted(mapper, connection, target: TestExecution) -> None:
+    _record(connection, target, None, target.status or "not_run", target.test_cycle_id)
+
+
+@event.listens_for(TestExecution, "after_update")
+def _execution_updated(mapper, connection, target: TestExecution) -> None:
+    old_status, old_cycle = _before(target, "status"), _before(target, "test_cycle_id")
+    if (old_status, old_cycle) != (target.status, target.test_cycle_id):
+        _record(connection, target, old_status, target.status or "not_run", target.test_cycle_id)
+
+
+@event.listens_for(TestExecution, "after_delete")
+def _execution_deleted(mapper, connection, target: TestExecution) -> None:
+    _record(connection, target, _before(target, "status"), None, _before(target, "test_cycle_id"))
+
+
+def _at_midnight(day: date) -> datetime:
+    return datetime.combine(day, time(), tzinfo=timezone.utc)
+
+
+def backfill_baseline(db: Session, now: datetime | None = None, batch_size: int = 1000) -> int:
+    """Write baseline events for executions without any; does not commit."""
+    now = now or utcnow()
+    logged = exists().where(TestExecutionEvent.test_execution_id == TestExecution.id)
+    rows = db.execute(
+        select(
+            TestExecution.id, TestExecution.test_cycle_id, TestExecution.status,
+            TestExecution.created_at, TestExecution.execution_date,
+        ).where(~logged)
+    ).all()
+    events = []
+    for execution_id, cycle_id, status, created_at, execution_date in rows:
+        status = status or "not_run"
+        executed_at = _at_midnight(execution_date) if execution_date else None
+        created_at = created_at or executed_at or now
+        base = {"test_execution_id": execution_id, "test_cycle_id": cycle_id, "old_status": None}
+        if status_bucket(status) != "not_run" and executed_at is not None:
+            created_at = min(created_at, executed_at)
+            events.append({**base, "new_status": "not_run", "changed_at": created_at})
+            events.append({**base, "old_status": "not_run", "new_status": status,
+                           "changed_at": max(executed_at, created_at)})
+        else:
+            events.append({**base, "new_status": status, "changed_at": created_at})
+    for start in range(0, len(events), batch_size):
+        db.execute(insert(TestExecutionEvent), events[start:start + batch_size])
+    return len(rows)
+
+
+def _add(counts: dict, cycle_id: int, status: str | None, sign: int) -> None:
+    cell = counts.setdefault(cycle_id, dict.fromkeys(("total", *BUCKETS), 0))
+    cell["total"] += sign
+    bucket = status_bucket(status)
+    if bucket:
+        cell[bucket] += sign
+
+
+def _snapshot(counts: dict) -> dict[int, dict[str, int]]:
+    return {cycle_id: dict(cell) for cycle_id, cell in counts.items() if cell["total"]}
+
+
+def _replay(db: Session, first: date, last: date):
+    """Yield ``(day, counts per cycle)`` for ``first``..``last`` as of each day's end.
+
+    One query for the state before ``first``, then a single ordered pass over
+    the events of the range.
+    """
+    start = _at_midnight(first)
+    latest = (
+        select(func.max(TestExecutionEvent.id))
+        .where(TestExecutionEvent.changed_at < start)
+        .group_by(TestExecutionEvent.test_execution_id)
+    )
+    columns = (
+        TestExecutionEvent.test_execution_id, TestExecutionEvent.test_cycle_id,
+        TestExecutionEvent.new_status,
+    )
+    state: dict[int, tuple[int, str]] = {}
+    counts: dict[int, dict[str, int]] = {}
+
+    def apply(execution_id, cycle_id, status):
+        old = state.pop(execution_id, None)
+        if old is not None:
+            _add(counts, *old, -1)
+        if cycle_id is not None and status is not None:
+            state[execution_id] = (cycle_id, status)
+            _add(counts, cycle_id, status, 1)
+
+    for row in db.execute(select(*columns).where(TestExecutionEvent.id.in_(latest))):
+        apply(*row)
+
+    day, boundary = first, start + timedelta(days=1)
+    events = db.execute(
+        select(*columns, TestExecutionEvent.changed_at)
+        .where(
+            TestExecutionEvent.changed_at >= start,
+            TestExecutionEvent.changed_at < _at_midnight(last + timedelta(days=1)),
+        )
+        .order_by(TestExecutionEvent.changed_at, TestExecutionEvent.id)
+    )
+    for execution_id, cycle_id, status, changed_at in events:
+        while changed_at >= boundary:
+            yield day, _snapshot(counts)
+            day, boundary = day + timedelta(days=1), boundary + timedelta(days=1)
+        apply(execution_id, cycle_id, status)
+    while day <= last:
+        yield day, _snapshot(counts)
+        day += timedelta(days=1)
+
+
+def _current(db: Session) -> dict[int, dict[str, int]]:
+    """Per-cycle counts of the executions as they are now."""
+    counts: dict[int, dict[str, int]] = {}
+    rows = db.execute(
+        select(TestExecution.test_cycle_id, TestExecution.status, func.count())
+        .where(TestExecution.test_cycle_id.isnot(None))
+        .group_by(TestExecution.test_cycle_id, TestExecution.status)
+    )
+    for cycle_id, status, n in rows:
+        _add(counts, cycle_id, status, n)
+    return _snapshot(counts)
+
+
+def _write(db: Session, day: date, counts: dict, taken_at: datetime) -> None:
+    db.execute(
+        delete(TestCycleSnapshot).where(TestCycleSnapshot.day == day),
+        execution_options={"synchronize_session": False},
+    )
+    if counts:
+        db.execute(insert(TestCycleSnapshot), [
+            {"test_cycle_id": cycle_id, "day": day, "taken_at": taken_at, **cell}
+            for cycle_id, cell in counts.items()
+        ])
+
+
+def take_snapshots(db: Session, now: datetime | None = None) -> list[date]:
+    """Write the snapshots of every day that is missing or was taken before it ended.
+
+    Finished days are replayed from the log; today's running snapshot is the
+    executions' current state. Commits; returns the days written.
+    """
+    now = now or utcnow()
+    today = now.date()
+    backfill_baseline(db, now)
+    db.flush()
+
+    latest = db.execute(
+        select(TestCycleSnapshot.day, func.min(TestCycleSnapshot.taken_at))
+        .group_by(TestCycleSnapshot.day)
+        .order_by(TestCycleSnapshot.day.desc())
+        .limit(1)
+    ).first()
+    if latest is None:
+        first = db.execute(select(func.min(TestExecutionEvent.changed_at))).scalar()
+        if first is None:
+            db.commit()
+            return []
+        start = first.date()
+    else:
+        last_day, taken_at = latest
+        finished = taken_at >= _at_midnight(last_day + timedelta(days=1))
+        start = last_day + timedelta(days=1) if finished else last_day
+    start = max(start, today - timedelta(days=settings.TEST_SNAPSHOT_MAX_BACKFILL_DAYS))
+
+    written = []
+    if start < today:
+        for day, counts in _replay(db, start, today - timedelta(days=1)):
+            _write(db, day, counts, now)
+            written.append(day)
+    _write(db, today, _current(db), now)
+    written.append(today)
+    db.commit()
+    return written
+
+
+def burndown(db: Session, cycle: TestCycle, date_from: date | None = None,
+             date_to: date | None = None) -> dict:
+    """Daily series of a cycle from its snapshots, with an ideal line between its dates."""
+    stmt = select(TestCycleSnapshot).where(TestCycleSnapshot.test_cycle_id == cycle.id)
+    if date_from is not None:
+        stmt = stmt.where(TestCycleSnapshot.day >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(TestCycleSnapshot.day <= date_to)
+    snapshots = db.execute(stmt.order_by(TestCycleSnapshot.day)).scalars().all()
+
+    span = None
+    if cycle.start_date and cycle.end_date and cycle.end_date > cycle.start_date:
+        span = (cycle.end_date - cycle.start_date).days
+
+    points = []
+    for snap in snapshots:
+        executed = snap.passed + snap.failed
+        point = {
+            "day": snap.day,
+            "total": snap.total,
+            "passed": snap.passed,
+            "failed": snap.failed,
+            "blocked": snap.blocked,
+            "not_run": snap.not_run,
+            "other": snap.total - snap.passed - snap.failed - snap.blocked - snap.not_run,
+            "executed": executed,
+            "remaining": snap.total - executed,
+            "ideal_remaining": None,
+        }
+        if span:
+            left = min(max((cycle.end_date - snap.day).days, 0), span)
+            point["ideal_remaining"] = round(snap.total * left / span, 1)
+        points.append(point)
+    return {
+        "test_cycle_id": cycle.id,
+        "start_date": cycle.start_date,
+        "end_date": cycle.end_date,
+        "taken_at": snapshots[-1].taken_at if snapshots else None,
+        "points": points,
+    }
+
+
+def _snapshot_all() -> None:
+    from ..core.database import SessionLocal
+
+    if settings.SHARDING_ENABLED:
+        from ..core.sharding import shard_router
+
+        shard_router().fan_out(take_snapshots)
+        return
+    db = SessionLocal()
+    try:
+        take_snapshots(db)
+    finally:
+        db.close()
+
+
+async def run_snapshot_job(interval: float) -> None:
+    """Take snapshots now and every ``interval`` seconds until cancelled."""
+    while True:
+        try:
+            await asyncio.to_thread(_snapshot_all)
+        except Exception:
+            log.exception("test progress snapshot failed")
+        await asyncio.sleep(interval)
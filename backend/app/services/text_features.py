@@ -0,0 +1,35 @@
+"""Tokenization shared by the requirement text indexes.
+
+Lowercased alphanumeric words without stopwords and with a light plural
+strip, so "Posting invoices" and "post the invoice" share tokens. German
+stopwords are included because workshop notes mix both languages.
+"""
+import hashlib
+import re
+
+_WORD = re.compile(r"[0-9a-zäöüß]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in is it its of on or should that the
+this to was were will with must shall need needs not no all any each per via into
+der die das und oder ein eine einer eines mit für von zu im in ist sind wird werden
+auf als auch bei nicht nach aus dem den des sich soll sollen muss müssen
+""".split())
+
+
+def tokens(*texts: str | None) -> list[str]:
+    words = []
+    for text in texts:
+        for word in _WORD.findall((text or "").lower()):
+            if len(word) < 2 or word in STOPWORDS:
+                continue
+            if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+                word = word[:-1]
+            words.append(word)
+    return words
+
+
+def stable_hash(value: str, bits: int = 63) -> int:
+    """Process-independent integer hash (``hash()`` is salted per process)."""
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & ((1 << bits) - 1)
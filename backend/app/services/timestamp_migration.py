@@ -0,0 +1,87 @@
+"""Rewrite legacy free-form date/timestamp strings into the canonical storage form.
+
+Columns typed :class:`UTCDateTime` / :class:`LenientDate` already parse legacy
+values on read, but range filters and indexes compare the stored text, so old
+rows must be normalized once. Values that cannot be parsed are set to NULL and
+reported. Rows are read in rowid-keyed batches, so memory stays bounded and no
+cursor is left open over a table that is being rewritten.
+
+Only SQLite stores these columns as text; other dialects use native
+DATE/TIMESTAMP columns, which cannot hold legacy strings, so there is nothing
+to migrate there.
+"""
+from sqlalchemy import String, bindparam, literal_column, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from .. import models  # noqa: F401  (registers every table on Base.metadata)
+from ..core.database import Base
+from ..core.timestamps import (
+    LenientDate,
+    UTCDateTime,
+    format_timestamp,
+    parse_date,
+    parse_timestamp,
+)
+
+
+def _typed_columns():
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if isinstance(column.type, (UTCDateTime, LenientDate)):
+                yield table, column
+
+
+def _canonical(column, raw):
+    if isinstance(column.type, UTCDateTime):
+        parsed = parse_timestamp(raw)
+        return format_timestamp(parsed) if parsed else None
+    parsed = parse_date(raw)
+    return parsed.isoformat() if parsed else None
+
+
+def migrate_timestamps(db: Session, dry_run: bool = False, batch_size: int = 1000) -> dict:
+    """Return ``{"table.column": {"rewritten": n, "unparseable": n, "samples": [...]}}``.
+
+    Always empty on non-SQLite dialects (see module docstring).
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return {}
+    report = {}
+    for table, column in _typed_columns():
+        raw = type_coerce(column, String)
+        rowid = literal_column("rowid")  # every table has one; not all have an ``id``
+        stmt = update(table).where(rowid == bindparam("row_id")).values(
+            {column.name: type_coerce(bindparam("value"), String)}
+        )
+        rewritten, bad = 0, []
+        last_id = None
+        while True:
+            batch = select(rowid, raw).select_from(table).where(column.isnot(None))
+            if last_id is not None:
+                batch = batch.where(rowid > last_id)
+            rows = db.execute(batch.order_by(rowid).limit(batch_size)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            pending = []
+            for row_id, value in rows:
+                try:
+                    canonical = _canonical(column, value)
+                except ValueError:
+                    canonical = None
+                    bad.append(value)
+                if canonical != value:
+                    pending.append({"row_id": row_id, "value": canonical})
+            if pending:
+                rewritten += len(pending)
+                if not dry_run:
+                    db.execute(stmt, pending)
+        if rewritten:
+            report[f"{table.name}.{column.name}"] = {
+                "rewritten": rewritten, "unparseable": len(bad), "samples": bad[:5],
+            }
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return report
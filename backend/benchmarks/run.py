@@ -0,0 +1,258 @@
+"""Endpoint micro-benchmarks against the in-process ASGI app.
+
+Drives ``app.main.app`` through ``httpx.ASGITransport`` (no sockets, no
+server) against a scratch SQLite database filled by ``seed_synthetic`` to
+each size, and records p50/p95/p99 latency, throughput and SQL statements per
+request for each endpoint. Results can be
+saved as a baseline and later runs compared against it. Any endpoint whose
+statements per request grow makes the run exit non-zero; those counts do not
+depend on the machine. Latencies are compared and reported, but only gate the
+run with ``--latency``, against a baseline saved on the same machine.
+
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline local.json --latency   # same-machine baseline
+    python -m benchmarks.run --sizes 1000 --database-url sqlite://
+    RETURNING_WRITES=false python -m benchmarks.run --sizes 1000   # pre-RETURNING write path
+
+Config item and project writes take the single-statement RETURNING path;
+requirement writes always use the unit-of-work path so their listeners run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_DB = Path(tempfile.gettempdir()) / "projektcopilot_bench.db"
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="comma separated total row counts")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--database-url",
+                        help="run against this SQLAlchemy URL instead of --db "
+                             "(e.g. sqlite:// or postgresql+psycopg2://...)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, help="compare against this baseline JSON")
+    parser.add_argument("--save-baseline", type=Path, help="write results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p95 regression ratio (0.25 = 25%%)")
+    parser.add_argument("--latency", action="store_true",
+                        help="also fail on p95 regressions beyond --tolerance "
+                             "(only meaningful against a baseline from this machine)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    return parser.parse_args(argv)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def _summarize(samples: list[float], wall: float, statements: int) -> dict:
+    samples.sort()
+    return {
+        "statements": round(statements / len(samples), 2) if samples else 0.0,
+        "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(_percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 3),
+        "throughput_rps": round(len(samples) / wall, 1) if wall else 0.0,
+        "n": len(samples),
+    }
+
+
+def populate(rows: int, seed: int) -> dict:
+    """Reset the scratch database to roughly ``rows`` synthetic rows."""
+    from seed_synthetic import generate, shape_for_rows
+
+    shape = shape_for_rows(rows)
+    counts = generate(shape, seed=seed, reset=True)
+    return {"projects": shape.projects, "requirements": counts["new_requirements"],
+            "rows": sum(counts.values())}
+
+
+async def _measure(client, iterations: int, make_request) -> dict:
+    from app.core.query_counter import count_queries
+
+    samples: list[float] = []
+    wall_start = time.perf_counter()
+    with count_queries() as counter:
+        for n in range(iterations):
+            start = time.perf_counter()
+            response = await make_request(n)
+            samples.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{response.request.url}: {response.status_code} {response.text}")
+    return _summarize(samples, time.perf_counter() - wall_start, counter.count)
+
+
+async def run_size(app, dataset: dict, iterations: int, seed: int) -> dict:
+    import httpx
+
+    rnd = random.Random(seed)
+    projects, rows = dataset["projects"], dataset["requirements"]
+    api = "/api/v1"
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def list_requirements(n):
+            return await client.get(f"{api}/requirements",
+                                    params={"project_id": 1 + rnd.randrange(projects)})
+
+        async def get_requirement(n):
+            return await client.get(f"{api}/requirements/{1 + rnd.randrange(rows)}")
+
+        created: list[int] = []
+
+        async def create_requirement(n):
+            r = await client.post(f"{api}/requirements", json={
+                "title": f"Bench {n}", "classification": "Gap",
+                "project_id": 1 + rnd.randrange(projects),
+            })
+            created.append(r.json()["id"])
+            return r
+
+        async def update_requirement(n):
+            return await client.put(f"{api}/requirements/{1 + rnd.randrange(rows)}",
+                                    json={"priority": rnd.choice(["High", "Medium", "Low"])})
+
+        async def update_requirement_noop(n):
+            return await client.put(f"{api}/requirements/1", json={"priority": "High"})
+
+        async def update_requirement_text(n):
+            # text and classification feed the classifier, duplicate index and fit/gap cube
+            return await client.put(f"{api}/requirements/{1 + rnd.randrange(rows)}", json={
+                "title": f"Bench requirement {n}",
+                "classification": rnd.choice(["Fit", "Gap", "Partial Fit"]),
+            })
+
+        # config items and projects have no write listeners: one RETURNING
+        # statement each unless RETURNING_WRITES=false
+        configs: list[int] = []
+
+        async def create_config_item(n):
+            r = await client.post(f"{api}/config-items", json={
+                "title": f"Bench config {n}", "project_id": 1 + rnd.randrange(projects),
+            })
+            configs.append(r.json()["id"])
+            return r
+
+        async def update_config_item(n):
+            return await client.put(f"{api}/config-items/{rnd.choice(configs)}",
+                                    json={"status": f"bench {n}"})
+
+        async def update_project(n):
+            return await client.put(f"{api}/projects/{1 + rnd.randrange(projects)}",
+                                    json={"description": f"Bench {n}"})
+
+        async def convert_requirement(n):
+            return await client.post(f"{api}/requirements/{created[n]}/convert")
+
+        async def dashboard(n):
+            return await client.get(f"{api}/dashboard/stats",
+                                    params={"project_id": 1 + rnd.randrange(projects)})
+
+        for name, fn in [
+            ("list_requirements", list_requirements),
+            ("get_requirement", get_requirement),
+            ("create_requirement", create_requirement),
+            ("update_requirement", update_requirement),
+            ("update_requirement_noop", update_requirement_noop),
+            ("update_requirement_text", update_requirement_text),
+            ("create_config_item", create_config_item),
+            ("update_config_item", update_config_item),
+            ("update_project", update_project),
+            ("convert_requirement", convert_requirement),
+            ("dashboard_stats", dashboard),
+        ]:
+            results[name] = await _measure(client, iterations, fn)
+    return results
+
+
+# Random ids make a few per-request statement averages vary slightly.
+STATEMENT_SLACK = 0.1
+
+
+def compare(results: dict, baseline: dict, tolerance: float,
+            latency: bool = False) -> tuple[list[str], list[str]]:
+    """(regressions, notes) of ``results`` against ``baseline``.
+
+    More statements per request is always a regression; a slower p95 only
+    with ``latency``, otherwise it is noted.
+    """
+    regressions, notes = [], []
+    for size, endpoints in results.items():
+        if size not in baseline:
+            notes.append(f"{size} rows: not in the baseline")
+            continue
+        for name, stats in endpoints.items():
+            base = baseline[size].get(name)
+            if not base:
+                notes.append(f"{size} rows {name}: not in the baseline")
+                continue
+            limit = base["statements"] * (1 + STATEMENT_SLACK)
+            if stats["statements"] > limit:
+                regressions.append(
+                    f"{size} rows {name}: {stats['statements']} statements/request "
+                    f"> {limit:.2f} (baseline {base['statements']})"
+                )
+            ratio = stats["p95_ms"] / base["p95_ms"] if base["p95_ms"] else 1.0
+            if ratio > 1 + tolerance:
+                line = (f"{size} rows {name}: p95 {stats['p95_ms']}ms is {ratio:.2f}x "
+                        f"the baseline's {base['p95_ms']}ms")
+                (regressions if latency else notes).append(line)
+    return regressions, notes
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    os.environ["DATABASE_PATH"] = str(args.db)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("METRICS_ENABLED", "false")
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    from app.main import app
+
+    results: dict[str, dict] = {}
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        t0 = time.perf_counter()
+        dataset = populate(size, args.seed)
+        print(f"[{size} rows] populated {dataset['rows']} rows in {time.perf_counter() - t0:.1f}s")
+        results[str(size)] = asyncio.run(run_size(app, dataset, args.iterations, args.seed))
+        for name, stats in results[str(size)].items():
+            print(f"  {name:24s} p50 {stats['p50_ms']:8.3f}ms  p95 {stats['p95_ms']:8.3f}ms  "
+                  f"p99 {stats['p99_ms']:8.3f}ms  {stats['throughput_rps']:8.1f} req/s  "
+                  f"{stats['statements']:5.2f} stmt/req")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2))
+        print(f"baseline written to {args.save_baseline}")
+    if args.baseline:
+        regressions, notes = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance, args.latency
+        )
+        for line in notes:
+            print(f"note {line}")
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
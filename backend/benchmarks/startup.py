@@ -0,0 +1,74 @@
+"""Cold-start benchmark.
+
+Spawns fresh interpreters and measures, per run, the time to import
+``app.main`` and the time until the first ``/health`` response with the
+lifespan (schema check) executed, against both an empty database and one
+whose schema is already current.
+
+    python -m benchmarks.startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import asyncio, json, time
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+import httpx
+
+async def first_request():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get("/health")).raise_for_status()
+
+asyncio.run(first_request())
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "first_request_ms": (t2 - t0) * 1000}))
+"""
+
+
+def _run(db: Path, env_overrides: dict[str, str]) -> dict:
+    env = {**os.environ, "DATABASE_PATH": str(db), **env_overrides}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND, env=env, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _median(samples: list[dict], key: str) -> float:
+    return round(statistics.median(s[key] for s in samples), 1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure application cold start")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        warm = Path(tmp) / "warm.sqlite"
+        scenarios = {
+            "empty database": lambda n: (Path(tmp) / f"fresh{n}" / "db.sqlite", {}),
+            "current schema": lambda n: (warm, {}),
+            "current schema, eager routers": lambda n: (warm, {"LAZY_ROUTERS": "false"}),
+        }
+        _run(warm, {})
+        for name, setup in scenarios.items():
+            samples = [_run(*setup(n)) for n in range(args.runs)]
+            print(f"{name:32s} import {_median(samples, 'import_ms'):7.1f}ms   "
+                  f"first /health {_median(samples, 'first_request_ms'):7.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.database import SessionLocal, engine
+
+
+def init_schema(args) -> None:
+    from app.core.schema import init_schema as run
+
+    changes = run(engine, force=args.force)
+    for change in changes:
+        print(change)
+    print(f"schema up to date ({len(changes)} change(s) applied)")
+
+
+def backfill_risk_scores(args) -> None:
+    from app.services.risk_scoring import backfill_risk_scores as backfill
+
+    session = SessionLocal()
+    try:
+        updated = backfill(session)
+    finally:
+        session.close()
+    print(f"risk_score recomputed for {updated} row(s)")
+
+
+def rebuild_fitgap_cube(args) -> None:
+    from app.services.fitgap_cube import rebuild_cube
+
+    session = SessionLocal()
+    try:
+        counts = {}
+        for project_id in args.project or [None]:
+            for table, cells in rebuild_cube(session, project_id).items():
+                counts[table] = counts.get(table, 0) + cells
+        session.commit()
+    finally:
+        session.close()
+    for table, cells in counts.items():
+        print(f"{table}: {cells} cell(s)")
+
+
+def rebuild_duplicate_index(args) -> None:
+    from app.services.duplicates import rebuild_duplicate_index as rebuild
+
+    session = SessionLocal()
+    try:
+        indexed = sum(rebuild(session, project_id) for project_id in args.project or [None])
+        session.commit()
+    finally:
+        session.close()
+    print(f"{indexed} requirement signature(s) indexed")
+
+
+def snapshot_test_progress(args) -> None:
+    from app.services.test_progress import take_snapshots
+
+    session = SessionLocal()
+    try:
+        days = take_snapshots(session)
+    finally:
+        session.close()
+    if days:
+        print(f"test cycle snapshots written for {len(days)} day(s): {days[0]} .. {days[-1]}")
+    else:
+        print("no test executions to snapshot")
+
+
+def migrate_effort(args) -> None:
+    from app.services.effort import backfill_effort
+
+    session = SessionLocal()
+    try:
+        report = backfill_effort(session, dry_run=args.dry_run)
+    finally:
+        session.close()
+    for source, parsed in report["parsed"].items():
+        print(f"{source}: {parsed} parsed, {report['unparsed'][source]} not understood")
+    for example in report["examples"]:
+        print(f"  unparsed: {example!r}")
+
+
+def retrain_classifier(args) -> None:
+    from app.services.classifier import retrain_classifier as retrain
+
+    session = SessionLocal()
+    try:
+        documents = retrain(session)
+        session.commit()
+    finally:
+        session.close()
+    summary = ", ".join(f"{label}: {n}" for label, n in documents.items()) or "no"
+    print(f"classifier retrained ({summary} requirement(s))")
+
+
+def rebuild_similarity_index(args) -> None:
+    from app.services.similarity import build_index
+
+    session = SessionLocal()
+    try:
+        stats = build_index(session)
+    finally:
+        session.close()
+    print(f"similarity index {stats['version']}: {stats['documents']} document(s), "
+          f"{stats['terms']} term(s)")
+
+
+def migrate_scenario_links(args) -> None:
+    from app.services.scenario_membership import migrate_included_strings
+
+    session = SessionLocal()
+    try:
+        result = migrate_included_strings(session)
+    finally:
+        session.close()
+    print(
+        f"{result['links']} link(s) from {result['composites']} composite scenario(s); "
+        f"skipped (cycles): {result['skipped_cycles'] or 'none'}"
+    )
+
+
+def sweep_orphans(args) -> None:
+    from app.services.cascade import sweep_orphans as sweep
+
+    session = SessionLocal()
+    try:
+        counts = sweep(session, dry_run=args.dry_run)
+    finally:
+        session.close()
+    verb = "orphaned" if args.dry_run else "deleted"
+    for key, count in counts.items():
+        print(f"{key}: {count} {verb}")
+    if not counts:
+        print("no orphans found")
+
+
+def migrate_timestamps(args) -> None:
+    from app.core.schema import init_schema as run
+    from app.services.timestamp_migration import migrate_timestamps as migrate
+
+    if engine.dialect.name != "sqlite":
+        print(f"{engine.dialect.name} uses native date/timestamp columns; nothing to migrate")
+        return
+    run(engine)
+    session = SessionLocal()
+    try:
+        report = migrate(session, dry_run=args.dry_run)
+    finally:
+        session.close()
+    verb = "to rewrite" if args.dry_run else "rewritten"
+    for key, result in report.items():
+        line = f"{key}: {result['rewritten']} {verb}"
+        if result["unparseable"]:
+            line += f", {result['unparseable']} unparseable -> NULL (e.g. {result['samples']})"
+        print(line)
+    if not report:
+        print("all date/timestamp values already canonical")
+
+
+def shard_projects(args) -> None:
+    from app.core.sharding import shard_router
+    from app.services.shard_migration import shard_project, unsharded_project_ids
+
+    router = shard_router()
+    session = SessionLocal()
+    try:
+        project_ids = args.project or unsharded_project_ids(session, router)
+        for project_id in project_ids:
+            counts = shard_project(session, router, project_id, delete_source=args.delete_source)
+            print(f"project {project_id} -> {router.url_for(project_id)} "
+                  f"({sum(counts.values())} row(s))")
+    finally:
+        session.close()
+        router.dispose()
+    if not project_ids:
+        print("no unsharded projects")
+
+
+def archive_projects(args) -> None:
+    from app.core.config import settings
+    from app.services.archive import archivable_project_ids, archive_project
+
+    if settings.SHARDING_ENABLED:
+        from app.core.sharding import shard_router
+
+        router = shard_router()
+        project_ids = args.project or sorted(
+            pid for part in router.fan_out(archivable_project_ids) for pid in part
+        )
+    else:
+        router = None
+        session = SessionLocal()
+        try:
+            project_ids = args.project or archivable_project_ids(session)
+        finally:
+            session.close()
+
+    for project_id in project_ids:
+        if args.dry_run:
+            print(f"project {project_id} would be archived")
+            continue
+        session = router.session(project_id) if router else SessionLocal()
+        try:
+            counts = archive_project(session, project_id)
+        finally:
+            session.close()
+        if router:
+            router.release(project_id)
+        print(f"project {project_id} archived ({sum(counts.values())} row(s))")
+    if not project_ids:
+        print("no projects to archive")
+
+
+def restore_project(args) -> None:
+    from app.services.archive import restore_project as restore
+
+    session = SessionLocal()
+    try:
+        for project_id in args.project:
+            counts = restore(session, project_id)
+            print(f"project {project_id} restored ({sum(counts.values())} row(s))")
+    finally:
+        session.close()
+
+
+# name -> (handler, help, [(flags, argparse kwargs), ...])
+COMMANDS = {
+    "init-schema": (
+        init_schema,
+        "Create missing tables/columns/indexes and stamp the schema version",
+        [(["--force"], {"action": "store_true", "help": "skip the fingerprint fast path"})],
+    ),
+    "backfill-risk-scores": (
+        backfill_risk_scores,
+        "Recompute Risk.risk_score for existing rows",
+        [],
+    ),
+    "rebuild-fitgap-cube": (
+        rebuild_fitgap_cube,
+        "Recompute the fit/gap and requirement cube from the base tables",
+        [(["--project"], {"type": int, "action": "append",
+                          "help": "project id (repeatable); default: every project"})],
+    ),
+    "rebuild-duplicate-index": (
+        rebuild_duplicate_index,
+        "Recompute the MinHash/LSH index used for near-duplicate requirements",
+        [(["--project"], {"type": int, "action": "append",
+                          "help": "project id (repeatable); default: every project"})],
+    ),
+    "snapshot-test-progress": (
+        snapshot_test_progress,
+        "Log baseline test execution statuses and write missing daily cycle snapshots",
+        [],
+    ),
+    "migrate-effort": (
+        migrate_effort,
+        "Parse free-text effort estimates into effort_days and rebuild the effort rollup",
+        [(["--dry-run"], {"action": "store_true", "help": "only report what would be parsed"})],
+    ),
+    "retrain-classifier": (
+        retrain_classifier,
+        "Recount the Fit/Gap naive Bayes model from every classified requirement",
+        [],
+    ),
+    "rebuild-similarity-index": (
+        rebuild_similarity_index,
+        "Rebuild the cross-project TF-IDF index behind /requirements/{id}/similar",
+        [],
+    ),
+    "migrate-scenario-links": (
+        migrate_scenario_links,
+        "Rebuild scenario_links/scenario_closure from Scenario.included_scenario_ids",
+        [],
+    ),
+    "sweep-orphans": (
+        sweep_orphans,
+        "Delete rows whose parent project/scenario/analysis/session no longer exists",
+        [(["--dry-run"], {"action": "store_true", "help": "only count orphans"})],
+    ),
+    "migrate-timestamps": (
+        migrate_timestamps,
+        "Normalize legacy date/timestamp strings to the canonical indexed form",
+        [(["--dry-run"], {"action": "store_true", "help": "only report what would change"})],
+    ),
+    "shard-projects": (
+        shard_projects,
+        "Move projects from the main database into per-project shard files",
+        [
+            (["--project"], {"type": int, "action": "append",
+                             "help": "project id (repeatable); default: every unsharded project"}),
+            (["--delete-source"], {"action": "store_true",
+                                   "help": "delete the copied rows from the main database"}),
+        ],
+    ),
+    "archive-projects": (
+        archive_projects,
+        "Move projects whose status is in ARCHIVE_STATUSES into the archive database",
+        [
+            (["--project"], {"type": int, "action": "append",
+                             "help": "project id (repeatable); default: every archivable project"}),
+            (["--dry-run"], {"action": "store_true", "help": "only list the projects"}),
+        ],
+    ),
+    "restore-project": (
+        restore_project,
+        "Move archived projects back into the live database",
+        [(["--project"], {"type": int, "action": "append", "required": True,
+                          "help": "project id (repeatable)"})],
+    ),
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="ProjektCoPilot maintenance jobs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (handler, help_text, arguments) in COMMANDS.items():
+        cmd = sub.add_parser(name, help=help_text)
+        for flags, kwargs in arguments:
+            cmd.add_argument(*flags, **kwargs)
+        cmd.set_defaults(handler=handler)
+    args = parser.parse_args(argv)
+    try:
+        args.handler(args)
+    except ValueError as exc:
+        parser.exit(1, f"error: {exc}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
 import os
 import sys
-from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, engine
+from app.core.schema import init_schema
+from app.core.timestamps import utcnow
+from app.services.classifier import retrain_classifier
+from app.services.duplicates import rebuild_duplicate_index
+from app.services.effort import backfill_effort
+from app.services.fitgap_cube import rebuild_cube
 from app.models import (
     Project,
     Scenario,
@@ -15,10 +20,6 @@ from app.models import (
 )
 
 
-def now_iso() -> str:
-    return datetime.now().isoformat()
-
-
 def clear_data(session) -> None:
     session.query(TestManagement).delete()
     session.query(ConfigItem).delete()
@@ -30,6 +31,7 @@ def clear_data(session) -> None:
 
 
 def seed_demo_data() -> None:
+    init_schema(engine)
     session = SessionLocal()
     try:
         clear_data(session)
@@ -40,21 +42,21 @@ def seed_demo_data() -> None:
                 project_name="S/4HANA Finance Transformation",
                 customer_name="Arcelik",
                 status="active",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Project(
                 project_code="PRJ-002",
                 project_name="SAP MM/WM Migration",
                 customer_name="Vestel",
                 status="planning",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Project(
                 project_code="PRJ-003",
                 project_name="Order-to-Cash Redesign",
                 customer_name="Koc Holding",
                 status="active",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
         ]
         session.add_all(projects)
@@ -68,35 +70,35 @@ def seed_demo_data() -> None:
                 scenario_id="S-001",
                 name="Order to Cash (O2C)",
                 module="SD",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Scenario(
                 project_id=project_ids["PRJ-001"],
                 scenario_id="S-002",
                 name="Procure to Pay (P2P)",
                 module="MM",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Scenario(
                 project_id=project_ids["PRJ-001"],
                 scenario_id="S-003",
                 name="Record to Report (R2R)",
                 module="FI",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Scenario(
                 project_id=project_ids["PRJ-001"],
                 scenario_id="S-004",
                 name="Plan to Produce",
                 module="PP",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Scenario(
                 project_id=project_ids["PRJ-001"],
                 scenario_id="S-005",
                 name="Hire to Retire",
                 module="HR",
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
         ]
         session.add_all(scenarios)
@@ -107,56 +109,56 @@ def seed_demo_data() -> None:
                 title="SD Pricing Procedure",
                 classification="Fit",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Requirement(
                 code="REQ-002",
                 title="Custom ATP Check",
                 classification="Gap",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Requirement(
                 code="REQ-003",
                 title="Intercompany Billing",
                 classification="Partial Fit",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Requirement(
                 code="REQ-004",
                 title="MM Auto PO",
                 classification="Fit",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Requirement(
                 code="REQ-005",
                 title="Custom Vendor Evaluation",
                 classification="Gap",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Requirement(
                 code="REQ-006",
                 title="FI Document Splitting",
                 classification="Fit",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Requirement(
                 code="REQ-007",
                 title="Custom Dunning Process",
                 classification="Gap",
                 project_id=project_ids["PRJ-002"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             Requirement(
                 code="REQ-008",
                 title="PP Scheduling Agreement",
                 classification="Partial Fit",
                 project_id=project_ids["PRJ-002"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
         ]
         session.add_all(requirements)
@@ -171,7 +173,7 @@ def seed_demo_data() -> None:
                 wricef_type="E",
                 project_id=project_ids["PRJ-001"],
                 requirement_id=requirement_ids["REQ-002"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             WricefItem(
                 code="W-002",
@@ -179,7 +181,7 @@ def seed_demo_data() -> None:
                 wricef_type="R",
                 project_id=project_ids["PRJ-001"],
                 requirement_id=requirement_ids["REQ-005"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             WricefItem(
                 code="W-003",
@@ -187,7 +189,7 @@ def seed_demo_data() -> None:
                 wricef_type="I",
                 project_id=project_ids["PRJ-001"],
                 requirement_id=requirement_ids["REQ-002"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             WricefItem(
                 code="W-004",
@@ -195,7 +197,7 @@ def seed_demo_data() -> None:
                 wricef_type="W",
                 project_id=project_ids["PRJ-002"],
                 requirement_id=requirement_ids["REQ-007"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
         ]
         session.add_all(wricef_items)
@@ -207,7 +209,7 @@ def seed_demo_data() -> None:
                 config_type="standard",
                 project_id=project_ids["PRJ-001"],
                 requirement_id=requirement_ids["REQ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             ConfigItem(
                 code="CFG-002",
@@ -215,7 +217,7 @@ def seed_demo_data() -> None:
                 config_type="standard",
                 project_id=project_ids["PRJ-001"],
                 requirement_id=requirement_ids["REQ-004"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             ConfigItem(
                 code="CFG-003",
@@ -223,7 +225,7 @@ def seed_demo_data() -> None:
                 config_type="standard",
                 project_id=project_ids["PRJ-001"],
                 requirement_id=requirement_ids["REQ-006"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
         ]
         session.add_all(config_items)
@@ -234,40 +236,45 @@ def seed_demo_data() -> None:
                 title="Unit Test: SD Pricing",
                 test_type="unit",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             TestManagement(
                 code="UT-002",
                 title="Unit Test: ATP Check",
                 test_type="unit",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             TestManagement(
                 code="SIT-001",
                 title="SIT: O2C End-to-End",
                 test_type="sit",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             TestManagement(
                 code="UAT-001",
                 title="UAT: Order Processing",
                 test_type="uat",
                 project_id=project_ids["PRJ-001"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
             TestManagement(
                 code="UAT-002",
                 title="UAT: Invoice Verification",
                 test_type="uat",
                 project_id=project_ids["PRJ-002"],
-                created_at=now_iso(),
+                created_at=utcnow(),
             ),
         ]
         session.add_all(test_cases)
 
         session.commit()
+        rebuild_cube(session)
+        rebuild_duplicate_index(session)
+        retrain_classifier(session)
+        session.commit()
+        backfill_effort(session)
     finally:
         session.close()
 
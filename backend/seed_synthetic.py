@@ -0,0 +1,445 @@
+"""Deterministic synthetic data generator for sizing and benchmarks.
+
+Builds on the demo seed: same models, but parameterized and written through
+Core ``executemany`` in large batches instead of one ORM object at a time.
+Every table is covered (projects down to session entities, requirements with
+a Fit/Gap mix, conversions, tests, cycles and executions) and the output only
+depends on the parameters and ``--seed``.
+
+    python seed_synthetic.py --projects 2000 --reset       # ~10M rows
+    python seed_synthetic.py --projects 5 --scenarios 4 --seed 7
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import func, select, text
+
+from app.core.database import SessionLocal, engine
+from app.core.schema import drop_schema, init_schema
+from app.models import (
+    Action,
+    Agenda,
+    Analysis,
+    Attendee,
+    ConfigItem,
+    Decision,
+    FitGap,
+    Project,
+    Question,
+    Requirement,
+    Risk,
+    Scenario,
+    ScenarioLink,
+    Session,
+    TestCycle,
+    TestExecution,
+    TestManagement,
+    WricefItem,
+)
+from app.services.risk_scoring import score_risk
+from app.services.classifier import retrain_classifier
+from app.services.duplicates import rebuild_duplicate_index
+from app.services.effort import backfill_effort
+from app.services.fitgap_cube import rebuild_cube
+from app.services.scenario_membership import rebuild_closure
+
+BASE_DATE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+MODULES = ["FI", "CO", "SD", "MM", "PP", "QM", "PM", "EWM", "HCM"]
+PROCESSES = {
+    "FI": ["Record to Report", "Asset Accounting", "Bank Reconciliation"],
+    "CO": ["Cost Center Planning", "Product Costing", "Profitability Analysis"],
+    "SD": ["Order to Cash", "Pricing", "Billing"],
+    "MM": ["Procure to Pay", "Inventory Management", "Vendor Evaluation"],
+    "PP": ["Plan to Produce", "MRP Run", "Shop Floor Control"],
+    "QM": ["Quality Inspection", "Quality Notifications"],
+    "PM": ["Plant Maintenance", "Work Orders"],
+    "EWM": ["Inbound Processing", "Outbound Processing", "Warehouse Tasks"],
+    "HCM": ["Hire to Retire", "Payroll", "Time Management"],
+}
+VERBS = ["Automate", "Validate", "Approve", "Report", "Calculate", "Post", "Split",
+         "Reconcile", "Block", "Release", "Print", "Archive", "Notify on", "Simulate"]
+OBJECTS = ["purchase orders", "sales orders", "vendor invoices", "credit limits",
+           "goods receipts", "intercompany billing", "asset transfers", "price conditions",
+           "delivery schedules", "batch determination", "payment runs", "cost allocations",
+           "production orders", "inspection lots", "output documents", "dunning letters"]
+QUALIFIERS = ["per company code", "by plant", "with custom workflow", "for export customers",
+              "using Fiori app", "via IDoc interface", "in batch job", "with approval limits",
+              "across sales organizations", "for consignment stock", ""]
+PEOPLE = ["Ayse Demir", "Mehmet Kaya", "Elif Sahin", "Can Ozturk", "Zeynep Arslan",
+          "Burak Celik", "Selin Aydin", "Emre Yildiz", "Deniz Kurt", "Ece Polat"]
+LEVELS = ["Low", "Medium", "High", "Very High"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+
+# Realistic Fit/Gap mix for S/4HANA fit-to-standard workshops.
+CLASSIFICATIONS = (["Fit"] * 55) + (["Partial Fit"] * 20) + (["Gap"] * 25)
+WRICEF_TYPES = ["W", "R", "I", "C", "E", "E", "E", "F"]
+
+
+@dataclass
+class Shape:
+    projects: int = 10
+    scenarios: int = 10              # per project
+    analyses: int = 2                # per scenario
+    sessions: int = 3                # per analysis
+    requirements: int = 8            # per session
+    questions: int = 8               # per session
+    fitgaps: int = 10                # per session
+    decisions: int = 4               # per session
+    risks: int = 3                   # per session
+    actions: int = 6                 # per session
+    attendees: int = 6               # per session
+    agenda: int = 5                  # per session
+    conversion_rate: float = 0.7
+    unit_test_rate: float = 0.8
+    integration_tests: int = 5       # SIT/UAT cases per scenario
+    cycles: int = 3                  # per project
+
+
+def rows_per_project(shape: Shape) -> int:
+    """Approximate rows one project produces with ``shape`` (for sizing)."""
+    converted = shape.requirements * shape.conversion_rate
+    per_session = (
+        1 + shape.requirements + converted * (1 + shape.unit_test_rate)
+        + shape.questions + shape.fitgaps + shape.decisions + shape.risks
+        + shape.actions + shape.attendees + shape.agenda
+    )
+    per_scenario = 1 + shape.integration_tests + shape.analyses * (1 + shape.sessions * per_session)
+    tests = shape.scenarios * (
+        shape.integration_tests
+        + shape.analyses * shape.sessions * converted * shape.unit_test_rate
+    )
+    return int(1 + shape.scenarios * per_scenario + shape.cycles * (1 + tests) + 3)
+
+
+def shape_for_rows(rows: int, **overrides) -> Shape:
+    """A shape that produces roughly ``rows`` rows in total."""
+    shape = Shape(**overrides)
+    per_project = rows_per_project(shape)
+    if rows >= per_project:
+        shape.projects = rows // per_project
+    else:
+        shape.projects = 1
+        shape.scenarios = max(1, rows * shape.scenarios // per_project)
+    return shape
+
+
+class _Writer:
+    """Buffers rows per table and flushes them with one executemany per batch."""
+
+    def __init__(self, conn, batch_size: int) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers: dict = {}
+        self.counts: dict[str, int] = {}
+        self.next_ids: dict = {}
+
+    def next_id(self, model) -> int:
+        if model not in self.next_ids:
+            current = self.conn.execute(select(func.max(model.__table__.c.id))).scalar()
+            self.next_ids[model] = (current or 0) + 1
+        value = self.next_ids[model]
+        self.next_ids[model] = value + 1
+        return value
+
+    def add(self, model, row: dict) -> None:
+        buf = self.buffers.setdefault(model, [])
+        buf.append(row)
+        if len(buf) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model=None) -> None:
+        for m in [model] if model is not None else list(self.buffers):
+            rows = self.buffers.get(m)
+            if rows:
+                # executemany needs one key set per batch; absent columns become NULL.
+                keys = set().union(*rows)
+                for row in rows:
+                    if len(row) != len(keys):
+                        for key in keys.difference(row):
+                            row[key] = None
+                self.conn.execute(m.__table__.insert(), rows)
+                name = m.__tablename__
+                self.counts[name] = self.counts.get(name, 0) + len(rows)
+                self.buffers[m] = []
+
+
+def _ts(rnd: random.Random, days: int = 365) -> datetime:
+    return BASE_DATE - timedelta(seconds=rnd.randrange(days * 86400))
+
+
+def _title(rnd: random.Random, module: str) -> str:
+    qualifier = rnd.choice(QUALIFIERS)
+    return f"{rnd.choice(VERBS)} {rnd.choice(OBJECTS)} {qualifier}".strip() + f" ({module})"
+
+
+def _session_entities(w: _Writer, rnd: random.Random, shape: Shape, session_id: int,
+                      module: str, created: str) -> None:
+    for n in range(1, shape.attendees + 1):
+        w.add(Attendee, {
+            "session_id": session_id, "name": rnd.choice(PEOPLE),
+            "role": rnd.choice(["Key User", "Consultant", "Process Owner", "IT"]),
+            "email": f"user{rnd.randrange(10_000)}@example.com",
+            "department": module, "attendance_status": rnd.choice(["present", "present", "absent"]),
+        })
+    for n in range(1, shape.agenda + 1):
+        w.add(Agenda, {
+            "session_id": session_id, "topic": f"{rnd.choice(PROCESSES[module])} walkthrough",
+            "duration": f"{rnd.choice([15, 30, 45, 60])}m", "presenter": rnd.choice(PEOPLE),
+            "sort_order": n, "status": rnd.choice(["planned", "done"]),
+        })
+    for n in range(1, shape.questions + 1):
+        w.add(Question, {
+            "session_id": session_id, "question_id": f"Q-{session_id}-{n}",
+            "question_text": f"How do you {_title(rnd, module).lower()}?",
+            "status": rnd.choice(["open", "open", "answered", "closed"]),
+            "priority": rnd.choice(PRIORITIES), "assigned_to": rnd.choice(PEOPLE),
+            "category": module, "created_at": created,
+        })
+    for n in range(1, shape.fitgaps + 1):
+        status = rnd.choice(CLASSIFICATIONS)
+        w.add(FitGap, {
+            "session_id": session_id, "gap_id": f"G-{session_id}-{n}",
+            "process_area": rnd.choice(PROCESSES[module]), "gap_description": _title(rnd, module),
+            "fit_gap_status": status,
+            "solution_type": "Standard" if status == "Fit" else rnd.choice(
+                ["Configuration", "Enhancement", "Report", "Interface", "Workaround"]),
+            "priority": rnd.choice(PRIORITIES), "effort_estimate": f"{rnd.randint(1, 20)}d",
+            "assigned_to": rnd.choice(PEOPLE), "created_at": created,
+        })
+    for n in range(1, shape.decisions + 1):
+        w.add(Decision, {
+            "session_id": session_id, "decision_id": f"D-{session_id}-{n}",
+            "title": f"Use standard {rnd.choice(OBJECTS)}", "impact": rnd.choice(LEVELS),
+            "decided_by": rnd.choice(PEOPLE), "decision_date": created.date(),
+            "status": rnd.choice(["pending", "approved", "approved", "rejected"]),
+            "created_at": created,
+        })
+    for n in range(1, shape.risks + 1):
+        probability, impact = rnd.choice(LEVELS), rnd.choice(LEVELS)
+        w.add(Risk, {
+            "session_id": session_id, "item_id": f"R-{session_id}-{n}",
+            "type": rnd.choice(["risk", "risk", "issue"]),
+            "title": f"Delay in {rnd.choice(OBJECTS)}", "probability": probability,
+            "impact": impact, "risk_score": score_risk(probability, impact),
+            "owner": rnd.choice(PEOPLE), "status": rnd.choice(["open", "open", "mitigated", "closed"]),
+            "due_date": _ts(rnd, 120).date(), "created_at": created,
+        })
+    for n in range(1, shape.actions + 1):
+        w.add(Action, {
+            "session_id": session_id, "action_id": f"A-{session_id}-{n}",
+            "title": f"Clarify {rnd.choice(OBJECTS)}", "assigned_to": rnd.choice(PEOPLE),
+            "due_date": _ts(rnd, 120).date(), "status": rnd.choice(["open", "open", "in_progress", "done"]),
+            "priority": rnd.choice(PRIORITIES), "created_at": created,
+        })
+
+
+def generate(shape: Shape, seed: int = 42, batch_size: int = 50_000, reset: bool = False,
+             progress: bool = False) -> dict[str, int]:
+    """Generate ``shape`` worth of data; returns rows inserted per table."""
+    rnd = random.Random(seed)
+    if reset:
+        drop_schema(engine)
+    init_schema(engine, force=reset)
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        w = _Writer(conn, batch_size)
+        for p in range(1, shape.projects + 1):
+            project_id = w.next_id(Project)
+            created = _ts(rnd)
+            w.add(Project, {
+                "id": project_id, "project_code": f"PRJ-{project_id:05d}",
+                "project_name": f"S/4HANA Program {project_id}",
+                "customer_name": f"Customer {rnd.randrange(1, shape.projects * 2 + 2)}",
+                "status": rnd.choice(["planning", "active", "active", "active", "closed"]),
+                "project_manager": rnd.choice(PEOPLE), "created_at": created,
+            })
+            project_tests: list[int] = []
+            scenario_ids = [w.next_id(Scenario) for _ in range(shape.scenarios)]
+            members: list[int] = []
+            if len(scenario_ids) >= 4:
+                # First scenario of each project is a composite of three others.
+                members = rnd.sample(scenario_ids[1:], 3)
+                for n, member in enumerate(members):
+                    w.add(ScenarioLink, {"composite_id": scenario_ids[0], "member_id": member,
+                                         "sort_order": n})
+
+            for s, scenario_id in enumerate(scenario_ids, start=1):
+                module = rnd.choice(MODULES)
+                composite = s == 1 and bool(members)
+                w.add(Scenario, {
+                    "id": scenario_id, "project_id": project_id, "scenario_id": f"S-{s:03d}",
+                    "name": rnd.choice(PROCESSES[module]), "module": module,
+                    "status": rnd.choice(["draft", "active", "approved"]),
+                    "priority": rnd.choice(PRIORITIES), "is_composite": int(composite),
+                    "included_scenario_ids": ",".join(map(str, members)) if composite else None,
+                    "created_at": created,
+                })
+                for _ in range(shape.integration_tests):
+                    test_id = w.next_id(TestManagement)
+                    project_tests.append(test_id)
+                    w.add(TestManagement, {
+                        "id": test_id, "project_id": project_id,
+                        "test_type": rnd.choice(["sit", "uat"]),
+                        "title": f"E2E: {rnd.choice(PROCESSES[module])}",
+                        "status": "not_started", "source_type": "scenario",
+                        "source_id": scenario_id, "created_at": created,
+                    })
+
+                for a in range(1, shape.analyses + 1):
+                    analysis_id = w.next_id(Analysis)
+                    w.add(Analysis, {
+                        "id": analysis_id, "scenario_id": scenario_id, "code": f"AN-{analysis_id}",
+                        "title": f"{module} fit-to-standard {a}",
+                        "status": rnd.choice(["planned", "in_progress", "completed"]),
+                        "created_at": created,
+                    })
+                    for _ in range(shape.sessions):
+                        session_id = w.next_id(Session)
+                        session_created = _ts(rnd)
+                        w.add(Session, {
+                            "id": session_id, "project_id": project_id,
+                            "scenario_id": scenario_id, "analysis_id": analysis_id,
+                            "session_name": f"{module} workshop {session_id}",
+                            "session_code": f"WS-{session_id}", "module": module,
+                            "facilitator": rnd.choice(PEOPLE),
+                            "session_date": session_created.date(),
+                            "status": rnd.choice(["planned", "completed", "completed"]),
+                            "created_at": session_created,
+                        })
+                        _session_entities(w, rnd, shape, session_id, module, session_created)
+
+                        for _ in range(shape.requirements):
+                            req_id = w.next_id(Requirement)
+                            classification = rnd.choice(CLASSIFICATIONS)
+                            title = _title(rnd, module)
+                            req = {
+                                "id": req_id, "code": f"REQ-{req_id}", "title": title,
+                                "description": f"{title}. Raised in {module} workshop.",
+                                "classification": classification, "module": module,
+                                "priority": rnd.choice(PRIORITIES), "status": "open",
+                                "session_id": session_id, "project_id": project_id,
+                                "analysis_id": analysis_id, "created_at": session_created,
+                            }
+                            if rnd.random() < shape.conversion_rate:
+                                target = ConfigItem if classification == "Fit" else WricefItem
+                                target_id = w.next_id(target)
+                                item = {
+                                    "id": target_id, "project_id": project_id,
+                                    "requirement_id": req_id, "scenario_id": scenario_id,
+                                    "title": title, "description": req["description"],
+                                    "created_at": session_created,
+                                }
+                                if target is ConfigItem:
+                                    item.update(config_type=module, status="planned")
+                                else:
+                                    item.update(
+                                        wricef_type=rnd.choice(WRICEF_TYPES), status="identified",
+                                        priority=req["priority"],
+                                        complexity=rnd.choice(["Low", "Medium", "High"]),
+                                        estimated_effort=f"{rnd.randint(1, 30)}d",
+                                        assigned_to=rnd.choice(PEOPLE),
+                                    )
+                                w.add(target, item)
+                                req.update(
+                                    conversion_status="converted",
+                                    conversion_type="config" if target is ConfigItem else "wricef",
+                                    conversion_id=target_id, converted_at=session_created,
+                                )
+                                if rnd.random() < shape.unit_test_rate:
+                                    test_id = w.next_id(TestManagement)
+                                    project_tests.append(test_id)
+                                    w.add(TestManagement, {
+                                        "id": test_id, "project_id": project_id,
+                                        "test_type": "unit", "title": f"Unit Test: {title}",
+                                        "status": "not_started",
+                                        "source_type": "config" if target is ConfigItem else "wricef",
+                                        "source_id": target_id, "created_at": session_created,
+                                    })
+                            w.add(Requirement, req)
+
+            for c in range(1, shape.cycles + 1):
+                cycle_id = w.next_id(TestCycle)
+                results = {"passed": 0, "failed": 0, "blocked": 0}
+                for test_id in project_tests:
+                    status = rnd.choices(["passed", "failed", "blocked", "not_run"], [60, 15, 5, 20])[0]
+                    if status in results:
+                        results[status] += 1
+                    w.add(TestExecution, {
+                        "id": w.next_id(TestExecution), "test_cycle_id": cycle_id,
+                        "test_case_id": test_id, "execution_code": f"EX-{cycle_id}-{test_id}",
+                        "status": status,
+                        "executed_by": rnd.choice(PEOPLE) if status != "not_run" else None,
+                        "execution_date": _ts(rnd, 90).date() if status != "not_run" else None,
+                        "created_at": created,
+                    })
+                executed = sum(results.values())
+                w.add(TestCycle, {
+                    "id": cycle_id, "project_id": project_id, "cycle_code": f"CYC-{cycle_id}",
+                    "name": f"{['SIT', 'UAT', 'Regression'][(c - 1) % 3]} cycle {c}",
+                    "cycle_type": ["sit", "uat", "regression"][(c - 1) % 3],
+                    "status": rnd.choice(["planned", "in_progress", "completed"]),
+                    "total_tests": len(project_tests), "passed_tests": results["passed"],
+                    "failed_tests": results["failed"], "blocked_tests": results["blocked"],
+                    "completion_percentage": round(100 * executed / len(project_tests), 1)
+                    if project_tests else 0.0,
+                    "created_at": created,
+                })
+
+            if progress and p % 100 == 0:
+                total = sum(w.counts.values())
+                print(f"  {p}/{shape.projects} projects, {total:,} rows flushed "
+                      f"({time.perf_counter() - started:.0f}s)")
+        w.flush()
+        if conn.dialect.name == "postgresql":
+            # ids were assigned explicitly; move the serial sequences past them
+            for model in w.next_ids:
+                table = model.__tablename__
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT coalesce(max(id), 1) FROM {table}))"
+                ))
+
+    db = SessionLocal()
+    try:
+        rebuild_closure(db)
+        rebuild_cube(db)
+        rebuild_duplicate_index(db)
+        retrain_classifier(db)
+        db.commit()
+        backfill_effort(db)
+    finally:
+        db.close()
+    return w.counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic ProjektCoPilot data")
+    defaults = Shape()
+    for field in Shape.__dataclass_fields__:
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field,
+                            type=type(getattr(defaults, field)), default=getattr(defaults, field))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args(argv)
+
+    shape = Shape(**{f: getattr(args, f) for f in Shape.__dataclass_fields__})
+    started = time.perf_counter()
+    counts = generate(shape, seed=args.seed, batch_size=args.batch_size, reset=args.reset,
+                      progress=True)
+    for table, count in sorted(counts.items()):
+        print(f"{table:22s} {count:>12,}")
+    print(f"{'total':22s} {sum(counts.values()):>12,} rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Settings are read at import time, so the test database is chosen first.
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="projektcopilot-tests-"))
+os.environ["DATABASE_PATH"] = str(_DATA_DIR / "test.db")
+os.environ["ARCHIVE_DATABASE_URL"] = f"sqlite:///{_DATA_DIR / 'archive.db'}"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = settings.API_V1_STR
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def project(client):
+    """A project with one scenario, analysis and session, plus a risk and an action."""
+    project = client.post(f"{API}/projects", json={"project_name": "Test project"}).json()
+    scenario = client.post(
+        f"{API}/scenarios", json={"project_id": project["id"], "name": "Order to cash"}
+    ).json()
+    analysis = client.post(
+        f"{API}/analyses", json={"scenario_id": scenario["id"], "title": "Sales"}
+    ).json()
+    session = client.post(f"{API}/sessions", json={
+        "project_id": project["id"], "scenario_id": scenario["id"],
+        "analysis_id": analysis["id"], "session_name": "Workshop 1",
+    }).json()
+    risk = client.post(f"{API}/sessions/{session['id']}/risks", json={
+        "title": "Data quality", "probability": "high", "impact": "medium",
+    }).json()
+    action = client.post(f"{API}/sessions/{session['id']}/actions", json={
+        "title": "Clean up customers", "due_date": "2026-01-15",
+    }).json()
+    requirement = client.post(f"{API}/requirements", json={
+        "project_id": project["id"], "session_id": session["id"], "title": "Credit check",
+    }).json()
+    return {
+        "project": project, "scenario": scenario, "analysis": analysis, "session": session,
+        "risk": risk, "action": action, "requirement": requirement,
+    }
@@ -0,0 +1,72 @@
+"""Moving projects into and out of the archive without reusing their ids."""
+from app.core.database import SessionLocal
+from app.services.archive import archive_project, restore_project
+from app.services.change_log import writer
+
+from conftest import API
+
+
+def _history(client, risk_id: int) -> list:
+    return client.get(f"{API}/change-log/risks/{risk_id}").json()
+
+
+def test_archive_round_trip_keeps_ids_and_history(client, project):
+    risk_id = project["risk"]["id"]
+    client.put(f"{API}/risks/{risk_id}", json={"status": "closed"})
+    assert writer.flush()
+    history = _history(client, risk_id)
+    assert history
+
+    with SessionLocal() as db:
+        counts = archive_project(db, project["project"]["id"])
+    assert counts["change_log"] >= len(history)
+    session_path = f"{API}/sessions/{project['session']['id']}"
+    assert client.get(session_path).status_code == 404
+    assert _history(client, risk_id) == []
+
+    # the archived ids are not handed out again
+    other = client.post(f"{API}/sessions", json={
+        "project_id": project["project"]["id"] + 1000, "session_name": "Other",
+    }).json()
+    new_risk = client.post(f"{API}/sessions/{other['id']}/risks", json={"title": "New"}).json()
+    assert new_risk["id"] > risk_id
+
+    with SessionLocal() as db:
+        restore_project(db, project["project"]["id"])
+    risks = client.get(f"{session_path}/risks").json()
+    assert [(r["id"], r["status"]) for r in risks] == [(risk_id, "closed")]
+    assert [entry["changes"] for entry in _history(client, risk_id)] == [
+        entry["changes"] for entry in history
+    ]
+
+
+def test_schema_upgrade_adds_autoincrement(tmp_path, monkeypatch):
+    from sqlalchemy import inspect, text
+
+    from app.core.database import Base, make_engine
+    from app.core.schema import init_schema
+    from app.models import Project
+
+    engine = make_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    # a database created before the models asked for AUTOINCREMENT
+    monkeypatch.setitem(Project.__table__.dialect_options["sqlite"], "autoincrement", False)
+    Base.metadata.create_all(engine)
+    monkeypatch.undo()
+    with engine.begin() as conn:
+        conn.execute(Project.__table__.insert(), [{"project_name": f"P{n}"} for n in range(3)])
+        conn.execute(Project.__table__.delete().where(Project.id == 3))
+
+    assert "rebuild table projects with AUTOINCREMENT" in init_schema(engine)
+    with engine.begin() as conn:
+        ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'projects'")).scalar()
+        assert "AUTOINCREMENT" in ddl
+        assert "ix_projects_id" in {i["name"] for i in inspect(conn).get_indexes("projects")}
+        assert conn.execute(text("SELECT id, project_name FROM projects")).all() == [
+            (1, "P0"), (2, "P1"),
+        ]
+        conn.execute(Project.__table__.insert(), [{"project_name": "P3"}])
+        conn.execute(Project.__table__.delete().where(Project.id == 3))
+        new_id = conn.execute(Project.__table__.insert().values(project_name="P4")).lastrowid
+    assert new_id == 4
+    assert init_schema(engine) == []
+    engine.dispose()
@@ -0,0 +1,136 @@
+"""Set-based cascade deletes, their dry runs and the orphan sweep."""
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, make_engine
+from app.models import Project, Requirement, Risk, Scenario, Session as SessionModel
+from app.services.cascade import sweep_orphans
+from app.services.change_log import writer
+
+from conftest import API
+
+
+def _cascade(client, path: str, dry_run: bool) -> dict:
+    response = client.delete(f"{API}/{path}/cascade", params={"dry_run": dry_run})
+    assert response.status_code == 200, response.text
+    assert response.json()["dry_run"] is dry_run
+    return response.json()["deleted"]
+
+
+def _history(client, entity: str, entity_id: int) -> list:
+    assert writer.flush()
+    return client.get(f"{API}/change-log/{entity}/{entity_id}").json()
+
+
+def test_project_cascade_dry_run_matches_delete(client, project):
+    project_id = project["project"]["id"]
+    path = f"projects/{project_id}"
+
+    planned = _cascade(client, path, dry_run=True)
+    for table in ("projects", "scenarios", "analyses", "analysis_sessions",
+                  "risks_issues", "action_items", "new_requirements"):
+        assert planned[table] == 1, table
+    # a dry run changes nothing
+    assert client.get(f"{API}/{path}").status_code == 200
+    assert len(client.get(f"{API}/sessions/{project['session']['id']}/risks").json()) == 1
+
+    assert _cascade(client, path, dry_run=False) == planned
+    assert client.get(f"{API}/{path}").status_code == 404
+    assert client.get(f"{API}/sessions/{project['session']['id']}").status_code == 404
+    assert client.get(f"{API}/requirements/{project['requirement']['id']}").status_code == 404
+    assert _history(client, "risks", project["risk"]["id"])[0]["action"] == "delete"
+    assert _history(client, "projects", project_id)[0]["action"] == "delete"
+
+
+def test_scenario_cascade_detaches_surviving_rows(client, project):
+    project_id = project["project"]["id"]
+    scenario_id = project["scenario"]["id"]
+    by_analysis = client.post(f"{API}/requirements", json={
+        "project_id": project_id, "analysis_id": project["analysis"]["id"], "title": "Pricing",
+    }).json()
+    wricef = client.post(f"{API}/wricef-items", json={
+        "project_id": project_id, "scenario_id": scenario_id, "title": "Credit interface",
+    }).json()
+    config = client.post(f"{API}/config-items", json={
+        "project_id": project_id, "scenario_id": scenario_id, "title": "Credit control area",
+    }).json()
+    path = f"scenarios/{scenario_id}"
+
+    planned = _cascade(client, path, dry_run=True)
+    assert planned["new_requirements.session_id"] == 1
+    assert planned["new_requirements.analysis_id"] == 1
+    assert planned["wricef_items.scenario_id"] == 1
+    assert planned["config_items.scenario_id"] == 1
+    assert planned["analysis_sessions"] == 1 and planned["risks_issues"] == 1
+    assert "new_requirements" not in planned
+
+    assert _cascade(client, path, dry_run=False) == planned
+    assert client.get(f"{API}/{path}").status_code == 404
+    assert client.get(f"{API}/analyses/{project['analysis']['id']}").status_code == 404
+    assert client.get(f"{API}/sessions/{project['session']['id']}").status_code == 404
+    assert client.get(f"{API}/projects/{project_id}").status_code == 200
+
+    requirement = client.get(f"{API}/requirements/{project['requirement']['id']}").json()
+    assert requirement["session_id"] is None
+    assert client.get(f"{API}/requirements/{by_analysis['id']}").json()["analysis_id"] is None
+    assert client.get(f"{API}/wricef-items/{wricef['id']}").json()["scenario_id"] is None
+    assert client.get(f"{API}/config-items/{config['id']}").json()["scenario_id"] is None
+
+    latest = _history(client, "requirements", project["requirement"]["id"])[0]
+    assert (latest["action"], latest["changes"]) == (
+        "update", {"session_id": [project["session"]["id"], None]},
+    )
+    assert _history(client, "scenarios", scenario_id)[0]["action"] == "delete"
+
+
+def test_cascade_of_missing_row_is_404(client):
+    assert client.delete(f"{API}/scenarios/999999/cascade").status_code == 404
+
+
+@pytest.fixture
+def db():
+    engine = make_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def test_sweep_removes_orphans_and_detaches_references(db):
+    gone, kept = Project(project_name="Gone"), Project(project_name="Kept")
+    db.add_all([gone, kept])
+    db.flush()
+    scenario = Scenario(project_id=gone.id, name="Order to cash")
+    session = SessionModel(project_id=gone.id, session_name="Workshop")
+    db.add_all([scenario, session])
+    db.flush()
+    db.add_all([
+        Risk(session_id=session.id, title="Data quality"),
+        Requirement(project_id=gone.id, title="Credit check"),
+        Requirement(project_id=kept.id, session_id=session.id, title="Pricing"),
+    ])
+    db.commit()
+    # a plain delete leaves the project's subtree behind
+    db.execute(delete(Project).where(Project.id == gone.id))
+    db.commit()
+
+    orphaned = sweep_orphans(db, dry_run=True)
+    assert orphaned == {
+        "scenarios.project_id": 1,
+        "analysis_sessions.project_id": 1,
+        "new_requirements.project_id": 1,
+        "requirement_cube.project_id": 1,
+    }
+    swept = sweep_orphans(db)
+    # rows orphaned by the sweep itself go in the same pass
+    assert swept["risks_issues.session_id"] == 1
+    assert swept["new_requirements.session_id"] == 1
+    assert {k: swept[k] for k in orphaned} == orphaned
+
+    assert db.scalar(select(Scenario.id)) is None
+    assert db.scalar(select(Risk.id)) is None
+    assert db.execute(select(Requirement.title, Requirement.session_id)).all() == [
+        ("Pricing", None),
+    ]
+    assert sweep_orphans(db) == {}
@@ -0,0 +1,50 @@
+"""Naive Bayes classification suggestions on a scratch database."""
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, make_engine
+from app.models import Requirement
+from app.services import classifier
+
+
+@pytest.fixture
+def db():
+    engine = make_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def _add(db, title, classification=None):
+    requirement = Requirement(title=title, classification=classification)
+    db.add(requirement)
+    db.commit()
+    return requirement.id
+
+
+def test_single_label_suggests_nothing(db):
+    _add(db, "Standard credit check", "Fit")
+    _add(db, "Standard pricing", "Fit")
+    _add(db, "Credit check for new customers")
+    result = classifier.suggest_classifications(db, store=False)
+    assert result["classifier"]["documents"] == {"Fit": 2}
+    assert result["suggestions"] == []
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_suggestions_follow_the_trained_text(db, monkeypatch, vectorized):
+    if not vectorized:
+        monkeypatch.setattr(classifier, "_numpy", lambda: None)
+    for n in range(3):
+        _add(db, f"Standard credit check {n}", "Fit")
+        _add(db, f"Custom interface to legacy warehouse {n}", "Gap")
+    credit = _add(db, "Credit check standard")
+    interface = _add(db, "Legacy warehouse interface")
+
+    result = classifier.suggest_classifications(db)
+    by_id = {s["requirement_id"]: s for s in result["suggestions"]}
+    assert by_id[credit]["classification"] == "Fit"
+    assert by_id[interface]["classification"] == "Gap"
+    assert all(0.5 < s["confidence"] < 1 for s in by_id.values())
+    assert result["stored"] == 2
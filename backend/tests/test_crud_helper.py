@@ -0,0 +1,26 @@
+"""Shared CRUD helpers: writes the caller left pending survive no-op updates."""
+import pytest
+
+from app.api.v1.endpoints._crud_helper import update_item
+from app.core.database import SessionLocal
+from app.models import Project, Requirement
+from app.schemas.project import ProjectUpdate
+from app.schemas.requirement import RequirementUpdate
+
+
+@pytest.mark.parametrize("model, entity, data", [
+    # RETURNING path, nothing to update
+    (Project, "project", ProjectUpdate()),
+    # RETURNING path, values equal to the stored row
+    (Project, "project", ProjectUpdate(project_name="Test project")),
+    # unit-of-work path (requirements have listeners), values equal to the stored row
+    (Requirement, "requirement", RequirementUpdate(title="Credit check")),
+])
+def test_no_op_update_commits_pending_work(client, project, model, entity, data):
+    name = f"Pending for {model.__name__} {sorted(data.model_fields_set)}"
+    with SessionLocal() as db:
+        db.add(Project(project_name=name))
+        obj = update_item(db, model, project[entity]["id"], data)
+        assert obj.id == project[entity]["id"]
+    with SessionLocal() as db:
+        assert db.query(Project).filter(Project.project_name == name).count() == 1
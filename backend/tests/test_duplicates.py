@@ -0,0 +1,114 @@
+"""Near-duplicate requirements through the MinHash/LSH index on a scratch database."""
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, make_engine
+from app.models import Project, Requirement, RequirementBucket, RequirementSignature
+from app.services import duplicates
+
+CREDIT = "Check customer credit limit before releasing the sales order"
+CREDIT_AGAIN = "Check customer credit limit before releasing the sales order automatically"
+LOGO = "Print delivery notes with the company logo"
+
+
+@pytest.fixture
+def db():
+    engine = make_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def project_id(db):
+    project = Project(project_name="Duplicates")
+    db.add(project)
+    db.commit()
+    return project.id
+
+
+def _add(db, project_id, title, description=None):
+    requirement = Requirement(project_id=project_id, title=title, description=description)
+    db.add(requirement)
+    db.commit()
+    return requirement
+
+
+def _indexed(db, requirement_id) -> tuple[int, int]:
+    return tuple(
+        db.scalar(select(func.count()).select_from(model).where(
+            model.requirement_id == requirement_id
+        ))
+        for model in (RequirementSignature, RequirementBucket)
+    )
+
+
+def test_signature_estimates_jaccard():
+    assert duplicates.similarity(duplicates.signature(CREDIT), duplicates.signature(CREDIT)) == 1
+    # 8 of 9 tokens shared
+    close = duplicates.similarity(duplicates.signature(CREDIT), duplicates.signature(CREDIT_AGAIN))
+    assert 0.75 <= close < 1
+    assert duplicates.similarity(duplicates.signature(CREDIT), duplicates.signature(LOGO)) < 0.2
+    assert duplicates.signature("", None) is None
+
+
+def test_near_duplicates_are_found_and_others_rejected(db, project_id):
+    credit = _add(db, project_id, CREDIT)
+    _add(db, project_id, LOGO)
+    _add(db, project_id + 1, CREDIT)  # same wording, other project
+
+    matches = duplicates.find_duplicates(db, CREDIT_AGAIN, None, project_id)
+    assert [m["id"] for m in matches] == [credit.id]
+    assert 0.75 <= matches[0]["similarity"] < 1
+    unrelated = "Archive travel expense receipts"
+    assert duplicates.find_duplicates(db, unrelated, None, project_id) == []
+    # a requirement is not its own duplicate
+    assert duplicates.find_duplicates(db, CREDIT, None, project_id, exclude_id=credit.id) == []
+    # the threshold is applied to the estimate, not just to the shared buckets
+    assert duplicates.find_duplicates(db, CREDIT_AGAIN, None, project_id, threshold=0.99) == []
+
+
+def test_index_follows_updates_and_deletes(db, project_id):
+    credit = _add(db, project_id, CREDIT)
+    assert _indexed(db, credit.id) == (1, duplicates.BANDS)
+
+    credit.title = LOGO
+    db.commit()
+    assert duplicates.find_duplicates(db, CREDIT_AGAIN, None, project_id) == []
+    assert [m["id"] for m in duplicates.find_duplicates(db, LOGO, None, project_id)] == [credit.id]
+
+    db.delete(credit)
+    db.commit()
+    assert _indexed(db, credit.id) == (0, 0)
+    assert duplicates.find_duplicates(db, LOGO, None, project_id) == []
+
+
+def test_clusters_group_near_duplicates(db, project_id):
+    first = _add(db, project_id, CREDIT)
+    second = _add(db, project_id, CREDIT_AGAIN)
+    third = _add(db, project_id, "Sales order release", CREDIT)
+    _add(db, project_id, LOGO)
+
+    result = duplicates.duplicate_clusters(db, project_id)
+    assert [
+        [r["id"] for r in cluster["requirements"]] for cluster in result["clusters"]
+    ] == [[first.id, second.id, third.id]]
+
+
+def test_rebuild_matches_incremental_index(db, project_id):
+    ids = [_add(db, project_id, title).id for title in (CREDIT, CREDIT_AGAIN, LOGO)]
+    _add(db, project_id, "")  # no tokens, not indexed
+
+    def snapshot():
+        return db.execute(
+            select(RequirementBucket.requirement_id, RequirementBucket.band,
+                   RequirementBucket.bucket)
+            .order_by(RequirementBucket.requirement_id, RequirementBucket.band)
+        ).all()
+
+    before = snapshot()
+    assert duplicates.rebuild_duplicate_index(db, project_id) == len(ids)
+    db.commit()
+    assert snapshot() == before
@@ -0,0 +1,81 @@
+"""Effort strings in person-days and the per-project effort rollup."""
+import pytest
+
+from app.core.database import SessionLocal
+from app.services.effort import parse_effort, project_effort, rebuild_effort_rollup
+
+from conftest import API
+
+
+@pytest.mark.parametrize("text, days", [
+    ("5", 5.0),
+    ("5d", 5.0),
+    ("3 days", 3.0),
+    ("1,5 PT", 1.5),
+    ("2.5 person-days", 2.5),
+    ("16h", 2.0),
+    ("2 weeks", 10.0),
+    ("1 Monat", 20.0),
+    ("1w 2d", 7.0),
+    ("1d + 4h", 1.5),
+    ("3-5d", 4.0),
+    ("ca. 10 Tage", 10.0),
+    (None, None),
+    ("", None),
+    ("tbd", None),
+    ("5 apples", None),
+    ("2 3", None),
+])
+def test_parse_effort(text, days):
+    assert parse_effort(text) == days
+
+
+def _slice(rows: list[dict]) -> dict:
+    return {row["value"]: (row["items"], row["effort_days"]) for row in rows}
+
+
+def test_rollup_keeps_sources_apart(client, project):
+    project_id = project["project"]["id"]
+    session_id = project["session"]["id"]
+    wricef = client.post(f"{API}/wricef-items", json={
+        "project_id": project_id, "title": "Credit interface", "wricef_type": "I",
+        "status": "open", "complexity": "high", "estimated_effort": "2 weeks",
+        "assigned_to": "Kim",
+    }).json()
+    client.post(f"{API}/wricef-items", json={
+        "project_id": project_id, "title": "Unsized", "wricef_type": "R",
+        "estimated_effort": "tbd",
+    })
+    client.post(f"{API}/sessions/{session_id}/fitgap", json={
+        "gap_description": "Pricing", "fit_gap_status": "open", "solution_type": "I",
+        "effort_estimate": "3d", "assigned_to": "Kim",
+    })
+
+    effort = client.get(f"{API}/projects/{project_id}/effort").json()
+    assert effort["total"] == {"items": 3, "estimated": 2, "effort_days": 13.0}
+    assert _slice(effort["by_source"]) == {"wricef": (2, 10.0), "fitgap": (1, 3.0)}
+    assert _slice(effort["by_assignee"]) == {"Kim": (2, 13.0), None: (1, 0.0)}
+    # "open" and "I" appear in both vocabularies but are not summed together
+    assert _slice(effort["wricef"]["by_status"]) == {"open": (1, 10.0), "identified": (1, 0.0)}
+    assert _slice(effort["fitgap"]["by_status"]) == {"open": (1, 3.0)}
+    assert _slice(effort["wricef"]["by_type"]) == {"I": (1, 10.0), "R": (1, 0.0)}
+    assert _slice(effort["fitgap"]["by_type"]) == {"I": (1, 3.0)}
+    assert _slice(effort["wricef"]["by_complexity"]) == {"high": (1, 10.0), None: (1, 0.0)}
+    assert effort["fitgap"]["by_complexity"] is None
+
+    client.put(f"{API}/wricef-items/{wricef['id']}", json={
+        "status": "done", "estimated_effort": "4d",
+    })
+    only = client.get(f"{API}/projects/{project_id}/effort", params={"source": "wricef"}).json()
+    assert only["fitgap"] is None
+    assert _slice(only["wricef"]["by_status"]) == {"done": (1, 4.0), "identified": (1, 0.0)}
+    assert client.get(
+        f"{API}/projects/{project_id}/effort", params={"source": "other"}
+    ).status_code == 400
+
+    # the incrementally maintained rollup matches a full rebuild
+    with SessionLocal() as db:
+        incremental = project_effort(db, project_id)
+        rebuild_effort_rollup(db, project_id)
+        db.commit()
+        assert project_effort(db, project_id) == incremental
@@ -0,0 +1,97 @@
+"""Engine construction: per-dialect pool profiles, overrides and SQLite pragmas."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.core.config import settings
+from app.core.database import ENGINE_PROFILES, engine_profile, is_sqlite_memory, make_engine
+
+DRIVERS = {"sqlite": None, "postgresql": "psycopg2", "mysql": "pymysql"}
+URLS = {
+    "sqlite": "sqlite:///{tmp}/profile.db",
+    "postgresql": "postgresql+psycopg2://user:pw@localhost/db",
+    "mysql": "mysql+pymysql://user:pw@localhost/db",
+}
+
+
+@pytest.mark.parametrize("backend", sorted(ENGINE_PROFILES))
+def test_profile_defaults(backend):
+    assert engine_profile(make_url(URLS[backend])) == ENGINE_PROFILES[backend]
+
+
+@pytest.mark.parametrize("backend", sorted(ENGINE_PROFILES))
+def test_settings_override_profile(backend, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 50)
+    profile = engine_profile(make_url(URLS[backend]))
+    assert profile["pool_size"] == 3
+    assert profile["statement_cache_size"] == 50
+    assert profile["max_overflow"] == ENGINE_PROFILES[backend]["max_overflow"]
+
+
+@pytest.mark.parametrize("backend", sorted(ENGINE_PROFILES))
+def test_make_engine_applies_profile(backend, tmp_path):
+    if DRIVERS[backend]:
+        pytest.importorskip(DRIVERS[backend])
+    engine = make_engine(URLS[backend].format(tmp=tmp_path))
+    profile = ENGINE_PROFILES[backend]
+    try:
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == profile["pool_size"]
+        assert engine.pool._max_overflow == profile["max_overflow"]
+        assert engine.pool._pre_ping == profile["pre_ping"]
+        assert engine._compiled_cache.capacity == profile["statement_cache_size"]
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_file_pragmas(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path}/pragmas.db")
+    try:
+        with engine.connect() as conn:
+            assert conn.scalar(text("PRAGMA journal_mode")) == "wal"
+            assert conn.scalar(text("PRAGMA busy_timeout")) == 5000
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:"])
+def test_sqlite_memory_shares_one_connection(url):
+    assert is_sqlite_memory(make_url(url))
+    engine = make_engine(url)
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        with engine.connect() as conn:
+            assert conn.scalar(text("SELECT count(*) FROM t")) == 0
+    finally:
+        engine.dispose()
+
+
+def test_memory_database_starts_no_background_threads(monkeypatch):
+    import asyncio
+
+    from app import main
+    from app.services import change_log, jobs
+
+    started = []
+    monkeypatch.setattr(main, "engine", make_engine("sqlite://"))
+    monkeypatch.setattr(settings, "CHANGE_LOG_ENABLED", True)
+    monkeypatch.setattr(settings, "JOBS_ENABLED", True)
+    monkeypatch.setattr(settings, "TEST_SNAPSHOT_INTERVAL_SECONDS", 0)
+    # the session's client runs the real writer and runner; leave them alone
+    for thread, name in ((change_log.writer, "change-log"), (jobs.runner, "jobs")):
+        monkeypatch.setattr(thread, "start", lambda name=name: started.append(name))
+        monkeypatch.setattr(thread, "stop", lambda: None)
+
+    async def run():
+        async with main.lifespan(main.app):
+            pass
+
+    try:
+        asyncio.run(run())
+    finally:
+        main.engine.dispose()
+    assert started == []
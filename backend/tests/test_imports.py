@@ -0,0 +1,24 @@
+"""Import costs: models load without the services, numpy or the web framework."""
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+PROBE = """
+import sys
+import app.models
+print(sorted(m for m in ("app.services", "fastapi", "numpy") if m in sys.modules))
+from sqlalchemy.orm import configure_mappers
+from app.models import Risk
+configure_mappers()
+print(bool(Risk.__mapper__.dispatch.after_update))
+"""
+
+
+def test_models_import_without_services():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND, check=True, capture_output=True, text=True,
+    ).stdout.split("\n")
+    # nothing heavy on import; the services' listeners arrive with the mappers
+    assert out[:2] == ["[]", "True"]
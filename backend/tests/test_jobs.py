@@ -0,0 +1,187 @@
+"""Background jobs: claiming, checkpoints, shutdown, shard fan-out and job types."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import FitGapCube, Risk
+from app.services import jobs
+
+from conftest import API
+
+
+class Context:
+    def __init__(self, cancel_at: int | None = None) -> None:
+        self.steps = []
+        self.cancel_at = cancel_at
+
+    def progress(self, fraction=None, message=None) -> None:
+        self.steps.append(fraction)
+        if len(self.steps) == self.cancel_at:
+            raise jobs.JobCancelled()
+
+
+def _wait(client, job_id: int, timeout: float = 10) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"{API}/jobs/{job_id}").json()
+        if job["status"] in jobs.FINISHED or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def test_project_less_job_runs_to_completion(client, project):
+    job = client.post(f"{API}/jobs", json={"job_type": "backfill-risk-scores"}).json()
+    job = _wait(client, job["id"])
+    assert job["status"] == "succeeded", job
+    assert job["progress"] == 1.0
+    assert "updated" in job["result"]
+
+
+def test_cancellation_discards_the_interrupted_step(client, project):
+    client.post(f"{API}/sessions/{project['session']['id']}/fitgap", json={"title": "Gap"})
+    project_id = project["project"]["id"]
+    with SessionLocal() as db:
+        db.execute(FitGapCube.__table__.delete())
+        db.commit()
+        with pytest.raises(jobs.JobCancelled):
+            jobs._rebuild_fitgap_cube(db, Context(cancel_at=1), project_id=project_id)
+        db.rollback()
+        assert db.scalar(select(func.count()).select_from(FitGapCube)) == 0
+
+        ctx = Context()
+        jobs._rebuild_fitgap_cube(db, ctx, project_id=project_id)
+        assert ctx.steps == [1.0]
+        assert db.scalar(select(func.count()).select_from(FitGapCube)) > 0
+
+
+@pytest.fixture
+def paused_runner(client):
+    """Keep the app's runner from claiming the jobs a test queues."""
+    jobs.runner.stop()
+    yield
+    jobs.runner.start()
+
+
+def test_claim_enforces_the_concurrency_limit(paused_runner):
+    runner = jobs.JobRunner(2)
+    submitted = []
+    runner._executor = type("Executor", (), {"submit": lambda self, *a: submitted.append(a)})()
+    with SessionLocal() as db:
+        queued = [
+            jobs.enqueue_job(db, "retrain-classifier").id for _ in range(2)
+        ]
+        # another dispatcher claimed the first one in the meantime
+        db.execute(update(jobs.Job).where(jobs.Job.id == queued[0]).values(
+            status="running", heartbeat_at=jobs.utcnow(), worker="elsewhere:1",
+        ))
+        db.commit()
+    try:
+        runner._tick()
+        assert submitted == []
+    finally:
+        with SessionLocal() as db:
+            db.execute(update(jobs.Job).where(jobs.Job.id.in_(queued)).values(status="cancelled"))
+            db.commit()
+
+
+def test_only_the_owning_run_writes_the_final_status(paused_runner):
+    runner = jobs.JobRunner(1)
+    submitted = []
+    runner._executor = type("Executor", (), {"submit": lambda self, *a: submitted.append(a)})()
+    with SessionLocal() as db:
+        job_id = jobs.enqueue_job(db, "backfill-risk-scores").id
+    runner._tick()
+    [(execute, ctx, name, params)] = submitted
+    assert ctx.attempts == 1
+
+    # the run stalled, was recovered and claimed again by another worker
+    with SessionLocal() as db:
+        db.execute(update(jobs.Job).where(jobs.Job.id == job_id).values(
+            worker="elsewhere:1", attempts=2, heartbeat_at=jobs.utcnow(),
+        ))
+        db.commit()
+    execute(ctx, name, params)
+    with SessionLocal() as db:
+        job = db.get(jobs.Job, job_id)
+        assert (job.status, job.worker, job.attempts) == ("running", "elsewhere:1", 2)
+        db.execute(update(jobs.Job).where(jobs.Job.id == job_id).values(status="cancelled"))
+        db.commit()
+
+
+def test_stop_gives_up_after_the_timeout():
+    runner = jobs.JobRunner(1)
+    release = threading.Event()
+    runner._thread = threading.Thread(target=lambda: None)
+    runner._thread.start()
+    runner._executor = ThreadPoolExecutor(1)
+    runner._executor.submit(release.wait)
+    runner._running.add(-1)
+    runner._thread.is_alive = lambda: True  # pose as a started runner
+    started = time.monotonic()
+    runner.stop(timeout=0.2)
+    assert time.monotonic() - started < 2
+    release.set()
+
+
+def test_project_less_job_fans_out_over_shards(client, project, monkeypatch):
+    from app.core.sharding import shard_router
+    from app.services.shard_migration import shard_project
+
+    monkeypatch.setattr(settings, "SHARDING_ENABLED", True)
+    router = shard_router()
+    project_id = project["project"]["id"]
+    with SessionLocal() as db:
+        shard_project(db, router, project_id)
+    shard = router.session(project_id)
+    try:
+        shard.execute(update(Risk).values(risk_score=None))
+        shard.commit()
+        with SessionLocal() as db:
+            ctx = Context()
+            result = jobs._backfill_risk_scores(db, ctx)
+        assert result["updated"] >= 1
+        assert ctx.steps[-1] == 1.0 and len(ctx.steps) >= 2
+        assert shard.scalar(select(Risk.risk_score).where(Risk.id == project["risk"]["id"])) == 12.0
+    finally:
+        shard.close()
+        router.release(project_id)
+
+
+def test_convert_requirements_job(client, project):
+    project_id = project["project"]["id"]
+    for title, classification in [("Standard pricing", "Fit"), ("Custom pricing", "Gap"),
+                                  ("Pricing report", "Partial Fit"), ("Unsure", None)]:
+        client.post(f"{API}/requirements", json={
+            "project_id": project_id, "title": title, "classification": classification,
+        })
+    with SessionLocal() as db:
+        result = jobs._convert_requirements(db, Context(), project_id=project_id)
+        assert result == {"config": 1, "wricef": 2}
+        # converted ones are not picked up again
+        assert jobs._convert_requirements(db, Context(), project_id=project_id) == {
+            "config": 0, "wricef": 0,
+        }
+    rows = client.get(f"{API}/requirements", params={"project_id": project_id}).json()
+    converted = sorted(r["conversion_type"] or "-" for r in rows)
+    assert converted == ["-", "-", "config", "wricef", "wricef"]
+
+
+def test_render_minutes_job(client, project):
+    with SessionLocal() as db:
+        ctx = Context()
+        result = jobs._render_minutes(db, ctx, analysis_id=project["analysis"]["id"])
+        assert ctx.steps == [1.0]
+        assert result["media_type"].startswith("text/markdown")
+        assert "Data quality" in result["content"]
+        assert result["content"] == client.get(
+            f"{API}/analyses/{project['analysis']['id']}/minutes"
+        ).text
+        with pytest.raises(ValueError):
+            jobs._render_minutes(db, Context(), session_id=-1)
+        with pytest.raises(ValueError):
+            jobs._render_minutes(db, Context())
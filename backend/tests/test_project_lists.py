@@ -0,0 +1,74 @@
+"""Project-wide lists of session entities: order, paging, filters and totals."""
+from conftest import API
+
+RISKS = [  # (title, probability, impact, status) -> score
+    ("Cutover window", "very high", "high", "open"),      # 20
+    ("Key user availability", "low", "low", "closed"),    # 4
+    ("Interface volumes", "medium", "high", "open"),      # 12
+    ("Unclear ownership", "unknown", "high", "open"),     # unscored
+    ("Legacy data", "high", "medium", "mitigated"),       # 12
+]
+
+
+def _risks(client, project_id: int, **params):
+    response = client.get(f"{API}/projects/{project_id}/risks", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _setup(client, project) -> tuple[int, list[int]]:
+    project_id = project["project"]["id"]
+    second = client.post(f"{API}/sessions", json={
+        "project_id": project_id, "session_name": "Workshop 2",
+    }).json()
+    ids = [project["risk"]["id"]]  # high x medium = 12
+    for n, (title, probability, impact, status) in enumerate(RISKS):
+        session_id = (project["session"] if n % 2 else second)["id"]
+        ids.append(client.post(f"{API}/sessions/{session_id}/risks", json={
+            "title": title, "probability": probability, "impact": impact, "status": status,
+        }).json()["id"])
+    # another project's risks never show up
+    other = client.post(f"{API}/projects", json={"project_name": "Other"}).json()
+    other_session = client.post(f"{API}/sessions", json={
+        "project_id": other["id"], "session_name": "Elsewhere",
+    }).json()
+    client.post(f"{API}/sessions/{other_session['id']}/risks", json={
+        "title": "Foreign", "probability": "very high", "impact": "very high",
+    })
+    return project_id, ids
+
+
+def test_risks_ordered_by_score_with_unscored_last(client, project):
+    project_id, ids = _setup(client, project)
+    response = _risks(client, project_id)
+    rows = response.json()
+    assert response.headers["X-Total-Count"] == "6"
+    # score desc, ties by id, unscorable risks last
+    assert [r["id"] for r in rows] == [ids[1], ids[0], ids[3], ids[5], ids[2], ids[4]]
+    assert [r["risk_score"] for r in rows] == [20.0, 12.0, 12.0, 12.0, 4.0, None]
+
+
+def test_risk_pages_add_up_to_the_full_list(client, project):
+    project_id, _ = _setup(client, project)
+    full = [r["id"] for r in _risks(client, project_id).json()]
+    pages = []
+    for offset in range(0, 8, 4):
+        response = _risks(client, project_id, limit=4, offset=offset)
+        assert response.headers["X-Total-Count"] == "6"
+        pages += [r["id"] for r in response.json()]
+    assert pages == full
+    assert _risks(client, project_id, limit=4, offset=8).json() == []
+
+
+def test_risk_filters_narrow_the_total(client, project):
+    project_id, ids = _setup(client, project)
+    response = _risks(client, project_id, open_only="true")
+    assert response.headers["X-Total-Count"] == "4"
+    assert [r["id"] for r in response.json()] == [ids[1], ids[0], ids[3], ids[4]]
+    response = _risks(client, project_id, status="closed")
+    assert response.headers["X-Total-Count"] == "1"
+    assert [r["id"] for r in response.json()] == [ids[2]]
+
+
+def test_unknown_project_is_404(client):
+    assert client.get(f"{API}/projects/999999/risks").status_code == 404
@@ -0,0 +1,88 @@
+"""Exact SQL statement counts per endpoint.
+
+A changed count is either a regression (an N+1, a lost fast path) or an
+intended change that should update the table below.
+"""
+import pytest
+
+from app.core.query_counter import assert_query_count, count_queries
+
+from conftest import API
+
+ENDPOINTS = [
+    ("GET", "/projects", None, 1),
+    ("GET", "/projects/{project}", None, 1),
+    ("POST", "/projects", {"project_name": "Another"}, 1),
+    # change-log pre-read + UPDATE ... RETURNING
+    ("PUT", "/projects/{project}", {"description": "Phase 2"}, 2),
+    # project lookup + count + page
+    ("GET", "/projects/{project}/risks", None, 3),
+    ("GET", "/projects/{project}/actions?open_only=true", None, 3),
+    ("GET", "/projects/{project}/risk-matrix", None, 3),
+    ("GET", "/sessions?project_id={project}", None, 1),
+    ("GET", "/sessions?project_id={project}&with_counts=true", None, 1),
+    ("GET", "/sessions/{session}", None, 1),
+    ("GET", "/sessions/{session}/risks", None, 1),
+    # INSERT + change_version bump + refresh
+    ("POST", "/sessions/{session}/risks", {"title": "Scope", "probability": "low"}, 3),
+    # load + UPDATE + change_version bump + refresh
+    ("PUT", "/risks/{risk}", {"mitigation_plan": "Weekly review"}, 4),
+    ("GET", "/requirements/{requirement}", None, 1),
+    # BEGIN + session + one SELECT per section
+    ("GET", "/sessions/{session}/minutes", None, 9),
+]
+
+
+def _ids(project: dict) -> dict:
+    return {name: row["id"] for name, row in project.items()}
+
+
+@pytest.mark.parametrize(
+    "method, path, body, expected", ENDPOINTS, ids=[f"{m} {p}" for m, p, _, _ in ENDPOINTS]
+)
+def test_statement_count(client, project, method, path, body, expected):
+    with assert_query_count(expected):
+        response = client.request(method, API + path.format(**_ids(project)), json=body)
+    assert response.status_code < 300, response.text
+
+
+def test_cached_minutes_cost_two_statements(client, project):
+    path = f"{API}/sessions/{project['session']['id']}/minutes"
+    client.get(path)
+    with assert_query_count(2):  # BEGIN + session (change_version check)
+        assert client.get(path).status_code == 200
+
+
+def test_background_threads_are_not_counted(client, project):
+    from app.services.change_log import writer
+
+    # the writer thread inserts this update's history while the block is open
+    with count_queries() as counter:
+        client.put(f"{API}/projects/{project['project']['id']}", json={"status": "active"})
+        assert writer.flush()
+    assert not [sql for sql in counter.statements if "change_log" in sql]
+
+
+@pytest.mark.parametrize("path, entity, body", [
+    ("/requirements/{requirement}", "requirement", {"title": "Credit check"}),
+    ("/risks/{risk}", "risk", {"probability": "high", "impact": "medium"}),
+])
+def test_no_op_update_writes_nothing(client, project, path, entity, body):
+    with count_queries() as counter:
+        response = client.put(API + path.format(**_ids(project)), json=body)
+    assert response.status_code == 200, response.text
+    assert not [sql for sql in counter.statements if sql.lstrip().upper().startswith("UPDATE")]
+    assert response.json().get("updated_at") == project[entity].get("updated_at")
+
+
+def test_unrendered_update_keeps_cached_minutes(client, project):
+    path = f"{API}/sessions/{project['session']['id']}/minutes"
+    client.get(path)
+    # description is not part of the minutes, so change_version is not bumped
+    with assert_query_count(3):  # load + UPDATE + refresh
+        response = client.put(
+            f"{API}/risks/{project['risk']['id']}", json={"description": "Detail"}
+        )
+    assert response.status_code == 200, response.text
+    with assert_query_count(2):
+        assert client.get(path).status_code == 200
@@ -0,0 +1,86 @@
+"""Composite scenarios: membership edges, their closure and cycle rejection."""
+import pytest
+
+from app.core.database import SessionLocal
+from app.models import ScenarioClosure, ScenarioLink
+
+from conftest import API
+
+
+@pytest.fixture
+def chain(client, project):
+    """Scenarios a, b, c in one project, with a including b and b including c."""
+    project_id = project["project"]["id"]
+    ids = {}
+    for name in ("c", "b", "a"):
+        member = {"b": ids.get("c"), "a": ids.get("b")}.get(name)
+        response = client.post(f"{API}/scenarios", json={
+            "project_id": project_id, "name": name,
+            "included_scenario_ids": str(member) if member else None,
+        })
+        assert response.status_code == 201, response.text
+        ids[name] = response.json()["id"]
+    return ids
+
+
+def _closure(ids: dict) -> set[tuple[str, str, int]]:
+    names = {v: k for k, v in ids.items()}
+    with SessionLocal() as db:
+        rows = db.query(ScenarioClosure).filter(ScenarioClosure.ancestor_id.in_(names))
+        return {(names[r.ancestor_id], names[r.descendant_id], r.depth) for r in rows}
+
+
+def test_closure_holds_transitive_members(client, chain):
+    assert _closure(chain) == {("a", "b", 1), ("b", "c", 1), ("a", "c", 2)}
+    expanded = client.get(f"{API}/scenarios/{chain['a']}/expand").json()
+    assert [(node["id"], node["depth"]) for node in expanded] == [(chain["b"], 1), (chain["c"], 2)]
+    included = client.get(f"{API}/scenarios/{chain['c']}/included-in").json()
+    assert [(node["id"], node["depth"]) for node in included] == [(chain["b"], 1), (chain["a"], 2)]
+
+
+@pytest.mark.parametrize("composite, member", [("c", "a"), ("c", "b"), ("a", "a")])
+def test_cycles_are_rejected(client, chain, composite, member):
+    response = client.put(
+        f"{API}/scenarios/{chain[composite]}", json={"included_scenario_ids": str(chain[member])}
+    )
+    assert response.status_code == 400
+    assert "Cycle" in response.json()["detail"]
+    assert _closure(chain) == {("a", "b", 1), ("b", "c", 1), ("a", "c", 2)}
+
+
+def test_members_only_put_is_saved(client, project, chain):
+    scenario = project["scenario"]
+    # only the members, with the unchanged name resent
+    response = client.put(f"{API}/scenarios/{scenario['id']}", json={
+        "name": scenario["name"], "included_scenario_ids": f"{chain['a']},{chain['c']}",
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["is_composite"] == 1
+
+    stored = client.get(f"{API}/scenarios/{scenario['id']}").json()
+    assert stored["is_composite"] == 1
+    assert stored["included_scenario_ids"] == f"{chain['a']},{chain['c']}"
+    with SessionLocal() as db:
+        links = db.query(ScenarioLink.member_id).filter(ScenarioLink.composite_id == scenario["id"])
+        assert {r[0] for r in links} == {chain["a"], chain["c"]}
+    expanded = client.get(f"{API}/scenarios/{scenario['id']}/expand").json()
+    assert {(node["id"], node["depth"]) for node in expanded} == {
+        (chain["a"], 1), (chain["c"], 1), (chain["b"], 2),
+    }
+
+    response = client.put(f"{API}/scenarios/{scenario['id']}", json={"included_scenario_ids": ""})
+    assert response.status_code == 200, response.text
+    assert client.get(f"{API}/scenarios/{scenario['id']}").json()["is_composite"] == 0
+    assert client.get(f"{API}/scenarios/{scenario['id']}/expand").json() == []
+
+
+def test_members_from_another_project_are_rejected(client, project, chain):
+    other = client.post(f"{API}/projects", json={"project_name": "Other"}).json()
+    outsider = client.post(
+        f"{API}/scenarios", json={"project_id": other["id"], "name": "Elsewhere"}
+    ).json()
+    response = client.put(
+        f"{API}/scenarios/{chain['c']}/members", json={"member_ids": [outsider["id"]]}
+    )
+    assert response.status_code == 400
+    assert client.get(f"{API}/scenarios/{chain['c']}/expand").json() == []
@@ -0,0 +1,36 @@
+"""Request routing with SHARDING_ENABLED: project ids from path, query or header."""
+import pytest
+
+from app.core.config import settings
+
+from conftest import API
+
+
+@pytest.fixture
+def sharding(monkeypatch):
+    monkeypatch.setattr(settings, "SHARDING_ENABLED", True)
+
+
+@pytest.mark.parametrize("path", [
+    "/sessions/{session}",
+    "/requirements/{requirement}",
+    "/change-log/risks/{risk}",
+])
+def test_request_without_project_is_rejected(client, project, sharding, path):
+    ids = {name: row["id"] for name, row in project.items()}
+    response = client.get(API + path.format(**ids))
+    assert response.status_code == 400
+    assert "X-Project-Id" in response.json()["detail"]
+
+
+def test_request_with_project_header_is_routed(client, project, sharding):
+    response = client.get(
+        f"{API}/sessions/{project['session']['id']}",
+        headers={"X-Project-Id": str(project["project"]["id"])},
+    )
+    assert response.status_code == 200
+
+
+def test_fan_out_routes_need_no_project(client, project, sharding):
+    assert client.get(f"{API}/projects").status_code == 200
+    assert client.get(f"{API}/dashboard/stats").status_code == 200
@@ -0,0 +1,34 @@
+"""Incremental maintenance of the similarity index: edits and deletions."""
+from app.core.database import SessionLocal
+from app.models import Requirement
+from app.services.similarity import similarity_index
+
+from conftest import API
+
+TEXT = {"title": "Customer credit limit check", "description": "Block sales orders over limit"}
+
+
+def _similar(client, requirement_id: int, k: int) -> list[int]:
+    response = client.get(f"{API}/requirements/{requirement_id}/similar", params={"k": k})
+    assert response.status_code == 200, response.text
+    return [row["id"] for row in response.json()["results"]]
+
+
+def test_deleted_requirements_drop_out_of_results(client, project):
+    ids = [
+        client.post(f"{API}/requirements", json={
+            "project_id": project["project"]["id"], **TEXT, "title": f"{TEXT['title']} {n}",
+        }).json()["id"]
+        for n in range(8)
+    ]
+    query, *others = ids
+    first = _similar(client, query, 7)
+    assert set(first) == set(others)
+
+    for requirement_id in others[:4]:
+        assert client.delete(f"{API}/requirements/{requirement_id}").status_code == 200
+    assert len(_similar(client, query, 3)) == 3
+
+    with SessionLocal() as db:
+        ranked = similarity_index().similar(db, db.get(Requirement, query), k=3)
+    assert {key[1] for key, _ in ranked} <= set(others[4:])
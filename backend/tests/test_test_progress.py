@@ -0,0 +1,115 @@
+"""Daily test cycle snapshots replayed from the execution log, and the burn-down built on them."""
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+# through the module: pytest would try to collect Test* classes imported by name
+from app import models
+from app.core.database import Base, make_engine
+from app.services import test_progress
+
+
+@pytest.fixture
+def db():
+    engine = make_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Sets the time the execution listeners stamp on their events."""
+    now = {}
+    monkeypatch.setattr(test_progress, "utcnow", lambda: now["at"])
+
+    def at(day: int, hour: int) -> datetime:
+        now["at"] = datetime(2026, 1, day, hour, tzinfo=timezone.utc)
+        return now["at"]
+
+    return at
+
+
+def _series(db, cycle_id: int) -> dict:
+    snapshot = models.TestCycleSnapshot
+    rows = db.execute(select(snapshot).where(snapshot.test_cycle_id == cycle_id)).scalars()
+    return {
+        snap.day.day: (snap.total, snap.passed, snap.failed, snap.blocked, snap.not_run)
+        for snap in rows
+    }
+
+
+def test_snapshots_replay_each_day_of_a_cycle(db, clock):
+    clock(12, 9)
+    cycle = models.TestCycle(
+        name="SIT 1", start_date=date(2026, 1, 12), end_date=date(2026, 1, 16),
+    )
+    db.add(cycle)
+    db.flush()
+    executions = [models.TestExecution(test_cycle_id=cycle.id) for _ in range(4)]
+    db.add_all(executions)
+    db.commit()
+    assert test_progress.take_snapshots(db, now=clock(12, 18)) == [date(2026, 1, 12)]
+
+    # the next two days pass without a snapshot run
+    clock(13, 10)
+    executions[0].status = executions[1].status = "passed"
+    executions[2].status = "Failed"
+    db.commit()
+    clock(14, 10)
+    executions[2].status = "passed"
+    executions[3].status = "blocked"
+    db.add(models.TestExecution(test_cycle_id=cycle.id, status="not_run"))
+    db.commit()
+    clock(14, 23)
+    db.delete(executions[1])
+    db.add(models.TestExecution(test_cycle_id=cycle.id, status="passed"))
+    db.commit()
+
+    # the 12th was taken before its end, so it is replayed with the missed days
+    written = test_progress.take_snapshots(db, now=clock(15, 8))
+    assert written == [date(2026, 1, day) for day in (12, 13, 14, 15)]
+    assert _series(db, cycle.id) == {
+        12: (4, 0, 0, 0, 4),
+        13: (4, 2, 1, 0, 1),
+        14: (5, 3, 0, 1, 1),
+        15: (5, 3, 0, 1, 1),
+    }
+
+    # later the same day only today's running snapshot is rewritten
+    clock(15, 11)
+    executions[3].status = "passed"
+    db.commit()
+    assert test_progress.take_snapshots(db, now=clock(15, 12)) == [date(2026, 1, 15)]
+    assert _series(db, cycle.id)[15] == (5, 4, 0, 0, 1)
+    assert _series(db, cycle.id)[14] == (5, 3, 0, 1, 1)
+
+    points = test_progress.burndown(db, cycle)["points"]
+    assert [p["remaining"] for p in points] == [4, 1, 2, 1]
+    assert [p["ideal_remaining"] for p in points][:3] == [4.0, 3.0, 2.5]
+    window = test_progress.burndown(
+        db, cycle, date_from=date(2026, 1, 13), date_to=date(2026, 1, 14),
+    )
+    assert [p["day"] for p in window["points"]] == [date(2026, 1, 13), date(2026, 1, 14)]
+
+
+def test_bulk_inserted_executions_get_baseline_events(db):
+    db.execute(insert(models.TestExecution), [
+        {"test_cycle_id": 1, "status": "passed", "execution_date": date(2026, 1, 13),
+         "created_at": datetime(2026, 1, 12, 9, tzinfo=timezone.utc)},
+        {"test_cycle_id": 1, "status": "not_run",
+         "created_at": datetime(2026, 1, 12, 9, tzinfo=timezone.utc)},
+    ])
+    db.commit()
+    now = datetime(2026, 1, 14, 8, tzinfo=timezone.utc)
+    assert test_progress.take_snapshots(db, now=now) == [
+        date(2026, 1, 12), date(2026, 1, 13), date(2026, 1, 14),
+    ]
+    assert _series(db, 1) == {
+        12: (2, 0, 0, 0, 2),
+        13: (2, 1, 0, 0, 1),
+        14: (2, 1, 0, 0, 1),
+    }
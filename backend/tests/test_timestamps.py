@@ -0,0 +1,128 @@
+"""Parsing legacy date/time strings, named date windows and the one-off rewrite."""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, make_engine
+from app.core.timestamps import UTCDateTime, date_window, parse_date, parse_timestamp
+from app.services.timestamp_migration import migrate_timestamps
+
+MORNING = datetime(2026, 1, 15, 10, 30, tzinfo=timezone.utc)
+MIDNIGHT = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-01-15T10:30:00", MORNING),
+    ("2026-01-15 10:30", MORNING),
+    ("2026-01-15T10:30:00.000000Z", MORNING),
+    ("2026-01-15T12:30:00+02:00", MORNING),
+    ("15.01.2026 10:30", MORNING),
+    ("15/01/2026 10:30", MORNING),
+    ("2026-01-15", MIDNIGHT),
+    ("15.01.2026", MIDNIGHT),
+    ("2026/01/15", MIDNIGHT),
+    ("2026-01", datetime(2026, 1, 1, tzinfo=timezone.utc)),
+    ("2026", datetime(2026, 1, 1, tzinfo=timezone.utc)),
+    (1768473000, MORNING),
+    ("1768473000000", MORNING),
+    (datetime(2026, 1, 15, 10, 30), MORNING),
+    (datetime(2026, 1, 15, 5, 30, tzinfo=timezone(timedelta(hours=-5))), MORNING),
+    (date(2026, 1, 15), MIDNIGHT),
+])
+def test_parse_timestamp_returns_aware_utc(value, expected):
+    parsed = parse_timestamp(value)
+    assert parsed == expected
+    assert parsed.utcoffset() == timedelta(0)
+
+
+@pytest.mark.parametrize("value", [None, "", "   "])
+def test_empty_values_parse_to_none(value):
+    assert parse_timestamp(value) is None
+    assert parse_date(value) is None
+
+
+@pytest.mark.parametrize("value", ["next tuesday", "31.02.2026", "2026-13-01", "15-01-2026x"])
+def test_unparseable_values_raise(value):
+    with pytest.raises(ValueError):
+        parse_timestamp(value)
+
+
+def test_unparseable_stored_values_read_as_none():
+    column = UTCDateTime()
+    dialect = make_engine("sqlite://").dialect
+    assert column.process_result_value("next tuesday", dialect) is None
+    assert column.process_bind_param("15.01.2026 10:30", dialect) == "2026-01-15 10:30:00.000000"
+
+
+@pytest.mark.parametrize("name, first, last", [
+    ("overdue", None, date(2026, 1, 14)),
+    ("today", date(2026, 1, 15), date(2026, 1, 15)),
+    ("this_week", date(2026, 1, 12), date(2026, 1, 18)),
+    ("next_week", date(2026, 1, 19), date(2026, 1, 25)),
+    ("this_month", date(2026, 1, 1), date(2026, 1, 31)),
+])
+def test_date_window_bounds(name, first, last):
+    assert date_window(name, today=date(2026, 1, 15)) == (first, last)
+
+
+def test_date_window_edges():
+    # Monday starts its own week; February and December end their months
+    assert date_window("this_week", today=date(2026, 1, 12))[0] == date(2026, 1, 12)
+    assert date_window("this_month", today=date(2028, 2, 29)) == (
+        date(2028, 2, 1), date(2028, 2, 29),
+    )
+    assert date_window("this_month", today=date(2026, 12, 31)) == (
+        date(2026, 12, 1), date(2026, 12, 31),
+    )
+    with pytest.raises(ValueError, match="unknown date window"):
+        date_window("someday")
+
+
+@pytest.fixture
+def db():
+    engine = make_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+LEGACY = [
+    ("2026-01-15T10:30:00", "15/01/2026"),
+    ("15.01.2026", "2026-01-15"),
+    ("2026-01-15 10:30:00.000000", None),
+    ("garbage", "2026-01"),
+    (None, "later"),
+]
+
+
+def _raw(db) -> list:
+    return db.execute(text("SELECT created_at, start_date FROM projects ORDER BY id")).all()
+
+
+def test_migration_rewrites_legacy_values_in_batches(db):
+    # more rows than one batch, so the rowid keyset has to carry over
+    db.execute(
+        text("INSERT INTO projects (project_name, created_at, start_date) VALUES (:n, :c, :s)"),
+        [{"n": f"P{i}", "c": created, "s": start} for i, (created, start) in enumerate(LEGACY)],
+    )
+    db.commit()
+
+    report = migrate_timestamps(db, dry_run=True, batch_size=2)
+    assert report == {
+        "projects.created_at": {"rewritten": 3, "unparseable": 1, "samples": ["garbage"]},
+        "projects.start_date": {"rewritten": 3, "unparseable": 1, "samples": ["later"]},
+    }
+    assert [tuple(row) for row in _raw(db)] == LEGACY
+
+    assert migrate_timestamps(db, batch_size=2) == report
+    assert [tuple(row) for row in _raw(db)] == [
+        ("2026-01-15 10:30:00.000000", "2026-01-15"),
+        ("2026-01-15 00:00:00.000000", "2026-01-15"),
+        ("2026-01-15 10:30:00.000000", None),
+        (None, "2026-01-01"),
+        (None, None),
+    ]
+    assert migrate_timestamps(db, batch_size=2) == {}
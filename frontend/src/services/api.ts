@@ -1,9 +1,19 @@
 import axios from 'axios'
+import { useAppStore } from '../store'
 
 const api = axios.create({
   baseURL: '/api/v1',
 })
 
+// Lets the backend route requests to the selected project's shard.
+api.interceptors.request.use((config) => {
+  const projectId = useAppStore.getState().selectedProjectId
+  if (projectId != null) {
+    config.headers.set('X-Project-Id', String(projectId))
+  }
+  return config
+})
+
 api.interceptors.response.use(
   (response) => response,
   (error) => {